@@ -0,0 +1,163 @@
+# bench/bench_html.py
+#
+# 기사 HTML 본문 추출 벤치마크: 백엔드(selectolax / lxml / bs4)별 페이지당 시간과
+# bs4 결과와의 일치율을 도메인별로 측정한다.
+#
+#   python -m bench.bench_html --corpus recorded_fixtures        # <corpus>/pages/<host>/*.html
+#   python -m bench.bench_html --rows 300 --padding-kb 128        # 합성 페이지 생성 후 측정
+#
+# 기록된 fixtures(bench/mock_naver.py 형식)를 그대로 corpus 로 쓸 수 있다.
+# 본문 요소가 닫히는 지점에서 다운로드를 멈추면 얼마나 덜 받는지도 함께 출력한다.
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+from collections import defaultdict
+
+from core import html_extract
+from core.core_utils_ui_api import selector_map
+
+from bench.bench_matching import percentile
+
+
+def load_corpus(corpus_dir):
+    """[(host, html), ...] — <corpus>/pages/<host>/*.html 또는 <corpus>/<host>/*.html"""
+    pages_dir = os.path.join(corpus_dir, "pages")
+    root = pages_dir if os.path.isdir(pages_dir) else corpus_dir
+    pages = []
+    for host in sorted(os.listdir(root)):
+        host_dir = os.path.join(root, host)
+        if not os.path.isdir(host_dir):
+            continue
+        for name in sorted(os.listdir(host_dir)):
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(host_dir, name), "r", encoding="utf-8", errors="replace") as f:
+                    pages.append((host, f.read()))
+    return pages
+
+
+def bytes_needed(html, selector, chunk_size=16 * 1024):
+    """ContainerWatcher 로 스트리밍했을 때 실제로 받게 되는 바이트 수"""
+    data = html.encode("utf-8")
+    watcher = html_extract.ContainerWatcher.for_selector(selector)
+    if watcher is None:
+        return len(data)
+    for start in range(0, len(data), chunk_size):
+        if watcher(data[start:start + chunk_size]):
+            return min(start + chunk_size, len(data))
+    return len(data)
+
+
+def early_stop_report(pages):
+    read, total = defaultdict(int), defaultdict(int)
+    for host, html in pages:
+        total[host] += len(html.encode("utf-8"))
+        read[host] += bytes_needed(html, html_extract.selector_for(host, selector_map))
+    return {host: {"bytes": total[host], "read": read[host]} for host in sorted(total)}
+
+
+def run(pages, backends, repeat=1):
+    report = {}
+    reference = {}
+    for host, html in pages:
+        reference.setdefault(host, []).append(
+            html_extract.extract_article(html, html_extract.selector_for(host, selector_map), backend="bs4"))
+
+    for backend in backends:
+        times = defaultdict(list)
+        agree = defaultdict(int)
+        counts = defaultdict(int)
+        for i, (host, html) in enumerate(pages):
+            selector = html_extract.selector_for(host, selector_map)
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                text = html_extract.BACKENDS[backend](html, selector)
+            times[host].append((time.perf_counter() - t0) / repeat)
+            n = counts[host]
+            counts[host] += 1
+            if text == reference[host][n]:
+                agree[host] += 1
+        all_times = [t for ts in times.values() for t in ts]
+        report[backend] = {
+            "pages": len(all_times),
+            "total_sec": sum(all_times),
+            "p50_ms": percentile(all_times, 0.5) * 1000,
+            "p95_ms": percentile(all_times, 0.95) * 1000,
+            "agreement": sum(agree.values()) / max(1, len(all_times)),
+            "hosts": {
+                host: {
+                    "pages": len(ts),
+                    "mean_ms": sum(ts) / len(ts) * 1000,
+                    "mapped": html_extract.selector_for(host, selector_map) is not None,
+                    "agreement": agree[host] / len(ts),
+                }
+                for host, ts in sorted(times.items())
+            },
+        }
+    return report
+
+
+def print_report(report, stream=sys.stdout):
+    base = report.get("bs4", {}).get("total_sec")
+    for backend, r in report.items():
+        speedup = f" (x{base / r['total_sec']:.1f} vs bs4)" if base and r["total_sec"] else ""
+        print(f"== {backend}: {r['pages']} pages, p50 {r['p50_ms']:.2f}ms, p95 {r['p95_ms']:.2f}ms, "
+              f"bs4 일치 {r['agreement']:.1%}{speedup}", file=stream)
+        for host, h in r["hosts"].items():
+            mark = "selector" if h["mapped"] else "<p>"
+            print(f"   {host:32s} {mark:8s} {h['pages']:4d} pages  {h['mean_ms']:7.2f}ms  "
+                  f"일치 {h['agreement']:.0%}", file=stream)
+
+
+def print_early_stop(early, stream=sys.stdout):
+    print("== 조기 종료: 본문 요소가 닫힐 때까지 받는 양", file=stream)
+    for host, e in early.items():
+        print(f"   {host:32s} {e['read'] / 1024:9.0f}KB / {e['bytes'] / 1024:9.0f}KB "
+              f"({e['read'] / max(1, e['bytes']):.0%})", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기사 HTML 본문 추출 벤치마크")
+    parser.add_argument("--corpus", help="저장된 페이지 폴더 (없으면 합성 페이지 생성)")
+    parser.add_argument("--rows", type=int, default=200, help="합성 페이지 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--padding-kb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3, help="페이지당 반복 횟수")
+    parser.add_argument("--backends", default="selectolax,lxml,bs4", help="쉼표로 구분")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    corpus = args.corpus
+    if corpus is None:
+        from bench.synthetic_export import generate
+        corpus = tempfile.mkdtemp(prefix="ainp_html_")
+        generate(corpus, rows=args.rows, seed=args.seed, padding_kb=args.padding_kb)
+
+    pages = load_corpus(corpus)
+    if not pages:
+        print(f"❌ 페이지가 없습니다: {corpus}", file=sys.stderr)
+        return 2
+
+    backends = []
+    for name in args.backends.split(","):
+        name = name.strip()
+        if html_extract._available(name):
+            backends.append(name)
+        else:
+            print(f"⚠️ {name} 미설치 — 건너뜀", file=sys.stderr)
+
+    report = run(pages, backends, args.repeat)
+    report["early_stop"] = early_stop_report(pages)
+    print_report({k: v for k, v in report.items() if k != "early_stop"})
+    print_early_stop(report["early_stop"])
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# bench/bench_matching.py
+#
+# 네이버 원문 매칭 파이프라인 오프라인 벤치마크.
+# 로컬 대역 서버(bench/mock_naver.py)를 띄우고 core.main_scripts_blog_ui_api 를 돌려
+# rows/sec, 행별 지연 p50/p95, 단계별 CPU 시간을 측정한다.
+#
+#   python -m bench.bench_matching --rows 100 --latency 0.05 --error-rate 0.02
+#   python -m bench.bench_matching --fixtures recorded_fixtures --input export.xlsx
+#
+# 1) in-process 단계: 행을 순차 실행하며 단계 함수를 감싸 행별 지연/단계별 CPU 시간 측정
+# 2) end-to-end 단계: main() 을 그대로 실행해 프로세스 풀 포함 처리량 측정
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import functools
+import multiprocessing
+from collections import defaultdict
+
+from bench.mock_naver import MockNaverServer
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class StageTimer:
+    """모듈 속성을 감싸서 단계별 wall/CPU 시간을 누적"""
+
+    def __init__(self):
+        self.wall = defaultdict(float)
+        self.cpu = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._patched = []
+
+    def wrap(self, module, name, stage):
+        original = getattr(module, name)
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            w0, c0 = time.perf_counter(), time.process_time()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.wall[stage] += time.perf_counter() - w0
+                self.cpu[stage] += time.process_time() - c0
+                self.calls[stage] += 1
+
+        setattr(module, name, wrapper)
+        self._patched.append((module, name, original))
+
+    def restore(self):
+        for module, name, original in reversed(self._patched):
+            setattr(module, name, original)
+        self._patched.clear()
+
+
+def configure_environment(server, work_dir):
+    # core 모듈 import 전에 설정해야 NAVER_NEWS_API_URL 이 반영된다 (워커 프로세스에도 상속)
+    os.environ["NAVER_NEWS_API_URL"] = server.api_url
+    # 캐시(API 키 사용량/429 drain, 증분 기록)는 작업 폴더에 — 주입한 429 가 실제 키 기록에 남지 않게.
+    # 실제 키 파일/환경변수의 키도 대역 서버로 보내지 않는다
+    os.environ["AINP_CACHE_DIR"] = os.path.join(work_dir, "cache")
+    os.environ["NAVER_CREDENTIALS_FILE"] = os.path.join(work_dir, "naver_credentials.json")
+    os.environ.pop("NAVER_CREDENTIALS", None)
+    for key in ("HTTP_PROXY", "http_proxy"):
+        os.environ[key] = server.url
+    for key in ("NO_PROXY", "no_proxy"):
+        os.environ.pop(key, None)
+
+
+def run_inprocess(input_path, output_dir, limit):
+    import pandas as pd
+    import core.core_utils_ui_api as cu
+    import core.main_scripts_blog_ui_api as ms
+
+    df = pd.read_excel(input_path, dtype={"게시글 등록일자": str})
+    if limit:
+        df = df.head(limit)
+
+    timer = StageTimer()
+    timer.wrap(ms, "extract_first_sentences", "query")
+    timer.wrap(ms, "generate_search_queries", "query")
+    timer.wrap(ms, "search_naver_news_api", "search")
+    timer.wrap(cu, "fallback_with_requests", "fetch")
+    timer.wrap(ms, "calculate_copy_ratio", "score")
+
+    latencies = []
+    matched = 0
+    try:
+        for i, row in df.iterrows():
+            t0 = time.perf_counter()
+            _, link, score, _ = ms.find_original_article_api(
+                i, row.to_dict(), len(df), output_dir, False, "bench-id", "bench-secret")
+            latencies.append(time.perf_counter() - t0)
+            matched += 1 if link else 0
+    finally:
+        timer.restore()
+
+    return {
+        "rows": len(latencies),
+        "matched": matched,
+        "row_latency_p50": percentile(latencies, 0.50),
+        "row_latency_p95": percentile(latencies, 0.95),
+        "stages": {
+            stage: {
+                "calls": timer.calls[stage],
+                "wall_sec": round(timer.wall[stage], 4),
+                "cpu_sec": round(timer.cpu[stage], 4),
+            }
+            for stage in timer.calls
+        },
+    }
+
+
+def run_end_to_end(input_path, output_path):
+    import pandas as pd
+    import core.main_scripts_blog_ui_api as ms
+
+    rows = len(pd.read_excel(input_path))
+    t0 = time.perf_counter()
+    # 증분 기록(실제 캐시 폴더)을 읽거나 더럽히지 않는다
+    ms.main(input_path, output_path, "bench-id", "bench-secret", incremental=False)
+    elapsed = time.perf_counter() - t0
+    result = {"rows": rows, "elapsed_sec": round(elapsed, 3), "rows_per_sec": round(rows / elapsed, 3) if elapsed else 0.0}
+    # main() 이 남기는 프로파일 요약(워커 집계)을 함께 첨부
+    profile_path = os.path.splitext(output_path)[0] + "_profile.json"
+    if os.path.exists(profile_path):
+        with open(profile_path, "r", encoding="utf-8") as f:
+            result["profile"] = json.load(f)
+    return result
+
+
+def print_report(report, stream=sys.stdout):
+    ip = report.get("inprocess")
+    if ip:
+        print(f"[in-process] {ip['rows']}행, 매칭 {ip['matched']}건", file=stream)
+        print(f"  행 지연 p50={ip['row_latency_p50']:.3f}s p95={ip['row_latency_p95']:.3f}s", file=stream)
+        print("  단계          calls     wall(s)      cpu(s)", file=stream)
+        for stage, s in ip["stages"].items():
+            print(f"  {stage:<10} {s['calls']:>8} {s['wall_sec']:>11.3f} {s['cpu_sec']:>11.3f}", file=stream)
+        print("  (search 는 fetch 를 포함)", file=stream)
+    e2e = report.get("end_to_end")
+    if e2e:
+        print(f"[end-to-end] {e2e['rows']}행 {e2e['elapsed_sec']}s → {e2e['rows_per_sec']} rows/sec", file=stream)
+        for stage, s in e2e.get("profile", {}).get("stages", {}).items():
+            print(f"  {stage:<12} n={s['count']:<6} p50={s['p50_sec']:.3f}s p95={s['p95_sec']:.3f}s cpu={s['cpu_sec']:.3f}s", file=stream)
+    print(f"[mock] {report['mock']}", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="원문 매칭 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--fixtures", help="기록된 fixtures 디렉터리 (없으면 합성 데이터 생성)")
+    parser.add_argument("--input", help="입력 엑셀 (기본: 합성 export)")
+    parser.add_argument("--rows", type=int, default=100, help="합성 데이터 행 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--padding-kb", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 고정 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="요청당 추가 랜덤 지연 상한(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/500 주입 비율")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답 지연(hang) 주입 비율")
+    parser.add_argument("--hang-seconds", type=float, default=12.0)
+    parser.add_argument("--inprocess-rows", type=int, default=30, help="in-process 측정 행 수 (0=전체)")
+    parser.add_argument("--skip-inprocess", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="ainp_bench_")
+    fixtures = args.fixtures
+    input_path = args.input
+    if not fixtures:
+        from bench.synthetic_export import generate
+        fixtures = os.path.join(work_dir, "fixtures")
+        os.makedirs(fixtures, exist_ok=True)
+        generated = generate(fixtures, rows=args.rows, seed=args.seed, padding_kb=args.padding_kb)
+        input_path = input_path or generated
+    if not input_path:
+        parser.error("--fixtures 를 지정한 경우 --input 도 필요합니다.")
+
+    server = MockNaverServer(fixtures, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                             hang_seconds=args.hang_seconds, seed=args.seed)
+    report = {"config": vars(args), "work_dir": work_dir}
+    with server:
+        configure_environment(server, work_dir)
+        if not args.skip_inprocess:
+            inproc_dir = os.path.join(work_dir, "inprocess_본문")
+            os.makedirs(inproc_dir, exist_ok=True)
+            report["inprocess"] = run_inprocess(input_path, inproc_dir, args.inprocess_rows)
+        if not args.skip_e2e:
+            report["end_to_end"] = run_end_to_end(input_path, os.path.join(work_dir, "bench_output.xlsx"))
+        report["mock"] = dict(server.stats)
+
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
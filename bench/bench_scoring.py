@@ -0,0 +1,122 @@
+# bench/bench_scoring.py
+#
+# 해싱 복사율 계산기: 행별 경로(hashing_scorer.copy_ratio)와 배치 경로(batch_scoring.score_vectors)가
+# 같은 값을 내는지 확인하고 시간을 비교한다. 값이 하나라도 다르거나, 메인 프로세스 몫(batch)이
+# 예전에 메인 프로세스가 하던 행별 경로(per_pair)보다 느리면 종료 코드 1.
+#
+#   python -m bench.bench_scoring --rows 300 --candidates 5
+#   python -m bench.bench_scoring --tokenizer split      # JVM(Okt) 없이 공백 토큰화로 측정
+#
+# 측정 항목
+#   per_pair:   쌍마다 copy_ratio (정제 + 벡터화 + 코사인) — 워커가 행마다 하던 일
+#   vectorize:  sentence_vectors / post_vector + pack — 배치 경로에서 워커가 나눠 하는 일
+#   cosine:     벡터화가 끝난 뒤 쌍마다 ratio_from_vectors (Python 루프)
+#   batch:      벡터화가 끝난 뒤 score_vectors (배열 이어 붙이기 + CSR + 행별 내적) — 메인 프로세스가 하는 일
+
+import sys
+import json
+import time
+import random
+import argparse
+
+from core import hashing_scorer
+from bench.synthetic_export import make_article, make_sentence
+
+ROUNDING_STEP = 0.001 + 1e-9
+
+
+def make_rows(rows, candidates, seed):
+    """[(게시글, [후보 기사 본문, ...]), ...] — 첫 후보 일부를 복사한 게시글"""
+    rng = random.Random(seed)
+    data = []
+    for _ in range(rows):
+        articles = ["\n\n".join(make_article(rng, rng.randint(3, 6))) for _ in range(candidates)]
+        copied = articles[0].split("\n\n")[:rng.randint(1, 3)]
+        post = make_sentence(rng) + " " + " ".join(copied) + " " + make_sentence(rng)
+        data.append((post, articles))
+    return data
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def run(data):
+    from core.batch_scoring import score_vectors
+
+    pairs = sum(len(articles) for _, articles in data)
+
+    hashing_scorer.text_vector.cache_clear()
+    per_pair, t_per_pair = _timed(lambda: [[hashing_scorer.copy_ratio(a, post) for a in articles]
+                                           for post, articles in data])
+
+    hashing_scorer.text_vector.cache_clear()
+    vectors, t_vectorize = _timed(lambda: [(hashing_scorer.post_vector(post),
+                                            [hashing_scorer.sentence_vectors(a) for a in articles])
+                                           for post, articles in data])
+    packed, t_pack = _timed(lambda: [(hashing_scorer.pack([p]), [hashing_scorer.pack(s) for s in sents])
+                                     for p, sents in vectors])
+    cosine, t_cosine = _timed(lambda: [[hashing_scorer.ratio_from_vectors(s, p) for s in sents]
+                                       for p, sents in vectors])
+    batch, t_batch = _timed(lambda: score_vectors(packed))
+
+    # 합산 순서가 달라 반올림 경계(0.0005)에서 한 단계 어긋나는 것까지는 허용
+    diffs = [(i, j, a, b) for i, (ra, rb) in enumerate(zip(per_pair, batch))
+             for j, (a, b) in enumerate(zip(ra, rb)) if a != b]
+    mismatches = [d for d in diffs if abs(d[2] - d[3]) > ROUNDING_STEP]
+    return {
+        "rows": len(data),
+        "pairs": pairs,
+        "per_pair_sec": round(t_per_pair, 4),
+        "vectorize_sec": round(t_vectorize + t_pack, 4),
+        "cosine_sec": round(t_cosine, 4),
+        "batch_sec": round(t_batch, 4),
+        "rounding_diffs": len(diffs) - len(mismatches),
+        "mismatches": len(mismatches),
+        "mismatch_examples": mismatches[:5],
+    }
+
+
+def print_report(r):
+    print(f"{r['rows']}행, (기사, 게시글) {r['pairs']}쌍")
+    print(f"  per_pair  (행별 경로 전체)          {r['per_pair_sec']:>8.3f}s")
+    print(f"  vectorize (배치 경로, 워커 몫)      {r['vectorize_sec']:>8.3f}s")
+    print(f"  cosine    (벡터 → 쌍별 Python 루프) {r['cosine_sec']:>8.3f}s")
+    print(f"  batch     (배열 → CSR 내적, 메인 몫) {r['batch_sec']:>8.3f}s")
+    if r["batch_sec"]:
+        print(f"  메인 프로세스 몫: 행별 경로의 {r['batch_sec'] / r['per_pair_sec'] * 100:.1f}%, "
+              f"쌍별 코사인 대비 {r['cosine_sec'] / r['batch_sec']:.1f}배")
+    print(f"  값 불일치: {r['mismatches']}건 (반올림 한 단계 차이 {r['rounding_diffs']}건)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="해싱 복사율 계산기 행별/배치 경로 비교")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=5, help="행당 후보 기사 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tokenizer", choices=["okt", "split"], default="okt",
+                        help="split: 공백 토큰화 (JVM 없이 행렬 연산 부분만 비교)")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    if args.tokenizer == "split":
+        hashing_scorer._tokenize = lambda text: text.lower().split()
+
+    report = run(make_rows(args.rows, args.candidates, args.seed))
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if report["mismatches"]:
+        print("❌ 배치 경로 값이 행별 경로와 다릅니다.", file=sys.stderr)
+        return 1
+    if report["batch_sec"] >= report["per_pair_sec"]:
+        print("❌ 배치 경로가 행별 경로보다 느립니다.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
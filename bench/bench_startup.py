@@ -0,0 +1,142 @@
+# bench/bench_startup.py
+#
+# 시작 속도(import 시간) 회귀 검사.
+# 새 인터프리터에서 `python -X importtime -c "import <모듈>"` 을 돌려 모듈별 누적 import 시간을 모으고
+#   1) 전체 import 시간이 예산(ms)을 넘거나
+#   2) 로그인 창을 띄우는 경로에 무거운 패키지(pandas/sklearn/konlpy/requests 등)가 섞여 들어오거나
+#   3) 대상 모듈 import 자체가 실패하면 (GUI 진입 모듈이 안 뜨면 시간을 잴 수도 없다)
+# 종료 코드 1 로 끝난다. 무거운 패키지는 처음 쓸 때나 백그라운드 워밍업에서 로딩해야 한다.
+#
+#   python -m bench.bench_startup                        # 기본 대상/예산
+#   python -m bench.bench_startup --target gui.app_gui=1200 --repeat 5 --top 15
+#
+# 시간은 기계마다 다르므로 예산은 여유 있게 잡고, 무거운 패키지 검사를 주된 회귀 방지 수단으로 쓴다.
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 대상 모듈 → 예산(ms)
+DEFAULT_TARGETS = {
+    "gui.app_gui": 1500,     # 로그인 창까지 (PyQt 포함)
+    "core.warm_pool": 300,   # GUI 가 가져오는 core 쪽 경로 (PyQt 제외)
+}
+HEAVY_PACKAGES = ("pandas", "numpy", "scipy", "sklearn", "konlpy", "jpype", "requests",
+                  "bs4", "lxml", "selectolax", "openpyxl", "charset_normalizer", "chardet")
+
+
+def parse_importtime(stderr):
+    """[(모듈, 깊이, self_us, cumulative_us), ...]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(parts[0]), int(parts[1])))
+    return entries
+
+
+def measure(module, python=sys.executable):
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    entries = parse_importtime(proc.stderr)
+    error = None
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["import 실패"])[-1]
+    top_level = min((d for _, d, _, _ in entries), default=0)
+    return {
+        "error": error,
+        "total_ms": sum(cum for _, d, _, cum in entries if d == top_level) / 1000.0,
+        "entries": entries,
+        "heavy": sorted({name.split(".")[0] for name, _, _, _ in entries
+                         if name.split(".")[0] in HEAVY_PACKAGES}),
+    }
+
+
+def run(targets, repeat):
+    report = {}
+    for module, budget in targets.items():
+        runs = [measure(module) for _ in range(repeat)]
+        last = runs[-1]
+        if last["error"]:
+            report[module] = {"budget_ms": budget, "error": last["error"]}
+            continue
+        slowest = sorted(last["entries"], key=lambda e: e[3], reverse=True)
+        report[module] = {
+            "budget_ms": budget,
+            "total_ms": round(median(r["total_ms"] for r in runs), 1),
+            "heavy": last["heavy"],
+            "slowest": [{"module": n, "cumulative_ms": round(c / 1000.0, 1), "self_ms": round(s / 1000.0, 1)}
+                        for n, _, s, c in slowest],
+        }
+    return report
+
+
+def check(report, allow_heavy=False):
+    failures = []
+    for module, r in report.items():
+        if r.get("error"):
+            failures.append(f"{module}: import 실패 — {r['error']}")
+            continue
+        if r["total_ms"] > r["budget_ms"]:
+            failures.append(f"{module}: {r['total_ms']:.0f}ms > 예산 {r['budget_ms']}ms")
+        if r["heavy"] and not allow_heavy:
+            failures.append(f"{module}: 무거운 패키지 import — {', '.join(r['heavy'])}")
+    return failures
+
+
+def print_report(report, top):
+    for module, r in report.items():
+        print(f"\n== {module} (예산 {r['budget_ms']}ms)")
+        if r.get("error"):
+            print(f"  ❌ import 실패: {r['error']}")
+            continue
+        print(f"  전체 {r['total_ms']:.1f}ms, 무거운 패키지: {', '.join(r['heavy']) or '없음'}")
+        print(f"  {'module':<48}{'cumul ms':>10}{'self ms':>10}")
+        for e in r["slowest"][:top]:
+            print(f"  {e['module'][:47]:<48}{e['cumulative_ms']:>10.1f}{e['self_ms']:>10.1f}")
+
+
+def _parse_target(value):
+    module, _, budget = value.partition("=")
+    return module, int(budget) if budget else DEFAULT_TARGETS.get(module, 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시작 속도(import 시간) 회귀 검사")
+    parser.add_argument("--target", action="append", type=_parse_target,
+                        help="모듈[=예산ms] (여러 번 지정 가능, 기본: gui.app_gui, core.warm_pool)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="느린 모듈 몇 개까지 출력")
+    parser.add_argument("--allow-heavy", action="store_true", help="무거운 패키지 import 를 실패로 보지 않음")
+    parser.add_argument("--out", help="JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    targets = dict(args.target) if args.target else dict(DEFAULT_TARGETS)
+    report = run(targets, max(1, args.repeat))
+    print_report(report, args.top)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failures = check(report, args.allow_heavy)
+    if failures:
+        print("\n❌ 시작 속도 회귀:", file=sys.stderr)
+        for msg in failures:
+            print(f"  - {msg}", file=sys.stderr)
+        return 1
+    print("\n✅ 예산 이내")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# bench/mock_naver.py
+#
+# 네이버 검색 API(/v1/search/news.json)와 기사 페이지를 흉내내는 로컬 서버.
+# 기록된 응답(fixtures/search/*.json)을 우선 재생하고, 없으면 manifest.json 기반의
+# 간단한 토큰 매칭으로 응답을 만든다. 지연(latency)과 오류(error/timeout) 주입 가능.
+#
+# fixtures 구조:
+#   manifest.json                 [{"title", "originallink", "link", "description", "pubDate"}, ...]
+#   pages/<host>/<page_key>.html  기사 HTML (page_key = sha1(host + path[?query]))
+#   search/<query_key>.json       기록된 API 응답 (query_key = sha1(query))
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+API_PATH = "/v1/search/news.json"
+
+
+def query_key(query):
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+
+def page_key(url):
+    parsed = urlparse(url)
+    target = parsed.netloc + parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    return hashlib.sha1(target.encode("utf-8")).hexdigest()
+
+
+def page_file(fixtures_dir, url):
+    host = urlparse(url).netloc
+    return os.path.join(fixtures_dir, "pages", host, page_key(url) + ".html")
+
+
+class MockNaverServer:
+    """로컬 네이버 대역 서버 (프록시 겸용)"""
+
+    def __init__(self, fixtures_dir, latency=0.0, jitter=0.0, error_rate=0.0,
+                 timeout_rate=0.0, hang_seconds=12.0, seed=0, host="127.0.0.1", port=0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = {"api": 0, "page": 0, "replayed": 0, "synthesized": 0,
+                      "not_found": 0, "errors": 0, "timeouts": 0}
+        self.stats_lock = threading.Lock()
+
+        manifest_path = os.path.join(fixtures_dir, "manifest.json")
+        self.manifest = []
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.index = [(set((m.get("title", "") + " " + m.get("description", "")).split()), m)
+                      for m in self.manifest]
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return self.url + API_PATH
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def _roll(self):
+        with self.rng_lock:
+            return self.rng.random(), self.rng.random(), self.rng.random()
+
+    def _search(self, query, display):
+        recorded = os.path.join(self.fixtures_dir, "search", query_key(query) + ".json")
+        if os.path.exists(recorded):
+            self._count("replayed")
+            with open(recorded, "rb") as f:
+                return f.read()
+
+        self._count("synthesized")
+        q_tokens = set(query.split())
+        scored = [(len(q_tokens & tokens), m) for tokens, m in self.index]
+        scored = [x for x in scored if x[0] > 0]
+        scored.sort(key=lambda x: -x[0])
+        items = [m for _, m in scored[:display]]
+        body = {
+            "lastBuildDate": formatdate(localtime=True),
+            "total": len(scored),
+            "start": 1,
+            "display": len(items),
+            "items": items,
+        }
+        return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                # 프록시 요청은 절대 URI, 직접 요청은 상대 경로로 들어온다
+                if self.path.startswith("http://"):
+                    target = self.path
+                else:
+                    target = f"http://{self.headers.get('Host', '')}{self.path}"
+                parsed = urlparse(target)
+
+                fail_roll, hang_roll, jitter_roll = server._roll()
+                delay = server.latency + server.jitter * jitter_roll
+                if delay:
+                    time.sleep(delay)
+                if hang_roll < server.timeout_rate:
+                    server._count("timeouts")
+                    time.sleep(server.hang_seconds)
+                if fail_roll < server.error_rate:
+                    server._count("errors")
+                    status = 429 if fail_roll < server.error_rate / 2 else 500
+                    self._send(status, b'{"errorMessage": "injected"}', "application/json")
+                    return
+
+                if parsed.path == API_PATH:
+                    server._count("api")
+                    params = parse_qs(parsed.query)
+                    query = params.get("query", [""])[0]
+                    display = int(params.get("display", ["5"])[0])
+                    self._send(200, server._search(query, display), "application/json; charset=utf-8")
+                    return
+
+                server._count("page")
+                path = page_file(server.fixtures_dir, target)
+                if not os.path.exists(path):
+                    server._count("not_found")
+                    self._send(404, b"not found", "text/plain")
+                    return
+                with open(path, "rb") as f:
+                    body = f.read()
+                self._send(200, body, "text/html; charset=utf-8")
+
+        return Handler
@@ -0,0 +1,126 @@
+# bench/synthetic_export.py
+#
+# 벤치마크용 합성 데이터 생성기.
+# 언론사 기사(HTML + manifest.json)와 그 기사를 일부 복사한 블로그 게시글 엑셀(전처리 결과 형식)을 만든다.
+#
+#   python -m bench.synthetic_export --rows 200 --out bench_fixtures
+
+import os
+import json
+import random
+import argparse
+from html import escape
+
+from bench.mock_naver import page_file
+
+# selector_map 에 등록된 도메인(선택자 경로)과 미등록 도메인(<p> fallback 경로)을 섞어서 생성
+PRESS_TEMPLATES = [
+    ("이데일리", "www.edaily.co.kr", "/News/Read?newsId={id}",
+     '<div class="news_body" itemprop="articleBody">{body}</div>'),
+    ("YTN", "www.ytn.co.kr", "/_ln/0101_{id}",
+     '<div id="CmAdContent">{body}</div>'),
+    ("경향신문", "www.khan.co.kr", "/article/{id}",
+     '<div id="articleBody">{body}</div>'),
+    ("파이낸셜뉴스", "www.fnnews.com", "/news/{id}",
+     '<div id="article_content">{body}</div>'),
+    ("한겨레", "www.hani.co.kr", "/arti/{id}.html",
+     '<div class="article-text">{body}</div>'),
+    ("예시뉴스", "news.example-press.co.kr", "/view/{id}",
+     '<div class="content">{body}</div>'),
+]
+
+WORDS = (
+    "정부 발표 시장 금리 인상 부동산 대출 규제 증시 코스피 외국인 매수 반도체 수출 실적 "
+    "전망 기업 투자 확대 지역 경제 회복 정책 지원 청년 일자리 물가 상승 소비 둔화 환율 "
+    "관세 협상 미국 중국 무역 합의 기술 개발 인공지능 서비스 출시 고객 증가 분기 영업이익 "
+    "감소 회복세 발표회 관계자 설명 계획 추진 예정 논란 조사 결과 의원 국회 법안 통과"
+).split()
+
+ENDINGS = ["다.", "했다.", "밝혔다.", "전망이다.", "것으로 알려졌다.", "설명했다."]
+
+
+def make_sentence(rng, min_words=6, max_words=14):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words) + " " + rng.choice(ENDINGS)
+
+
+def make_article(rng, n_paragraphs):
+    return [" ".join(make_sentence(rng) for _ in range(rng.randint(2, 4))) for _ in range(n_paragraphs)]
+
+
+def render_page(template, title, paragraphs, padding_kb, rng):
+    body = "".join(f"<p>{escape(p)}</p>" for p in paragraphs)
+    # 광고/스크립트 등 본문 외 영역을 흉내내는 패딩
+    filler = "var ad=" + json.dumps("".join(rng.choices("abcdef0123456789", k=1024))) + ";\n"
+    scripts = "<script>" + filler * padding_kb + "</script>" if padding_kb else ""
+    nav = "".join(f'<li><a href="/section/{i}">{escape(rng.choice(WORDS))}</a></li>' for i in range(30))
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{escape(title)}</title>{scripts}</head><body>"
+        f"<ul class=\"gnb\">{nav}</ul><h1>{escape(title)}</h1>"
+        f"{template.format(body=body)}"
+        "<div class=\"footer\"><p>무단 전재 및 재배포 금지</p></div>"
+        "</body></html>"
+    )
+
+
+def generate(out_dir, rows=200, seed=0, padding_kb=64, copy_min=0.3, copy_max=1.0):
+    """기사 fixtures 와 블로그 게시글 엑셀을 생성하고 엑셀 경로를 반환"""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    manifest = []
+    posts = []
+
+    for i in range(rows):
+        press, host, path_tpl, template = rng.choice(PRESS_TEMPLATES)
+        article_id = f"{20250700000 + i}"
+        link = f"http://{host}{path_tpl.format(id=article_id)}"
+        title = " ".join(rng.choices(WORDS, k=rng.randint(4, 8)))
+        paragraphs = make_article(rng, rng.randint(4, 9))
+
+        html = render_page(template, title, paragraphs, padding_kb, rng)
+        path = page_file(out_dir, link)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+        manifest.append({
+            "title": title,
+            "originallink": link,
+            "link": link,
+            "description": paragraphs[0][:120],
+            "pubDate": "Mon, 07 Jul 2025 10:00:00 +0900",
+        })
+
+        # 블로그 글: 기사 문단 일부를 복사하고 개인 코멘트를 섞는다
+        n_copy = max(1, int(len(paragraphs) * rng.uniform(copy_min, copy_max)))
+        copied = paragraphs[:n_copy]
+        comments = [make_sentence(rng) for _ in range(rng.randint(0, 3))]
+        content = "\n\n".join(copied + comments)
+        posts.append({
+            "검색어": press,
+            "게시글제목": title if rng.random() < 0.7 else f"[{press}] {title}",
+            "게시글URL": f"https://blog.naver.com/bench_{i % 37}/{300000000 + i}",
+            "게시글내용": content,
+            "계정명": f"bench_{i % 37}",
+            "게시글 등록일자": "2025-07-07",
+        })
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+    input_path = os.path.join(out_dir, "blog_export.xlsx")
+    pd.DataFrame(posts).to_excel(input_path, index=False)
+    return input_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 블로그 export / 기사 fixtures 생성")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--padding-kb", type=int, default=64, help="기사 페이지당 스크립트 패딩 크기(KB)")
+    parser.add_argument("--out", default="bench_fixtures")
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    print(generate(args.out, rows=args.rows, seed=args.seed, padding_kb=args.padding_kb))
@@ -0,0 +1,284 @@
+# core/__main__.py
+#
+# GUI 없이 서버/스케줄러에서 돌리기 위한 CLI.
+#
+#   python -m core run-preprocess export1.xlsx export2.xlsx --output-dir out/
+#   python -m core run-match out/*_preprocessed.xlsx --workers 6 --parallel-files 2
+#   python -m core shard-coordinate big.xlsx --queue sqlite:////mnt/share/ainp/shards.db   (분산 매칭, core/sharding.py)
+#   python -m core build-idf out/ archive/          (_본문 폴더로 배경 IDF 표 생성, AINP_SCORER=hashing 에서 사용)
+#   python -m core extract-bodies out/a_matched_본문.sqlite3   (본문 아카이브를 낱개 .txt 로, core/body_archive.py)
+#
+# NAVER API 인증은 환경변수 NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 에서 읽는다.
+# 키가 여러 개면 NAVER_CREDENTIALS 또는 키 파일(core/credentials.py)에 두면 함께 나눠 쓴다.
+# 여러 파일을 동시에 처리해도 워커 풀(= Okt JVM, 리소스, 캐시)은 하나를 공유한다.
+
+import os
+import sys
+import time
+import signal
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _output_path(input_path, output_dir, suffix):
+    base = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir or os.path.dirname(os.path.abspath(input_path)), f"{base}{suffix}.xlsx")
+
+
+def _progress_printer(name, every=5.0):
+    from core.progress import describe
+    last = [0.0]
+
+    def callback(info):
+        now = time.monotonic()
+        if now - last[0] >= every or info["done"] >= info["total"]:
+            last[0] = now
+            print(f"[{name}] {describe(info)}", file=sys.stderr, flush=True)
+
+    return callback
+
+
+def _naver_keys():
+    """환경변수의 키 한 쌍 (없으면 ""). 키 파일/NAVER_CREDENTIALS 에도 키가 하나도 없으면 (None, None)"""
+    from core.credentials import load_credentials
+    client_id = os.environ.get("NAVER_CLIENT_ID", "")
+    client_secret = os.environ.get("NAVER_CLIENT_SECRET", "")
+    if not load_credentials(extra=[(client_id, client_secret)]):
+        print("❌ NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 환경변수 또는 NAVER_CREDENTIALS(키 파일)를 설정하세요.",
+              file=sys.stderr)
+        return None, None
+    return client_id, client_secret
+
+
+def _run_files(jobs, parallel_files, run_one):
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, parallel_files)) as pool:
+        futures = {pool.submit(run_one, src, dst): src for src, dst in jobs}
+        for future, src in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {src}: {e}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def cmd_run_preprocess(args, stop_event):
+    from core.preprocessing import run_preprocessing
+
+    jobs = [(src, _output_path(src, args.output_dir, args.suffix)) for src in args.inputs]
+
+    def run_one(src, dst):
+        run_preprocessing(src, dst, stop_event=stop_event,
+                          progress_callback=_progress_printer(os.path.basename(src)) if args.progress else None,
+                          incremental=not args.full)
+
+    return _run_files(jobs, args.parallel_files, run_one)
+
+
+def cmd_run_match(args, stop_event):
+    client_id, client_secret = _naver_keys()
+    if client_id is None:
+        return 2
+
+    from core import worker_pool
+    from core.main_scripts_blog_ui_api import main as run_match
+
+    jobs = [(src, _output_path(src, args.output_dir, args.suffix)) for src in args.inputs]
+    pool = worker_pool.create_pool(args.workers)
+    try:
+        def run_one(src, dst):
+            run_match(src, dst, client_id, client_secret, stop_event=stop_event,
+                      progress_callback=_progress_printer(os.path.basename(src)) if args.progress else None,
+                      executor=pool, incremental=not args.full)
+
+        return _run_files(jobs, args.parallel_files, run_one)
+    finally:
+        pool.shutdown(wait=not stop_event.is_set(), cancel_futures=True)
+
+
+def cmd_watch(args, stop_event):
+    client_id, client_secret = _naver_keys() if args.mode != "preprocess" else ("", "")
+    if client_id is None:
+        return 2
+
+    from core.daemon import WatchDaemon
+    WatchDaemon(args.input_dir, args.output_dir, client_id, client_secret, mode=args.mode,
+                workers=args.workers, poll_interval=args.interval, settle_seconds=args.settle,
+                stop_event=stop_event).run()
+    return 0
+
+
+def cmd_serve(args, stop_event):
+    client_id, client_secret = _naver_keys()
+    if client_id is None:
+        return 2
+
+    from core.service import serve
+    serve(client_id, client_secret, host=args.host, port=args.port, stop_event=stop_event,
+          max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+          max_inflight=args.max_inflight, io_threads=args.io_threads)
+    return 0
+
+
+def cmd_shard_coordinate(args, stop_event):
+    from core.sharding import coordinate
+    output = args.output or _output_path(args.input, None, "_matched")
+    coordinate(args.input, output, args.queue, shard_size=args.shard_size, poll_interval=args.interval,
+               stop_event=stop_event,
+               progress_callback=_progress_printer(os.path.basename(args.input)) if args.progress else None)
+    return 0
+
+
+def cmd_shard_work(args, stop_event):
+    client_id, client_secret = _naver_keys()
+    if client_id is None:
+        return 2
+
+    from core.sharding import work
+    work(args.queue, args.output_dir, client_id, client_secret, workers=args.workers,
+         worker_id=args.worker_id, idle_exit=args.exit_when_idle, poll_interval=args.interval,
+         stop_event=stop_event)
+    return 0
+
+
+def cmd_build_idf(args, stop_event):
+    from core.hashing_scorer import build_idf
+    table = build_idf(args.roots, output_path=args.output, stop_event=stop_event)
+    return 0 if table is not None and table.n_docs else 1
+
+
+def cmd_extract_bodies(args, stop_event):
+    from core.body_archive import extract_archive
+    rows = None
+    if args.rows:
+        first, _, last = args.rows.partition("-")
+        rows = (int(first), int(last or first))
+    written = extract_archive(args.archive, args.output_dir, rows)
+    print(f"✅ {written}개 파일 → {args.output_dir or os.path.splitext(args.archive)[0]}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core", description="AI News Pick 헤드리스 실행")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p, default_suffix):
+        p.add_argument("inputs", nargs="+", help="입력 엑셀 파일(여러 개 가능)")
+        p.add_argument("--output-dir", help="출력 폴더 (기본: 입력 파일과 같은 폴더)")
+        p.add_argument("--suffix", default=default_suffix, help=f"출력 파일 이름 접미사 (기본: {default_suffix})")
+        p.add_argument("--parallel-files", type=int, default=1, help="동시에 처리할 파일 수")
+        p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+        p.add_argument("--progress", action="store_true", help="진행률을 stderr 로 출력")
+        p.add_argument("--full", action="store_true", help="이전에 처리한 게시글도 다시 처리 (증분 처리 끔)")
+
+    p = sub.add_parser("run-preprocess", help="블로그 데이터 전처리")
+    add_common(p, "_preprocessed")
+    p.set_defaults(func=cmd_run_preprocess)
+
+    p = sub.add_parser("run-match", help="네이버 원문 매칭")
+    add_common(p, "_matched")
+    p.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: AINP_WORKERS 또는 3)")
+    p.add_argument("--scorer", choices=["tfidf", "hashing"], help="복사율 계산 방식 (기본: AINP_SCORER 또는 tfidf)")
+    p.add_argument("--body-store", choices=["files", "sqlite"],
+                   help="기사 본문 저장 방식: 행마다 .txt 또는 아카이브 파일 하나 (기본: AINP_BODY_STORE 또는 files)")
+    p.set_defaults(func=cmd_run_match)
+
+    p = sub.add_parser("watch", help="입력 폴더 감시 데몬 (전처리 → 원문 매칭)")
+    p.add_argument("input_dir", help="감시할 입력 폴더")
+    p.add_argument("--output-dir", required=True, help="결과/상태 파일 폴더")
+    p.add_argument("--mode", choices=["both", "preprocess", "match"], default="both")
+    p.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: AINP_WORKERS 또는 3)")
+    p.add_argument("--interval", type=float, default=5.0, help="폴더 확인 주기(초)")
+    p.add_argument("--settle", type=float, default=3.0, help="파일 크기가 이 시간 동안 그대로면 처리 시작(초)")
+    p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("serve", help="원문 매칭 로컬 HTTP/JSON 서비스")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--max-batch", type=int, default=16, help="한 번에 묶어 처리할 최대 요청 수")
+    p.add_argument("--max-wait-ms", type=float, default=20, help="배치를 채우기 위해 기다리는 최대 시간(ms)")
+    p.add_argument("--max-inflight", type=int, default=64, help="동시 처리 상한 (넘으면 503)")
+    p.add_argument("--io-threads", type=int, default=16, help="검색/기사 수집 스레드 수")
+    p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("shard-coordinate", help="분산 매칭: 입력을 shard 로 나눠 큐에 넣고 결과를 합침")
+    p.add_argument("input", help="입력 엑셀 파일")
+    p.add_argument("--queue", required=True, help="큐 주소 (sqlite:///경로 또는 redis://host:port/db)")
+    p.add_argument("--output", help="결과 엑셀 경로 (기본: <입력>_matched.xlsx)")
+    p.add_argument("--shard-size", type=int, default=500, help="shard 당 행 수")
+    p.add_argument("--interval", type=float, default=5.0, help="진행 확인 주기(초)")
+    p.add_argument("--progress", action="store_true", help="진행률을 stderr 로 출력")
+    p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+    p.set_defaults(func=cmd_shard_coordinate)
+
+    p = sub.add_parser("shard-work", help="분산 매칭 워커: 큐에서 shard 를 가져와 처리")
+    p.add_argument("--queue", required=True, help="큐 주소 (sqlite:///경로 또는 redis://host:port/db)")
+    p.add_argument("--output-dir", required=True, help="기사 본문(.txt) 저장 폴더")
+    p.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: AINP_WORKERS 또는 3)")
+    p.add_argument("--worker-id", help="워커 이름 (기본: 호스트명-pid)")
+    p.add_argument("--interval", type=float, default=5.0, help="큐가 비었을 때 재확인 주기(초)")
+    p.add_argument("--exit-when-idle", action="store_true", help="가져갈 shard 가 없으면 종료")
+    p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+    p.set_defaults(func=cmd_shard_work)
+
+    p = sub.add_parser("build-idf", help="매칭된 기사 본문(_본문 폴더)으로 배경 IDF 표 생성")
+    p.add_argument("roots", nargs="+", help="_본문 폴더, 본문 아카이브 또는 그 상위 폴더(하위 _본문 폴더/아카이브를 모두 읽음)")
+    p.add_argument("--output", help="IDF 표 경로 (기본: 캐시 폴더 idf_table.json)")
+    p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+    p.set_defaults(func=cmd_build_idf)
+
+    p = sub.add_parser("extract-bodies", help="본문 아카이브(_본문.sqlite3)를 행별 .txt 파일로 풀기")
+    p.add_argument("archive", help="본문 아카이브 경로")
+    p.add_argument("--output-dir", help="출력 폴더 (기본: 아카이브 이름에서 .sqlite3 를 뺀 폴더)")
+    p.add_argument("--rows", help="행 번호 범위, 예: 1-100 또는 42")
+    p.add_argument("--cache-dir", help="캐시 폴더 (AINP_CACHE_DIR)")
+    p.set_defaults(func=cmd_extract_bodies)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.cache_dir:
+        # 워커 프로세스도 환경변수를 상속하므로 core 모듈 import 전에 설정
+        os.environ["AINP_CACHE_DIR"] = os.path.abspath(args.cache_dir)
+    if getattr(args, "scorer", None):
+        os.environ["AINP_SCORER"] = args.scorer
+    if getattr(args, "body_store", None):
+        os.environ["AINP_BODY_STORE"] = args.body_store
+    if getattr(args, "output_dir", None):
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    from core import log_backend
+    log_backend.setup_logging(stream=True)
+
+    stop_event = threading.Event()
+
+    def on_signal(signum, frame):
+        print("🛑 중단 요청 — 진행 중인 행을 정리하고 부분 결과를 저장합니다.", file=sys.stderr)
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, on_signal)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, on_signal)
+
+    # 명령 함수는 종료 코드를 돌려준다 (0 성공, 1 실패한 파일 있음, 2 설정 오류 — 네이버 키 없음 등)
+    try:
+        code = args.func(args, stop_event)
+    finally:
+        cancellation = sys.modules.get("core.cancellation")
+        if cancellation is not None:
+            cancellation.shutdown_manager()
+    if stop_event.is_set():
+        return 130
+    return code or 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
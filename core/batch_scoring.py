@@ -0,0 +1,65 @@
+# core/batch_scoring.py
+#
+# 여러 행의 (기사, 게시글) 쌍을 모아서 한 번에 채점 (AINP_SCORER=hashing 일 때).
+# 해싱 특징 + 배경 IDF 벡터(core/hashing_scorer.py)는 텍스트만으로 정해지므로 행이 달라도
+# 같은 특징 공간에서 행렬 하나로 묶을 수 있다.
+# 정제/문장 분리/토큰화/해싱(CPU 대부분)은 워커가 hashing_scorer.sentence_vectors / post_vector 로
+# 끝내고 hashing_scorer.pack 으로 (길이, 특징, 가중치) 배열을 돌려준다. 메인 프로세스는 배열을
+# 이어 붙여 CSR 로 쌓고 곱하기만 한다.
+#   S: 모든 후보 기사의 문장 벡터 (CSR, 문장 수 × 특징 수)
+#   P: 행(게시글)별 벡터 (CSR, 행 수 × 특징 수)
+#   문장마다 자기 게시글 행과의 내적 = (S ∘ P[문장의 행]).sum(axis=1), 쌍별 평균은 bincount 로 계산.
+# 값은 hashing_scorer.copy_ratio 와 같다 (어휘가 빈 문장 건너뜀, 소수 셋째 자리 반올림).
+
+import numpy as np
+from scipy import sparse
+
+from core import hashing_scorer
+
+
+def _stack(packed, n_features):
+    lens = np.concatenate([p[0] for p in packed])
+    indices = np.concatenate([p[1] for p in packed])
+    data = np.concatenate([p[2] for p in packed])
+    indptr = np.zeros(len(lens) + 1, dtype=np.int64)
+    np.cumsum(lens, out=indptr[1:])
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(lens), n_features)), lens
+
+
+def score_vectors(rows):
+    """rows: [(pack([게시글 벡터]), [후보별 pack(문장 벡터 목록), ...]), ...] → 행별 [복사율, ...]"""
+    candidates = [c for _, cands in rows for c in cands]
+    pair_count = len(candidates)
+    sentence_counts = np.array([len(c[0]) for c in candidates], dtype=np.int64)
+
+    if sentence_counts.sum():
+        posts = [post for post, _ in rows]
+        n_features = max([hashing_scorer.N_FEATURES] +
+                         [int(p[1].max()) + 1 for p in candidates + posts if len(p[1])])
+        S, s_lens = _stack(candidates, n_features)
+        P, p_lens = _stack(posts, n_features)
+        rows_per_post = np.array([sum(len(c[0]) for c in cands) for _, cands in rows], dtype=np.int64)
+        post_of_row = np.repeat(np.arange(len(rows)), rows_per_post)
+        pair_of_row = np.repeat(np.arange(pair_count), sentence_counts)
+
+        dots = np.asarray(S.multiply(P[post_of_row]).sum(axis=1)).ravel()
+        valid = (s_lens > 0) | (p_lens[post_of_row] > 0)
+        sums = np.bincount(pair_of_row, weights=dots * valid, minlength=pair_count)
+        counts = np.bincount(pair_of_row, weights=valid.astype(np.float64), minlength=pair_count)
+        flat = [round(float(s / c), 3) if c else 0.0 for s, c in zip(sums, counts)]
+    else:
+        flat = [0.0] * pair_count
+
+    scores, pos = [], 0
+    for _, cands in rows:
+        scores.append(flat[pos:pos + len(cands)])
+        pos += len(cands)
+    return scores
+
+
+def score_pairs(pairs):
+    """[(article, post), ...] → [copy_ratio, ...] (벡터화까지 이 프로세스에서 하는 편의 함수)"""
+    rows = [(hashing_scorer.pack([hashing_scorer.post_vector(post)]),
+             [hashing_scorer.pack(hashing_scorer.sentence_vectors(article))])
+            for article, post in pairs]
+    return [s[0] for s in score_vectors(rows)]
@@ -0,0 +1,113 @@
+# core/body_archive.py
+#
+# 매칭된 기사 본문 저장.
+#   - files  (기본): <출력>_본문/NNN_제목.txt 를 행마다 하나씩 (예전과 같음)
+#   - sqlite: <출력>_본문.sqlite3 파일 하나에 행 번호로 색인해서 추가 (AINP_BODY_STORE=sqlite)
+# 5만 행이면 작은 파일 5만 개를 만들게 되어 네트워크 드라이브/백신 검사가 있는 PC 에서 느리다.
+# 아카이브는 Manager 프로세스 안의 BodyArchive 하나만 쓰고(단일 writer), 워커는 프록시로 넘긴다.
+# 낱개 파일이 필요하면: python -m core extract-bodies <출력>_본문.sqlite3 [--output-dir 폴더]
+
+import os
+import re
+import time
+import sqlite3
+import threading
+
+BODY_STORE = os.environ.get("AINP_BODY_STORE", "files").lower()
+ARCHIVE_SUFFIX = "_본문.sqlite3"
+COMMIT_EVERY = 200
+COMMIT_INTERVAL = 2.0
+
+
+def body_filename(index, title):
+    safe_title = re.sub(r'[\\/*?:"<>|]', '', title)[:50]
+    return f"{index+1:03d}_{safe_title}.txt"
+
+
+def body_text(link, body):
+    return f"[URL] {link}\n\n{body}"
+
+
+def archive_path_for(output_path):
+    return os.path.splitext(output_path)[0] + ARCHIVE_SUFFIX
+
+
+class BodyArchive:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS bodies (
+                row INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                body TEXT NOT NULL,
+                written_at REAL NOT NULL
+            );
+        """)
+        self.unsaved = 0
+        self.last_commit = time.monotonic()
+
+    def put(self, index, title, link, body):
+        """index: 0부터 시작하는 행 번호 (파일 이름의 NNN 은 index + 1). 같은 행은 덮어쓴다"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO bodies (row, title, link, body, written_at) VALUES (?, ?, ?, ?, ?)",
+                (index, title, link, body, time.time()))
+            self.unsaved += 1
+            if self.unsaved >= COMMIT_EVERY or time.monotonic() - self.last_commit >= COMMIT_INTERVAL:
+                self._commit()
+
+    def _commit(self):
+        self.conn.commit()
+        self.unsaved = 0
+        self.last_commit = time.monotonic()
+
+    def flush(self):
+        with self.lock:
+            self._commit()
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self._commit()
+            self.conn.close()
+
+
+def write_body(target, index, title, link, body):
+    """target: _본문 폴더 경로 또는 BodyArchive(프록시). 로그용 저장 위치를 돌려준다"""
+    if isinstance(target, str):
+        filename = os.path.join(target, body_filename(index, title))
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(body_text(link, body))
+        return filename
+    target.put(index, title, link, body)
+    return f"본문 아카이브 #{index+1}"
+
+
+def iter_archive(path, rows=None):
+    """(index, title, link, body) 를 행 순서대로. rows: (처음, 끝) 1부터 세는 행 번호 범위"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        sql, params = "SELECT row, title, link, body FROM bodies", ()
+        if rows is not None:
+            sql, params = sql + " WHERE row BETWEEN ? AND ?", (rows[0] - 1, rows[1] - 1)
+        yield from conn.execute(sql + " ORDER BY row", params)
+    finally:
+        conn.close()
+
+
+def extract_archive(path, output_dir=None, rows=None):
+    """아카이브를 예전 형식의 낱개 .txt 파일로 풀어 쓴다. 쓴 파일 수 반환"""
+    output_dir = output_dir or os.path.splitext(path)[0]  # <출력>_본문.sqlite3 → <출력>_본문/
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    for index, title, link, body in iter_archive(path, rows):
+        write_body(output_dir, index, title, link, body)
+        written += 1
+    return written
@@ -0,0 +1,362 @@
+# core/boilerplate.py
+#
+# selector_map 에 없는 언론사 페이지의 본문 추출.
+# 예전에는 페이지의 모든 <p> 를 이어 붙여서 메뉴/관련기사/댓글/푸터까지 본문에 섞였다.
+#   1) 텍스트 밀도: 25자 이상 텍스트 덩어리를 직접 담은 요소에 점수, 부모에는 절반
+#   2) 링크 밀도: 링크 텍스트 비율만큼 점수를 깎음 (메뉴/관련기사 목록)
+#   3) id/class 이름: article/content/view 등은 가점, comment/footer/nav/ad 등은 감점
+# 가장 높은 요소의 텍스트를 쓰고, 그 안에서도 링크 위주 블록과 감점 이름 블록은 뺀다.
+#
+# 호스트별로 고른 요소의 selector(tag#id / tag.class) 를 세어 두었다가 LEARN_AFTER 페이지 연속
+# 같은 selector 가 나오면 learned_selectors.json (캐시 폴더) 에 저장한다. 이후 그 호스트는
+# 빠른 파서로 그 요소만 찾고(조기 종료 포함), 본문 정리(_text_of)는 그 요소 HTML 에만 같게 적용한다 (extract_learned).
+# 표(vote)는 프로세스마다 모아 두었다가 VOTE_SAVE_EVERY 개 / VOTE_SAVE_INTERVAL 초마다 파일과 합쳐 저장한다.
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from html.parser import HTMLParser
+
+from core import profiling
+from core.paths import cache_path
+
+LEARN_AFTER = 3
+MIN_BLOCK_CHARS = 25
+LEARNED_FILE = "learned_selectors.json"
+VOTE_SAVE_EVERY = 20
+VOTE_SAVE_INTERVAL = 30.0
+
+SKIP_TAGS = frozenset("script style noscript iframe svg template head button select option".split())
+VOID_TAGS = frozenset("area base br col embed hr img input link meta param source track wbr".split())
+BLOCK_TAGS = frozenset("div p section article main ul ol table h1 h2 h3 h4 h5 h6 blockquote form".split())
+CANDIDATE_TAGS = frozenset("div section article main td".split())
+BLOCK_SEP_TAGS = BLOCK_TAGS | frozenset(["br", "li", "tr"])
+
+POSITIVE = re.compile(r"article|content|body|news|view|text|story|entry|main", re.I)
+NEGATIVE = re.compile(r"comment|reply|footer|foot|nav|menu|gnb|lnb|sidebar|aside|banner|"
+                      r"ad[-_]|ads|advert|related|recommend|popular|rank|share|sns|copyright|"
+                      r"header|login|search|subscribe|byline", re.I)
+SKIP_BLOCK_TAGS = frozenset("nav header footer aside form".split())
+_NAME = re.compile(r"^[A-Za-z_][\w-]*$")  # CSS 에서 이스케이프 없이 쓸 수 있는 id/class
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "fetch"})
+
+
+class _Node:
+    __slots__ = ("tag", "id", "classes", "parent", "children", "text_len", "link_len", "score")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.id = attrs.get("id") or ""
+        self.classes = (attrs.get("class") or "").split()
+        self.parent = parent
+        self.children = []  # _Node 또는 str
+        self.text_len = 0
+        self.link_len = 0
+        self.score = 0.0
+
+    def name_weight(self):
+        names = " ".join([self.id] + self.classes)
+        if not names:
+            return 0.0
+        weight = 0.0
+        if NEGATIVE.search(names):
+            weight -= 25.0
+        if POSITIVE.search(names):
+            weight += 25.0
+        return weight
+
+    def own_selector(self):
+        # 기사 번호가 들어간 id/class 는 페이지마다 달라서 selector 로 쓸 수 없다
+        if self.id and _NAME.match(self.id) and not re.search(r"\d{3,}", self.id):
+            return f"{self.tag}#{self.id}"
+        classes = [c for c in self.classes if _NAME.match(c) and not re.search(r"\d{3,}", c)]
+        if classes:
+            return self.tag + "".join(f".{c}" for c in classes)
+        return None
+
+    def first_descendant(self, tag):
+        stack = list(reversed(self.children))
+        while stack:
+            n = stack.pop()
+            if isinstance(n, _Node):
+                if n.tag == tag:
+                    return n
+                stack.extend(reversed(n.children))
+        return None
+
+    def selector(self):
+        """이 요소를 다시 찾을 selector. 자기 이름이 없으면 '조상 selector + 태그' (조상 안 첫 번째일 때만)"""
+        own = self.own_selector()
+        if own:
+            return own
+        ancestor = self.parent
+        for _ in range(3):
+            if ancestor is None or ancestor.tag == "#root":
+                break
+            anc = ancestor.own_selector()
+            if anc:
+                return f"{anc} {self.tag}" if ancestor.first_descendant(self.tag) is self else None
+            ancestor = ancestor.parent
+        return None
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#root", {}, None)
+        self.cur = self.root
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag in SKIP_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self.skip_depth = 1
+            return
+        if tag == "br":
+            self.cur.children.append("\n")
+            return
+        if tag in VOID_TAGS:
+            return
+        if tag in BLOCK_TAGS and self.cur.tag == "p":
+            self.cur = self.cur.parent  # <p> 는 블록 요소가 시작되면 암묵적으로 닫힘
+        node = _Node(tag, {k: v or "" for k, v in attrs}, self.cur)
+        self.cur.children.append(node)
+        self.cur = node
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag in SKIP_TAGS:
+                self.skip_depth -= 1
+            return
+        node = self.cur
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.cur = node.parent
+
+    def handle_data(self, data):
+        if not self.skip_depth and data.strip():
+            self.cur.children.append(data)
+
+
+def _measure(node, in_link=False):
+    """후위 순회로 text_len/link_len 계산 (재귀 깊이 문제를 피해 스택 사용)"""
+    order, stack = [], [(node, in_link)]
+    while stack:
+        n, link = stack.pop()
+        order.append((n, link))
+        for c in n.children:
+            if isinstance(c, _Node):
+                stack.append((c, link or c.tag == "a"))
+    for n, link in reversed(order):
+        own = sum(len(c.strip()) for c in n.children if isinstance(c, str))
+        n.text_len = own + sum(c.text_len for c in n.children if isinstance(c, _Node))
+        n.link_len = (own if link else 0) + sum(c.link_len for c in n.children if isinstance(c, _Node))
+    return order
+
+
+def _link_density(node):
+    return node.link_len / node.text_len if node.text_len else 1.0
+
+
+def find_content(root):
+    order = _measure(root)
+    candidates = set()
+    for n, in_link in order:
+        if in_link:
+            continue
+        own = sum(len(c.strip()) for c in n.children if isinstance(c, str))
+        if own < MIN_BLOCK_CHARS:
+            continue
+        # 텍스트 덩어리를 직접 담은 요소(또는 그 <p> 의 부모)와 그 부모에 점수
+        holder = n.parent if n.tag in ("p", "span", "font", "b", "strong") and n.parent is not None else n
+        points = 1.0 + min(own / 100.0, 3.0)
+        for target, share in ((holder, 1.0), (holder.parent, 0.5)):
+            if target is None or target is root:
+                continue
+            if target not in candidates:
+                candidates.add(target)
+                target.score = target.name_weight()
+            target.score += points * share
+
+    best = None
+    for n in candidates:
+        if n.tag not in CANDIDATE_TAGS and n.tag != "body":
+            continue
+        n.score *= (1.0 - _link_density(n))
+        if best is None or n.score > best.score:
+            best = n
+    return best
+
+
+def _text_of(node):
+    """본문 요소 텍스트 (링크 위주 블록, 감점 이름 블록, nav/footer 등은 제외)"""
+    parts = []
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, str):
+            parts.append(n)
+            continue
+        if n is not node:
+            if n.tag in SKIP_BLOCK_TAGS:
+                continue
+            if n.tag in CANDIDATE_TAGS | {"ul", "ol", "table"} and (
+                    _link_density(n) > 0.5 or n.name_weight() < 0):
+                continue
+        if n.tag in BLOCK_SEP_TAGS:
+            parts.append("\n")
+            stack.append("\n")  # 자식들 다음에 꺼내진다
+        stack.extend(reversed(n.children))
+    lines = [re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+# ==== 호스트별 selector 학습 ====
+class SelectorStore:
+    """learned_selectors.json: {"hosts": {host: selector}, "votes": {host: [selector, ...]}}"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"hosts": {}, "votes": {}}
+        self.mtime = None
+        self.pending = {}  # 아직 저장 안 한 표 {host: [selector, ...]}
+        self.pending_count = 0
+        self.last_save = time.monotonic()
+
+    def _file(self):
+        if self.path is None:
+            self.path = cache_path(LEARNED_FILE)
+        return self.path
+
+    def _reload(self):
+        # 다른 워커 프로세스가 배운 selector 도 보이도록 파일이 바뀌면 다시 읽는다
+        path = self._file()
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        if mtime == self.mtime:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+            self.mtime = mtime
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        path = self._file()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        self.mtime = os.path.getmtime(path)
+
+    def get(self, host):
+        with self.lock:
+            self._reload()
+            return self.data["hosts"].get(host)
+
+    def vote(self, host, selector):
+        """이번 페이지에서 고른 selector 를 기록. 저장할 때가 되면 파일과 합쳐서 새로 학습된 [(host, selector)]"""
+        with self.lock:
+            if host in self.data["hosts"]:
+                return []
+            self.pending.setdefault(host, []).append(selector)
+            self.pending_count += 1
+            if self.pending_count < VOTE_SAVE_EVERY and time.monotonic() - self.last_save < VOTE_SAVE_INTERVAL:
+                return []
+            return self._flush()
+
+    def flush(self):
+        with self.lock:
+            return self._flush()
+
+    def _flush(self):
+        # 저장 직전에 파일을 다시 읽어 다른 워커가 남긴 표/학습 결과 뒤에 이 프로세스의 표를 붙인다
+        self.mtime = None
+        self._reload()
+        learned = []
+        for host, selectors in self.pending.items():
+            if host in self.data["hosts"]:
+                continue
+            votes = self.data["votes"].setdefault(host, [])
+            votes.extend(selectors)
+            del votes[:-LEARN_AFTER]
+            selector = votes[-1]
+            if len(votes) == LEARN_AFTER and selector is not None and all(v == selector for v in votes):
+                self.data["hosts"][host] = selector
+                self.data["votes"].pop(host, None)
+                learned.append((host, selector))
+        if self.pending:
+            self._save()
+        self.pending = {}
+        self.pending_count = 0
+        self.last_save = time.monotonic()
+        return learned
+
+    def forget(self, host):
+        """학습한 selector 가 더 이상 매칭되지 않을 때 (사이트 개편)"""
+        with self.lock:
+            self._reload()
+            if self.data["hosts"].pop(host, None) is not None:
+                self._save()
+
+
+_store = SelectorStore()
+
+
+def learned_selector(host):
+    selector = _store.get(host) if host else None
+    profiling.count_cache("learned_selector", selector is not None)
+    return selector
+
+
+def forget_selector(host):
+    _store.forget(host)
+    log(f"🧹 학습된 본문 selector 폐기: {host}")
+
+
+def _build(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def extract_learned(html, selector):
+    """학습한 selector 의 본문 요소를 빠른 파서(html_extract)로 찾고, 그 요소 HTML 에만 트리를 만들어
+    밀도 추출과 같은 정리(_text_of)를 한다. 못 찾으면 None"""
+    from core.html_extract import container_html
+    fragment = container_html(html, selector)
+    if fragment is None:
+        return None
+    root = _build(fragment)
+    node = next((c for c in root.children if isinstance(c, _Node)), None)
+    if node is None:
+        return ""
+    _measure(node)
+    return _text_of(node)
+
+
+def extract(html, host=None):
+    """밀도 기반 본문 추출. 본문 후보를 못 찾으면 "" """
+    best = find_content(_build(html))
+    if best is None:
+        return ""
+    text = _text_of(best)
+    if host and text:
+        for learned_host, selector in _store.vote(host, best.selector()):
+            log(f"📚 본문 selector 학습: {learned_host} → {selector}")
+    return text
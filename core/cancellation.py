@@ -0,0 +1,179 @@
+# core/cancellation.py
+#
+# 워커 프로세스까지 전달되는 취소 토큰.
+# 메인 프로세스는 Manager Event 를 만들어 각 작업에 넘기고, GUI 의 stop_event 가 켜지면
+# 감시 스레드가 토큰을 set 한다. 워커는 API 호출/기사 요청 사이, 그리고 응답 본문을
+# 읽는 도중에도 토큰을 확인해서 Cancelled 를 던진다.
+
+import time
+import threading
+from multiprocessing.managers import SyncManager
+
+
+CHUNK_SIZE = 16 * 1024
+
+
+class Cancelled(Exception):
+    pass
+
+
+_manager = None
+_manager_lock = threading.Lock()
+_credentials = None
+
+
+class SharedManager(SyncManager):
+    """취소 토큰과 실행 전체가 공유하는 객체(호스트 상태, API 키 풀)를 들고 있는 Manager 프로세스"""
+
+
+def _register_shared_types():
+    # 순환 import 를 피하려고 Manager 를 띄우기 직전에 등록
+    from core.host_health import HostHealth
+    from core.credentials import CredentialPool
+    from core.body_archive import BodyArchive
+    SharedManager.register("HostHealth", HostHealth)
+    SharedManager.register("CredentialPool", CredentialPool)
+    SharedManager.register("BodyArchive", BodyArchive)
+
+
+def get_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _register_shared_types()
+            _manager = SharedManager()
+            _manager.start()
+        return _manager
+
+
+def shutdown_manager():
+    global _manager, _credentials
+    with _manager_lock:
+        if _manager is not None:
+            try:
+                _manager.shutdown()
+            except Exception:
+                pass
+            _manager = None
+            _credentials = None
+
+
+def shared_credentials(keys):
+    """Manager 당 하나인 API 키 풀 프록시. 파일 여러 개를 동시에 돌려도(--parallel-files) 키별 간격과
+    사용량을 한 풀에서 센다. 처음 보는 키는 기존 풀에 추가만 한다"""
+    global _credentials
+    manager = get_manager()
+    with _manager_lock:
+        if _credentials is None:
+            _credentials = manager.CredentialPool(keys)
+        else:
+            _credentials.add(keys)
+        return _credentials
+
+
+def new_token():
+    return get_manager().Event()
+
+
+def bridge(stop_event, token, interval=0.05):
+    """stop_event(스레드용) → token(프로세스 공유) 전달 스레드. 끝낼 때 set() 할 Event 반환"""
+    finished = threading.Event()
+
+    def watch():
+        while not finished.is_set():
+            if stop_event.is_set():
+                token.set()
+                return
+            finished.wait(interval)
+
+    threading.Thread(target=watch, daemon=True).start()
+    return finished
+
+
+def is_cancelled(token):
+    """token 은 None / bool / Event 류(is_set) 모두 허용"""
+    if token is None or isinstance(token, bool):
+        return bool(token)
+    try:
+        return token.is_set()
+    except Exception:
+        # Manager 가 이미 내려갔다 = 메인 쪽이 끝났거나 중단됨
+        return True
+
+
+def raise_if_cancelled(token):
+    if is_cancelled(token):
+        raise Cancelled()
+
+
+def _read(url, token, max_bytes, stop_when, kwargs):
+    from core.http_client import get_session  # requests 는 실제로 요청할 때 로딩
+    res = get_session().get(url, stream=True, **kwargs)
+    chunks = []
+    size = 0
+    res.truncated = res.stopped_early = False
+    try:
+        for chunk in res.iter_content(CHUNK_SIZE):
+            if is_cancelled(token):
+                raise Cancelled()
+            if max_bytes is not None and size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                res.truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if stop_when is not None and stop_when(chunk):
+                res.stopped_early = True
+                break
+    finally:
+        # 다 읽지 않고 닫으면 연결은 재사용되지 않지만, 남은 본문을 받느라 기다리지 않는다
+        res.close()
+    res._content = b"".join(chunks)
+    return res
+
+
+def interruptible_get(url, token=None, max_bytes=None, stop_when=None, poll=0.05, **kwargs):
+    """응답 본문을 청크 단위로 읽으며 취소 여부를 확인하는 requests.get
+
+    max_bytes: 이 크기까지만 읽고 나머지는 받지 않는다 (res.truncated = True)
+    stop_when: 청크를 받을 때마다 호출, True 를 돌려주면 거기서 읽기를 멈춘다 (res.stopped_early = True)
+    취소 토큰이 있으면 요청은 보조 스레드에서 하고, 호출한 쪽은 poll 초마다 토큰을 본다.
+    연결/첫 바이트를 기다리는 중(청크 사이가 아님)에 중단돼도 바로 Cancelled 를 던지고 워커를 돌려준다.
+    남은 스레드는 다음 청크에서 중단을 보고 연결을 닫거나, 늦어도 timeout 에 끝난다.
+    (보조 스레드는 Manager 프록시 대신 로컬 Event 를 본다 — 프록시는 스레드마다 새 연결을 맺는다)
+    """
+    raise_if_cancelled(token)
+    if token is None or isinstance(token, bool):
+        return _read(url, token, max_bytes, stop_when, kwargs)
+
+    outcome = {}
+    finished = threading.Event()
+    abandoned = threading.Event()
+
+    def run():
+        try:
+            outcome["res"] = _read(url, abandoned, max_bytes, stop_when, kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            finished.set()
+
+    threading.Thread(target=run, name="interruptible-get", daemon=True).start()
+    while not finished.wait(poll):
+        if is_cancelled(token):
+            abandoned.set()
+            raise Cancelled()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["res"]
+
+
+def wait_or_cancel(seconds, token, step=0.05):
+    """time.sleep 대신: 대기 중에도 취소되면 바로 빠져나온다"""
+    deadline = time.monotonic() + seconds
+    while True:
+        raise_if_cancelled(token)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(step, remaining))
@@ -0,0 +1,140 @@
+# core/charset.py
+#
+# 기사 페이지 바이트 → 문자열.
+# res.text 는 헤더에 charset 이 없으면 본문 전체에 통계적 추정(charset_normalizer/chardet)을 돌려서
+# 큰 EUC-KR 페이지에서 느리고 가끔 틀린다. 여기서는 싼 단서부터 차례로 본다.
+#   1) HTTP Content-Type 의 charset
+#   2) BOM
+#   3) 앞부분 SNIFF_BYTES 안의 <meta charset> / <meta http-equiv content="...charset=...">
+#   4) 처음 나오는 비 ASCII 바이트부터 UTF-8 멀티바이트 문자로 깨짐 없이 풀리는지
+#      (앞부분이 ASCII 뿐이면 판단 근거가 없으므로 UTF-8 로 보지 않는다. 페이지 전체가 ASCII 면 무엇으로 풀어도 같음)
+#   5) 같은 호스트에서 예전에 추정한 인코딩 (프로세스별 캐시)
+#   6) 그래도 모르면 앞부분 DETECT_BYTES 에만 통계적 추정 → 호스트 캐시에 저장
+# euc-kr 계열은 모두 상위 호환인 cp949 로 푼다 (확장 한글이 깨지지 않도록).
+
+import re
+import codecs
+
+from core import profiling
+
+SNIFF_BYTES = 4096
+DETECT_BYTES = 64 * 1024
+
+_KOREAN_ALIASES = {"euc-kr", "euc_kr", "euckr", "ks_c_5601-1987", "ks_c_5601", "ksc5601",
+                   "ksc_5601", "x-windows-949", "windows-949", "ms949", "uhc", "cp949"}
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+_HEADER_CHARSET = re.compile(r"""charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+_host_cache = {}
+
+
+def normalize(name):
+    """인코딩 이름 → 파이썬 codec 이름 (모르는 이름이면 None)"""
+    if not name:
+        return None
+    name = name.strip().strip("\"'").lower()
+    if name in _KOREAN_ALIASES:
+        return "cp949"
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def from_header(content_type):
+    m = _HEADER_CHARSET.search(content_type or "")
+    return normalize(m.group(1)) if m else None
+
+
+def from_bom(content):
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    return None
+
+
+def from_meta(content):
+    m = _META_CHARSET.search(content[:SNIFF_BYTES])
+    return normalize(m.group(1).decode("ascii", "ignore")) if m else None
+
+
+def _non_ascii_sample(content):
+    """처음 나오는 비 ASCII 바이트 근처부터 DETECT_BYTES (없으면 None)"""
+    m = _NON_ASCII.search(content)
+    if m is None:
+        return None
+    start = max(0, m.start() - 64)
+    return content[start:start + DETECT_BYTES]
+
+
+def detect(content):
+    """통계적 추정 (requests 가 쓰는 것과 같은 라이브러리, 비 ASCII 가 나오는 부분만)"""
+    sample = _non_ascii_sample(content) or content[:DETECT_BYTES]
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(sample).best()
+        return normalize(best.encoding) if best else None
+    except ImportError:
+        pass
+    try:
+        import chardet
+        return normalize(chardet.detect(sample).get("encoding"))
+    except ImportError:
+        return None
+
+
+def _is_utf8(content):
+    """비 ASCII 부분이 올바른 UTF-8 멀티바이트 문자로 풀리면 True. ASCII 뿐이면 False"""
+    sample = _non_ascii_sample(content)
+    if sample is None:
+        return False
+    try:
+        # 시작은 ASCII 라 문자 경계가 맞고, 끝은 잘린 멀티바이트 문자일 수 있다
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff(content, content_type=None, host=None):
+    """(인코딩, 근거) — 근거는 header|bom|meta|utf8|ascii|host|detect|default"""
+    encoding = from_header(content_type)
+    if encoding:
+        return encoding, "header"
+    encoding = from_bom(content)
+    if encoding:
+        return encoding, "bom"
+    encoding = from_meta(content)
+    if encoding:
+        return encoding, "meta"
+
+    if _is_utf8(content):
+        return "utf-8", "utf8"
+    if _NON_ASCII.search(content) is None:
+        return "utf-8", "ascii"  # 어느 ASCII 호환 인코딩으로 풀어도 같다
+
+    cached = _host_cache.get(host) if host else None
+    if host:
+        profiling.count_cache("charset_host", cached is not None)
+    if cached:
+        return cached, "host"
+
+    encoding, source = detect(content), "detect"
+    if not encoding:
+        encoding, source = "cp949", "default"  # 국내 언론사 페이지가 대상이므로
+    if host:
+        _host_cache[host] = encoding
+    return encoding, source
+
+
+def decode_html(content, content_type=None, host=None):
+    encoding, _ = sniff(content, content_type, host)
+    return content.decode(encoding, errors="replace")
@@ -5,14 +5,16 @@ import re
 import time
 import requests
 import logging
+import functools
+import threading
 import urllib.parse
-import pandas as pd
-from bs4 import BeautifulSoup
-from konlpy.tag import Okt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from datetime import datetime
 from urllib.parse import urlparse
+from core import profiling, log_backend, boilerplate, host_health
+from core.charset import decode_html
+from core.scoring import char_bigrams, snippet_similarity, split_sentences
+from core.sentences import first_sentences
+from core.html_extract import ContainerWatcher, extract_article, selector_for
+from core.cancellation import Cancelled, interruptible_get, raise_if_cancelled, wait_or_cancel
 
 import sys
 def resource_path(relative_path):
@@ -23,30 +25,41 @@ def resource_path(relative_path):
 
 NAVER_CLIENT_ID = os.environ.get("NAVER_CLIENT_ID", "")
 NAVER_CLIENT_SECRET = os.environ.get("NAVER_CLIENT_SECRET", "")
+# 벤치마크/테스트용 로컬 서버로 바꿔 끼울 수 있도록 환경변수로 덮어쓰기 허용
+NAVER_NEWS_API_URL = os.environ.get("NAVER_NEWS_API_URL", "https://openapi.naver.com/v1/search/news.json")
+API_TIMEOUT = 10
+# 기사 페이지 다운로드 상한 (인라인 스크립트/광고로 수 MB 인 페이지도 이만큼만 받음)
+MAX_PAGE_BYTES = int(os.environ.get("AINP_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
 
 # ==== 로그 설정 ====
-today = datetime.now().strftime("%y%m%d")
-log_dir = resource_path("data/log")
-os.makedirs(log_dir, exist_ok=True)
-log_path = os.path.join(log_dir, f"로그_{today}.txt")
-
+# 실제 파일 기록은 core.log_backend 의 QueueListener 하나가 담당 (JSON-lines)
+log_backend.setup_logging()
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler(log_path, encoding="utf-8")
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-if not logger.hasHandlers():
-    logger.addHandler(file_handler)
 
-def log(msg, index=None):
-    prefix = f"[{index+1:03d}] " if index is not None else ""
-    logger.info(f"{prefix}{msg}")
+def log(msg, index=None, stage=None):
+    logger.info(msg, extra={"row": index + 1 if index is not None else None, "stage": stage})
+
+# ==== 무거운 의존성은 처음 쓸 때 로딩 ====
+# import 만으로 JVM 기동(Okt)/pandas/scikit-learn/리소스 엑셀 로딩이 일어나지 않도록 한다.
+# 미리 데우려면 worker_pool.warm_up_worker 를 쓴다.
+_okt = None
+_okt_lock = threading.Lock()
 
-okt = Okt()
+def get_okt():
+    global _okt
+    if _okt is None:
+        with _okt_lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+                _okt = Okt()
+    return _okt
 
 # 제외 도메인 불러오기
-excluded_domains_file = resource_path("resources/수집 제외 도메인 주소.xlsx")
-excluded_domains = pd.read_excel(excluded_domains_file)["제외 도메인 주소"].dropna().tolist()
+@functools.lru_cache(maxsize=None)
+def load_excluded_domains():
+    import pandas as pd
+    excluded_domains_file = resource_path("resources/수집 제외 도메인 주소.xlsx")
+    return tuple(pd.read_excel(excluded_domains_file)["제외 도메인 주소"].dropna().tolist())
 
 def clean_text(text):
     if not isinstance(text, str):
@@ -66,17 +79,12 @@ def clean_text(text):
     return re.sub(r"\s+", " ", text).strip()
 
 def extract_keywords(text, num_keywords=5):
-    nouns = okt.nouns(text)
+    nouns = get_okt().nouns(text)
     return " ".join(nouns[:num_keywords])
 
 def extract_first_sentences(text):
-    paras = re.split(r'\n{2,}', text.strip())
-    get_first = lambda p: re.split(r'(?<=[.!?])(?=\s|[가-힣])', p.strip())[0] if p else ""
-    get_last = lambda p: re.split(r'(?<=[.!?])(?=\s|[가-힣])', p.strip())[-1].strip() if p else ""
-    first = get_first(paras[0]) if len(paras) > 0 else ""
-    second = get_first(paras[1]) if len(paras) > 1 else ""
-    last = get_last(paras[-1]) if len(paras) > 0 else ""
-    return first, second, last
+    # 문장 경계는 복사율 계산과 같은 분리기 (core/sentences.py, 문서별 오프셋 캐시)
+    return first_sentences(text)
 
 MAX_QUERY_LENGTH = 100
 
@@ -87,16 +95,20 @@ def generate_search_queries(title, first, second, last, press):
     second_clean = truncate(clean_text(second))
     last_clean = truncate(clean_text(last))
     keywords = truncate(extract_keywords(title_clean))
-    queries = list(set(filter(None, [
+    # 변별력이 높을 것으로 보이는 순서 그대로 (중복만 제거, 순서는 항상 같음)
+    queries = list(dict.fromkeys(filter(None, [
         title_clean,
-        keywords + " " + press,
         first_clean,
+        (keywords + " " + press).strip(),
         second_clean,
         last_clean
     ])))
     return queries[:5]
 
+@functools.lru_cache(maxsize=None)
 def load_trusted_oids():
+    import pandas as pd
+
     def load_oid_from_excel(filename):
         try:
             return set(
@@ -115,8 +127,6 @@ def load_trusted_oids():
     entertain_oids = load_oid_from_excel(resource_path("resources/oid 리스트/네이버엔터 신탁언론 oid.xlsx"))
     return news_oids, sports_oids, entertain_oids
 
-trusted_news_oids, trusted_sports_oids, trusted_entertain_oids = load_trusted_oids()
-
 def extract_oid_from_naver_url(link):
     parsed = urlparse(link)
     path = parsed.path
@@ -156,30 +166,65 @@ selector_map = {
     "incheonilbo.com": "article#article-view-content-div",
 }
 
-def fallback_with_requests(url):
+def _get_with_health(url, hostname, health, cancel_token, **kwargs):
+    # 호스트 상태(서킷 브레이커/동시 요청 상한)를 거쳐 요청. 서킷이 열려 있으면 None
+    if health is None:
+        return interruptible_get(url, cancel_token, **kwargs)
+    ticket = host_health.acquire(health, hostname, cancel_token)
+    if ticket is None:
+        log(f"⛔ 응답 없는 호스트 건너뜀 (서킷 열림) - url: {url}", stage="fetch")
+        return None
+    t0 = time.perf_counter()
+    ok, timed_out = None, False
     try:
+        res = interruptible_get(url, cancel_token, **kwargs)
+        ok = res.status_code < 500
+        return res
+    except requests.exceptions.Timeout:
+        ok, timed_out = False, True
+        raise
+    except requests.exceptions.RequestException:
+        ok = False
+        raise
+    finally:
+        health.release(hostname, ticket, ok, time.perf_counter() - t0, timed_out)
+
+def fallback_with_requests(url, cancel_token=None, health=None):
+    try:
+        # 도메인 기반 selector 선택 (가장 긴 접미사 매칭: www.ytn.co.kr → ytn.co.kr)
+        # selector_map 에 없으면 밀도 기반 추출로 학습해 둔 selector
+        hostname = urlparse(url).hostname
+        selector = selector_for(hostname, selector_map)
+        learned = boilerplate.learned_selector(hostname) if not selector else None
+
+        # 본문 요소가 닫히면 나머지는 받지 않고, 어떤 경우든 MAX_PAGE_BYTES 까지만 받는다
         headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get(url, headers=headers, timeout=10)
-        if res.status_code != 200:
+        res = _get_with_health(url, hostname, health, cancel_token, max_bytes=MAX_PAGE_BYTES,
+                               stop_when=ContainerWatcher.for_selector(selector or learned),
+                               headers=headers, timeout=10)
+        if res is None or res.status_code != 200:
             return ""
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        # 도메인 기반 selector 선택
-        hostname = urlparse(url).hostname or ""
-        domain = ".".join(hostname.split('.')[-2:])  # 예: www.ytn.co.kr → ytn.co.kr
-        selector = selector_map.get(domain)
-
-        # selector로 본문 추출
-        if selector:
-            content_div = soup.select_one(selector)
-            if content_div:
-                return content_div.get_text(strip=True)
-
-        # fallback: 모든 <p> 태그 결합
-        return "\n".join(p.get_text(strip=True) for p in soup.find_all("p"))
-
+        if res.truncated:
+            log(f"✂️ 페이지가 {MAX_PAGE_BYTES // 1024}KB 를 넘어 앞부분만 사용 - url: {url}", stage="fetch")
+
+        with profiling.span("parse", host=profiling.host_of(url)):
+            html = decode_html(res.content, res.headers.get("Content-Type"), hostname)
+            # selector로 본문 추출, 없으면 모든 <p> 태그 결합
+            if selector:
+                return extract_article(html, selector)
+            if learned:
+                # 밀도 추출로 배운 selector 라서 정리(링크 블록/감점 블록 제외)도 밀도 추출과 같게
+                body = boilerplate.extract_learned(html, learned)
+                if body:
+                    return body
+                boilerplate.forget_selector(hostname)
+            # 미등록 도메인: 텍스트/링크 밀도로 본문 영역 선택, 실패하면 <p> 결합
+            return boilerplate.extract(html, hostname) or extract_article(html, None)
+
+    except Cancelled:
+        raise
     except Exception as e:
-        log(f"⚠️ fallback 요청 중 예외 발생: {e} - url: {url}")
+        log(f"⚠️ fallback 요청 중 예외 발생: {e} - url: {url}", stage="fetch")
         return ""
 
 # Load stopwords from external txt file
@@ -196,15 +241,24 @@ def load_stopwords():
 STOPWORDS = load_stopwords()
 
 def tokenize_without_stopwords(text):
-    tokens = okt.morphs(text)
+    with profiling.span("tokenize"):
+        tokens = get_okt().morphs(text)
     return [token for token in tokens if token not in STOPWORDS]
 
+# 복사율 계산 방식: tfidf (행마다 2문서 TfidfVectorizer fit) | hashing (배경 IDF + 해싱, core/hashing_scorer.py)
+SCORER = os.environ.get("AINP_SCORER", "tfidf").lower()
+
 def calculate_copy_ratio(article, post):
+    if SCORER == "hashing":
+        from core import hashing_scorer
+        return hashing_scorer.copy_ratio(article, post)
     def clean(t): return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', t)).strip()
     article, post = clean(article), clean(post)
-    sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+', article) if s.strip()]
+    sentences = split_sentences(article)
     if not sentences:
         return 0.0
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
     scores = []
     for s in sentences:
         try:
@@ -216,32 +270,82 @@ def calculate_copy_ratio(article, post):
     return round(sum(scores)/len(scores), 3) if scores else 0.0
 
 def is_excluded(url):
-    return any(domain in url for domain in excluded_domains)
-
-def search_naver_news_api(queries, index, client_id, client_secret):
+    return any(domain in url for domain in load_excluded_domains())
+
+# 검색 결과 요약이 게시글과 이만큼 겹치는 후보의 본문을 받았으면 남은 검색어는 보내지 않는다
+EARLY_STOP_SIMILARITY = float(os.environ.get("AINP_EARLY_STOP_SIMILARITY", "0.8"))
+
+def _naver_get(url, index, headers, cancel_token=None, credentials=None):
+    """검색 API 요청. 키 풀이 있으면 429 로 drain 된 키 대신 다음 키로 같은 요청을 다시 보낸다 (키 수만큼까지).
+    배정할 키가 처음부터 없으면 None, 재시도할 키가 떨어지면 마지막 429 응답"""
+    if credentials is None:
+        with profiling.span("api", index, profiling.host_of(NAVER_NEWS_API_URL)):
+            res = interruptible_get(url, cancel_token, headers=headers, timeout=API_TIMEOUT)
+        with profiling.span("api_wait", index):
+            wait_or_cancel(0.25, cancel_token)  # API 요청 간 딜레이
+        return res
+    res = None
+    for _ in range(max(1, credentials.available())):
+        lease = credentials.acquire()
+        if lease is None:
+            break
+        key, cid, secret, wait = lease
+        with profiling.span("api_wait", index):
+            wait_or_cancel(wait, cancel_token)
+        with profiling.span("api", index, profiling.host_of(NAVER_NEWS_API_URL)):
+            res = interruptible_get(url, cancel_token, timeout=API_TIMEOUT,
+                                    headers={"X-Naver-Client-Id": cid, "X-Naver-Client-Secret": secret})
+        if not credentials.report(key, res.status_code):
+            return res
+        log(f"🔑 API 키 #{key + 1} 한도 초과(429) → 오늘은 다른 키로, 같은 검색어 다시 요청", index, stage="api")
+    return res
+
+
+def search_naver_news_api(queries, index, client_id, client_secret, cancel_token=None, health=None,
+                          post_text=None, credentials=None, problems=None):
+    # credentials: core.credentials.CredentialPool (또는 프록시). 있으면 요청마다 키를 배정받고
+    # 키별 간격은 풀이 맞추므로 고정 딜레이는 쓰지 않는다.
+    # problems: 목록을 넘기면 API 오류/키 소진/본문 수집 실패를 기록한다 (결과가 없을 때 "기사 없음"과 구분용)
+    if problems is None:
+        problems = []
     headers = {
         "X-Naver-Client-Id": client_id,
         "X-Naver-Client-Secret": client_secret
     }
     results = []
     seen_links = set()
-
-    for q in queries:
+    post_bigrams = char_bigrams(post_text) if post_text else None
+    confident = False
+
+    for sent, q in enumerate(queries):
+        if confident:
+            log(f"⏩ 확실한 후보 발견 → 남은 검색어 {len(queries) - sent}개 생략 (API 호출 {len(queries) - sent}회 절약)",
+                index, stage="api")
+            break
         try:
-            url = f"https://openapi.naver.com/v1/search/news.json?query={urllib.parse.quote(q)}&display=5&sort=sim"
-            res = requests.get(url, headers=headers)
-            time.sleep(0.25)  # API 요청 간 딜레이
+            url = f"{NAVER_NEWS_API_URL}?query={urllib.parse.quote(q)}&display=5&sort=sim"
+            res = _naver_get(url, index, headers, cancel_token, credentials)
+            if res is None:
+                log("❌ 사용 가능한 API 키 없음 (모두 한도 소진) → 검색 중단", index, stage="api")
+                problems.append("no_key")
+                break
+            if res.status_code == 429 and credentials is not None and not credentials.available():
+                log(f"❌ 모든 API 키가 한도 초과(429) → 검색 중단 - query: {q}", index, stage="api")
+                problems.append("api_429")
+                break
 
             if res.status_code != 200:
-                log(f"❌ API 응답 오류 [{res.status_code}] - query: {q}", index)
-                log(f"↪ 응답 내용: {res.text}", index)
+                log(f"❌ API 응답 오류 [{res.status_code}] - query: {q}", index, stage="api")
+                log(f"↪ 응답 내용: {res.text}", index, stage="api")
+                problems.append(f"api_{res.status_code}")
                 continue
 
             try:
                 data = res.json()
             except Exception as e:
-                log(f"❌ JSON 파싱 실패: {e} - query: {q}", index)
-                log(f"↪ 원본 응답: {res.text[:300]}...", index)
+                log(f"❌ JSON 파싱 실패: {e} - query: {q}", index, stage="api")
+                log(f"↪ 원본 응답: {res.text[:300]}...", index, stage="api")
+                problems.append("api_json")
                 continue
 
             for item in data.get("items", []):
@@ -253,8 +357,9 @@ def search_naver_news_api(queries, index, client_id, client_secret):
                 if "naver.com" in link:
                     oid = extract_oid_from_naver_url(link)
                     if not oid:
-                        log(f"⚠️ OID 추출 실패 → 스킵: {link}", index)
+                        log(f"⚠️ OID 추출 실패 → 스킵: {link}", index, stage="filter")
                         continue
+                    trusted_news_oids, trusted_sports_oids, trusted_entertain_oids = load_trusted_oids()
                     if "n.news.naver.com" in link and oid not in trusted_news_oids:
                         continue
                     if "sports.naver.com" in link and oid not in trusted_sports_oids:
@@ -263,11 +368,21 @@ def search_naver_news_api(queries, index, client_id, client_secret):
                         continue
 
                 seen_links.add(link)
-                body = fallback_with_requests(link)
+                raise_if_cancelled(cancel_token)
+                with profiling.span("fetch", index, profiling.host_of(link)):
+                    body = fallback_with_requests(link, cancel_token, health)
+                if not body:
+                    problems.append("fetch")  # 요청 실패/예외는 빈 문자열
                 if body and len(body) > 300:
                     results.append({"title": title, "link": link, "body": clean_text(body)})
+                    if post_bigrams is not None:
+                        similarity = snippet_similarity(f"{title} {item.get('description', '')}", post_bigrams)
+                        confident = confident or similarity >= EARLY_STOP_SIMILARITY
 
+        except Cancelled:
+            raise
         except Exception as e:
-            log(f"❌ API 요청 중 예외 발생: {e} - query: {q}", index)
+            log(f"❌ API 요청 중 예외 발생: {e} - query: {q}", index, stage="api")
+            problems.append("api_exception")
 
     return results
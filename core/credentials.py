@@ -0,0 +1,200 @@
+# core/credentials.py
+#
+# 네이버 검색 API 키 여러 개를 묶어 쓰는 풀.
+#   - 키 목록: NAVER_CREDENTIALS_FILE (기본: 실행 파일 옆 resources/naver_credentials.json,
+#     빌드에 같이 묶인 같은 이름의 파일도 읽는다) 과
+#     환경변수 NAVER_CREDENTIALS="id1:secret1[:일일한도],id2:secret2" 를 합친다.
+#     GUI/CLI 에서 입력한 키 한 쌍도 함께 들어간다.
+#   - 키마다 초당 RATE_PER_KEY 회로 간격을 두고, 그중 가장 빨리 쓸 수 있는 키를 배정한다.
+#   - 키별 당일 사용량을 캐시 폴더 naver_usage.json 에 남겨 실행이 바뀌어도 이어서 센다.
+#     저장할 때 파일을 다시 읽어 마지막 저장 이후 이 풀이 쓴 만큼만 더한다 (다른 프로세스/서비스와 같이 써도 합산).
+#   - 429 를 받거나 일일 한도에 닿은 키는 그날은 더 배정하지 않는다 (drain).
+# 메인 프로세스에서 cancellation.shared_credentials(...) 로 Manager 당 하나만 만들어 워커에 프록시로 넘긴다.
+#
+# 파일 형식 (JSON):
+#   [{"client_id": "...", "client_secret": "...", "daily_limit": 25000}, ...]
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+from core.paths import app_path, cache_path, resource_path
+
+DAILY_LIMIT = 25000       # 네이버 검색 API 기본 일일 호출 한도
+CREDENTIALS_FILE = "resources/naver_credentials.json"
+RATE_PER_KEY = float(os.environ.get("AINP_NAVER_RATE_PER_KEY", "10"))
+USAGE_FILE = "naver_usage.json"
+SAVE_EVERY = 20
+
+
+def _parse_env(value):
+    creds = []
+    for item in (value or "").split(","):
+        parts = item.strip().split(":")
+        if len(parts) >= 2 and parts[0] and parts[1]:
+            limit = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else DAILY_LIMIT
+            creds.append({"client_id": parts[0], "client_secret": parts[1], "daily_limit": limit})
+    return creds
+
+
+def load_credentials(extra=None, path=None):
+    """[(client_id, client_secret, daily_limit), ...] — 파일 + 환경변수 + extra, client_id 중복 제거"""
+    creds = []
+    path = path or os.environ.get("NAVER_CREDENTIALS_FILE")
+    # 사용자가 고칠 수 있는 파일이 먼저, 빌드에 묶인 기본 파일(onefile 에서는 읽기 전용 임시 폴더)이 다음
+    paths = [path] if path else list(dict.fromkeys([app_path(CREDENTIALS_FILE), resource_path(CREDENTIALS_FILE)]))
+    for p in paths:
+        if os.path.exists(p):
+            with open(p, "r", encoding="utf-8") as f:
+                creds.extend(json.load(f))
+    creds.extend(_parse_env(os.environ.get("NAVER_CREDENTIALS")))
+    for client_id, client_secret in extra or []:
+        if client_id and client_secret:
+            creds.append({"client_id": client_id, "client_secret": client_secret})
+
+    seen = {}
+    for c in creds:
+        seen.setdefault(c["client_id"], (c["client_id"], c["client_secret"], int(c.get("daily_limit", DAILY_LIMIT))))
+    return list(seen.values())
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class CredentialPool:
+    def __init__(self, credentials, rate_per_key=RATE_PER_KEY, usage_path=None):
+        self._lock = threading.Lock()
+        self.keys = [{"client_id": cid, "client_secret": secret, "daily_limit": limit,
+                      "next_at": 0.0, "drained": None, "calls": 0, "errors": 0}
+                     for cid, secret, limit in credentials]
+        self.interval = 1.0 / rate_per_key if rate_per_key > 0 else 0.0
+        self.usage_path = usage_path
+        self.day = _today()
+        self.usage = {}
+        self.unsaved = {}  # 마지막 저장 이후 키별 사용량
+        self._load_usage()
+
+    def add(self, credentials):
+        """없는 키만 추가. 추가한 개수 반환"""
+        with self._lock:
+            known = {k["client_id"] for k in self.keys}
+            added = 0
+            for cid, secret, limit in credentials:
+                if cid not in known:
+                    self.keys.append({"client_id": cid, "client_secret": secret, "daily_limit": limit,
+                                      "next_at": 0.0, "drained": None, "calls": 0, "errors": 0})
+                    known.add(cid)
+                    added += 1
+            if added:
+                self._load_usage()
+            return added
+
+    # ---- 당일 사용량 ----
+    def _file(self):
+        if self.usage_path is None:
+            self.usage_path = cache_path(USAGE_FILE)
+        return self.usage_path
+
+    def _read_file(self):
+        """파일의 (사용량, drain 사유) — 없거나 날짜가 다르면 빈 dict"""
+        try:
+            with open(self._file(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        if data.get("date") != self.day:
+            return {}, {}
+        return data.get("usage", {}), data.get("drained", {})
+
+    def _merge(self, usage, drained):
+        # 파일 값 + 아직 저장 안 한 이 풀의 사용량. 이 풀이 아는 값보다 줄어들지는 않는다
+        for cid in set(usage) | set(self.unsaved) | set(self.usage):
+            self.usage[cid] = max(self.usage.get(cid, 0), usage.get(cid, 0) + self.unsaved.get(cid, 0))
+        for k in self.keys:
+            k["drained"] = k["drained"] or drained.get(k["client_id"])
+
+    def _load_usage(self):
+        self._merge(*self._read_file())
+
+    def _save_usage(self):
+        usage, drained = self._read_file()
+        self._merge(usage, drained)
+        drained = dict(drained)
+        drained.update({k["client_id"]: k["drained"] for k in self.keys if k["drained"]})
+        path = self._file()
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = {"date": self.day, "usage": self.usage, "drained": drained}
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        self.unsaved = {}
+
+    def _roll_day(self):
+        today = _today()
+        if today != self.day:
+            self.day = today
+            self.usage = {}
+            self.unsaved = {}
+            for k in self.keys:
+                k["drained"] = None
+
+    def save(self):
+        with self._lock:
+            self._save_usage()
+
+    # ---- 배정 ----
+    def acquire(self):
+        """(키 번호, client_id, client_secret, 기다릴 초) 또는 쓸 수 있는 키가 없으면 None"""
+        with self._lock:
+            self._roll_day()
+            now = time.monotonic()
+            best = None
+            for i, k in enumerate(self.keys):
+                if k["drained"]:
+                    continue
+                if self.usage.get(k["client_id"], 0) >= k["daily_limit"]:
+                    k["drained"] = "daily_limit"
+                    continue
+                if best is None or k["next_at"] < self.keys[best]["next_at"]:
+                    best = i
+            if best is None:
+                return None
+            k = self.keys[best]
+            slot = max(now, k["next_at"])
+            k["next_at"] = slot + self.interval
+            k["calls"] += 1
+            self.usage[k["client_id"]] = self.usage.get(k["client_id"], 0) + 1
+            self.unsaved[k["client_id"]] = self.unsaved.get(k["client_id"], 0) + 1
+            if sum(self.unsaved.values()) >= SAVE_EVERY:
+                self._save_usage()
+            return best, k["client_id"], k["client_secret"], slot - now
+
+    def report(self, key, status_code):
+        """응답 코드 반영. 429 면 그 키는 오늘 더 쓰지 않는다. 새로 drain 되면 True"""
+        with self._lock:
+            k = self.keys[key]
+            if status_code == 200:
+                return False
+            k["errors"] += 1
+            if status_code == 429 and not k["drained"]:
+                k["drained"] = "429"
+                self._save_usage()
+                return True
+            return False
+
+    def available(self):
+        with self._lock:
+            self._roll_day()
+            return sum(1 for k in self.keys if not k["drained"])
+
+    def stats(self):
+        with self._lock:
+            return [
+                {"client_id": k["client_id"][:4] + "…", "calls": k["calls"], "errors": k["errors"],
+                 "used_today": self.usage.get(k["client_id"], 0), "daily_limit": k["daily_limit"],
+                 "drained": k["drained"]}
+                for k in self.keys
+            ]
@@ -0,0 +1,181 @@
+# core/daemon.py
+#
+# 감시 폴더 데몬: 입력 폴더에 새로 들어온 엑셀을 전처리 → 원문 매칭까지 자동 처리한다.
+# 워커 풀(Okt JVM/리소스/HTTP 세션)과 메인 프로세스의 리소스 테이블은 작업 사이에도 유지된다.
+#
+#   python -m core watch /mnt/share/exports --output-dir /mnt/share/results
+#
+# 작업마다 <출력폴더>/<파일명>.status.json 에 상태를 남기고,
+# 처리한 파일 목록은 <출력폴더>/.ainp_watch_state.json 에 기록해서 재시작 후에도 중복 처리하지 않는다.
+# 실패한 파일은 MAX_ATTEMPTS 번까지 다시 처리한다. 워커가 죽어 풀이 깨지면 그 작업은 실패로 두고
+# 다음 작업 전에 풀을 새로 만든다 (core/warm_pool.py).
+
+import os
+import json
+import time
+import glob
+import logging
+import traceback
+from datetime import datetime
+
+from core import worker_pool
+from core.warm_pool import WarmPool
+
+STATE_FILE = ".ainp_watch_state.json"
+MAX_ATTEMPTS = 3
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "watch"})
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class WatchDaemon:
+    def __init__(self, input_dir, output_dir, client_id, client_secret, mode="both",
+                 workers=None, poll_interval=5.0, settle_seconds=3.0, stop_event=None):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.mode = mode  # both | preprocess | match
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.stop_event = stop_event
+        self.pool = None
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+        self.state = self._load_state()
+        self._seen = {}  # 파일 → (size, mtime, 처음 본 시각): 복사 중인 파일 건너뛰기용
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+
+    def _stopped(self):
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def warm_up(self):
+        t0 = time.perf_counter()
+        if self.mode in ("both", "match"):
+            # 워커 수만큼 프로세스를 미리 띄워 워밍업. 깨지면 get() 이 다시 만든다
+            self.pool = WarmPool(self.workers or worker_pool.DEFAULT_WORKERS)
+            self.pool.get()
+        if self.mode in ("both", "preprocess"):
+            from core import preprocessing
+            preprocessing.load_untrusted_tables()
+            preprocessing.load_exclude_urls()
+        log(f"🔥 데몬 워밍업 완료 ({time.perf_counter() - t0:.1f}s)")
+
+    def ready_files(self):
+        """크기/수정시각이 settle_seconds 동안 변하지 않은 미처리 엑셀 목록"""
+        ready = []
+        now = time.monotonic()
+        for path in sorted(glob.glob(os.path.join(self.input_dir, "*.xlsx"))):
+            name = os.path.basename(path)
+            if name.startswith("~$"):  # 엑셀 잠금 파일
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            sig = [st.st_size, st.st_mtime]
+            done = self.state.get(name, {})
+            if done.get("sig") == sig and (done.get("status") != "failed"
+                                           or done.get("attempts", 1) >= MAX_ATTEMPTS):
+                continue
+            prev = self._seen.get(name)
+            if prev is None or prev[:2] != sig:
+                self._seen[name] = sig + [now]
+                continue
+            if now - prev[2] >= self.settle_seconds:
+                ready.append((path, sig))
+        return ready
+
+    def run_job(self, path, sig):
+        name = os.path.basename(path)
+        base = os.path.splitext(name)[0]
+        status_path = os.path.join(self.output_dir, f"{base}.status.json")
+        status = {"input": path, "status": "running", "started": _now(), "mode": self.mode}
+        _write_json(status_path, status)
+        log(f"📥 새 파일 처리 시작: {name}")
+        t0 = time.perf_counter()
+
+        last_write = [0.0]
+
+        def on_progress(info):
+            status["progress"] = {k: info[k] for k in ("stage", "done", "total")}
+            if time.monotonic() - last_write[0] >= 5.0:
+                last_write[0] = time.monotonic()
+                _write_json(status_path, status)
+
+        try:
+            match_input = path
+            if self.mode in ("both", "preprocess"):
+                from core.preprocessing import run_preprocessing
+                pre_out = os.path.join(self.output_dir, f"{base}_preprocessed.xlsx")
+                run_preprocessing(path, pre_out, stop_event=self.stop_event, progress_callback=on_progress)
+                status["preprocessed"] = pre_out
+                match_input = pre_out
+            if self.mode in ("both", "match") and not self._stopped():
+                from core.main_scripts_blog_ui_api import main as run_match
+                match_out = os.path.join(self.output_dir, f"{base}_matched.xlsx")
+                executor = self.pool.get()
+                run_match(match_input, match_out, self.client_id, self.client_secret,
+                          stop_event=self.stop_event, progress_callback=on_progress, executor=executor)
+                # 워커가 죽으면 main() 은 남은 행을 빈 결과로 두고 끝난다 → 실패로 두고 다시 처리
+                if getattr(executor, "_broken", False):
+                    raise RuntimeError("워커 프로세스가 비정상 종료되어 일부 행을 처리하지 못했습니다.")
+                status["matched"] = match_out
+            status["status"] = "cancelled" if self._stopped() else "done"
+        except Exception as e:
+            status["status"] = "failed"
+            status["error"] = str(e)
+            status["traceback"] = traceback.format_exc()
+            log(f"❌ {name} 처리 실패: {e}")
+        status["finished"] = _now()
+        status["elapsed_sec"] = round(time.perf_counter() - t0, 2)
+        _write_json(status_path, status)
+
+        if status["status"] != "cancelled":
+            prev = self.state.get(name, {})
+            attempts = prev.get("attempts", 1) + 1 if prev.get("sig") == sig and prev.get("status") == "failed" else 1
+            self.state[name] = {"sig": sig, "status": status["status"], "finished": status["finished"],
+                                "attempts": attempts}
+            _write_json(self.state_path, self.state)
+            if status["status"] == "failed" and attempts < MAX_ATTEMPTS:
+                log(f"🔁 {name} 다시 처리 예정 ({attempts}/{MAX_ATTEMPTS})")
+        log(f"✅ {name} → {status['status']} ({status['elapsed_sec']}s)")
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.warm_up()
+        log(f"👀 감시 시작: {self.input_dir} → {self.output_dir}")
+        try:
+            while not self._stopped():
+                for path, sig in self.ready_files():
+                    if self._stopped():
+                        break
+                    self.run_job(path, sig)
+                if self.stop_event is not None:
+                    self.stop_event.wait(self.poll_interval)
+                else:
+                    time.sleep(self.poll_interval)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            log("👋 감시 종료")
@@ -0,0 +1,229 @@
+# core/hashing_scorer.py
+#
+# 상태 없는(stateless) 복사율 계산기 — AINP_SCORER=hashing 일 때 calculate_copy_ratio 가 사용.
+# 기존 방식은 (문장, 게시글) 마다 TfidfVectorizer 를 새로 fit 해서 IDF 가 그 2문서에서만 나오고,
+# 같은 게시글/기사라도 비교할 때마다 벡터를 다시 만들어야 했다.
+#   - 특징: 토큰 → crc32 % N_FEATURES (HashingVectorizer 와 같은 고정 특징 공간, 어휘 사전 없음)
+#   - IDF:  과거에 매칭된 기사 본문(_본문 폴더)으로 미리 만든 배경 IDF 표 (캐시 폴더 idf_table.json)
+#           smooth idf = ln((1 + N) / (1 + df)) + 1, 표가 없으면 모든 특징 1.0
+#   - 벡터: tf × idf 를 l2 정규화한 희소 dict. 텍스트만으로 정해지므로 행/워커와 무관하게 캐시한다
+# 문장 분리/정제는 기존 방식과 같다 (scoring.clean_for_scoring, split_sentences).
+#
+# IDF 표 만들기: python -m core build-idf out/ archive/2024/   (아래 _본문 폴더/_본문.sqlite3 아카이브를 모두 읽음)
+
+import os
+import json
+import math
+import zlib
+import time
+import logging
+import functools
+import threading
+from collections import Counter
+
+from core.paths import cache_path
+from core.scoring import clean_for_scoring, split_sentences
+
+N_FEATURES = 2 ** 20
+IDF_FILE = "idf_table.json"
+BODY_DIR_SUFFIX = "_본문"
+VECTOR_CACHE_SIZE = 4096
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "score"})
+
+
+def feature_index(token, n_features=N_FEATURES):
+    # Python hash() 는 프로세스마다 달라서 쓸 수 없다
+    return zlib.crc32(token.encode("utf-8")) % n_features
+
+
+def _tokenize(text):
+    from core.core_utils_ui_api import tokenize_without_stopwords
+    return tokenize_without_stopwords(text.lower())
+
+
+def term_counts(text, n_features=N_FEATURES):
+    return Counter(feature_index(t, n_features) for t in _tokenize(text))
+
+
+class IdfTable:
+    def __init__(self, n_docs=0, df=None, n_features=N_FEATURES):
+        self.n_docs = n_docs
+        self.df = df or {}
+        self.n_features = n_features
+
+    def idf(self, index):
+        if not self.n_docs:
+            return 1.0
+        return math.log((1 + self.n_docs) / (1 + self.df.get(index, 0))) + 1.0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["n_docs"], {int(k): v for k, v in data["df"].items()}, data["n_features"])
+
+    def save(self, path, sources=()):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"n_features": self.n_features, "n_docs": self.n_docs,
+                       "built_at": time.strftime("%Y-%m-%d %H:%M:%S"), "sources": list(sources),
+                       "df": {str(k): v for k, v in self.df.items()}}, f)
+        os.replace(tmp, path)
+
+
+# ==== 배경 IDF 표 (파일이 바뀌면 다시 읽고 벡터 캐시도 비운다) ====
+_lock = threading.Lock()
+_table = None
+_table_mtime = None
+
+
+def idf_table():
+    global _table, _table_mtime
+    path = cache_path(IDF_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    with _lock:
+        if _table is None or mtime != _table_mtime:
+            if mtime is None:
+                _table = IdfTable()
+            else:
+                _table = IdfTable.load(path)
+                log(f"📚 배경 IDF 표 로딩: 문서 {_table.n_docs}개, 특징 {len(_table.df)}개")
+            _table_mtime = mtime
+            text_vector.cache_clear()
+        return _table
+
+
+def vector_from_counts(counts, table):
+    weights = {i: c * table.idf(i) for i, c in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if norm == 0.0:
+        return {}
+    return {i: w / norm for i, w in weights.items()}
+
+
+@functools.lru_cache(maxsize=VECTOR_CACHE_SIZE)
+def text_vector(text):
+    """정제된 텍스트 → l2 정규화 tf-idf 희소 벡터 {특징: 가중치} (워커 안에서 행 사이에도 캐시)"""
+    table = _table or IdfTable()
+    return vector_from_counts(term_counts(text, table.n_features), table)
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b[i] for i, w in a.items() if i in b)
+
+
+def post_vector(post):
+    idf_table()
+    return text_vector(clean_for_scoring(post))
+
+
+def sentence_vectors(article):
+    """기사 문장별 벡터 목록 (정제/문장 분리/토큰화/해싱이 모두 여기서 끝난다 — 워커에서 호출)"""
+    idf_table()
+    return [text_vector(s) for s in split_sentences(clean_for_scoring(article))]
+
+
+def pack(vectors):
+    """희소 벡터 목록 → (벡터별 길이, 특징 번호, 가중치) numpy 배열 3개.
+    워커가 돌려줄 때 dict 대신 이 형태로 넘기면 pickle 이 작고, 메인 프로세스는 이어 붙이기만 한다"""
+    import numpy as np
+    lens = np.fromiter((len(v) for v in vectors), dtype=np.int64, count=len(vectors))
+    total = int(lens.sum())
+    indices = np.fromiter((i for v in vectors for i in v), dtype=np.int64, count=total)
+    data = np.fromiter((w for v in vectors for w in v.values()), dtype=np.float64, count=total)
+    return lens, indices, data
+
+
+def ratio_from_vectors(sentence_vecs, post_vec):
+    scores = []
+    for vec in sentence_vecs:
+        if not vec and not post_vec:
+            continue  # 어휘가 비면 기존 방식처럼 건너뜀
+        scores.append(cosine(vec, post_vec))
+    return round(sum(scores) / len(scores), 3) if scores else 0.0
+
+
+def copy_ratio(article, post):
+    return ratio_from_vectors(sentence_vectors(article), post_vector(post))
+
+
+# ==== IDF 표 만들기 ====
+def _body_dirs(roots):
+    for root in roots:
+        if os.path.basename(os.path.normpath(root)).endswith(BODY_DIR_SUFFIX):
+            yield root
+            continue
+        for dirpath, dirnames, _ in os.walk(root):
+            for d in sorted(dirnames):
+                if d.endswith(BODY_DIR_SUFFIX):
+                    yield os.path.join(dirpath, d)
+
+
+def read_body(path):
+    # 저장 형식: "[URL] 링크\n\n본문"
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    if text.startswith("[URL]"):
+        text = text.split("\n\n", 1)[1] if "\n\n" in text else ""
+    return text
+
+
+def _archives(roots):
+    from core.body_archive import ARCHIVE_SUFFIX
+    for root in roots:
+        if os.path.isfile(root):
+            if root.endswith(ARCHIVE_SUFFIX):
+                yield root
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for name in sorted(filenames):
+                if name.endswith(ARCHIVE_SUFFIX):
+                    yield os.path.join(dirpath, name)
+
+
+def iter_bodies(roots):
+    from core.body_archive import iter_archive
+    seen = set()
+    for d in _body_dirs([r for r in roots if os.path.isdir(r)]):
+        for name in sorted(os.listdir(d)):
+            path = os.path.join(d, name)
+            if name.endswith(".txt") and path not in seen:
+                seen.add(path)
+                yield read_body(path)
+    for path in _archives(roots):
+        for _, _, _, body in iter_archive(path):
+            yield body
+
+
+def build_idf(roots, output_path=None, n_features=N_FEATURES, stop_event=None):
+    """_본문 폴더/본문 아카이브의 기사들로 문서 빈도를 세어 IDF 표 저장. 중복 본문은 한 번만 센다"""
+    output_path = output_path or cache_path(IDF_FILE)
+    df = Counter()
+    n_docs = 0
+    seen = set()
+    t0 = time.perf_counter()
+    for body in iter_bodies(roots):
+        if stop_event is not None and stop_event.is_set():
+            log("🛑 IDF 표 만들기 중단 (저장하지 않음)")
+            return None
+        text = clean_for_scoring(body)
+        digest = zlib.crc32(text.encode("utf-8"))
+        if not text or digest in seen:
+            continue
+        seen.add(digest)
+        df.update(set(term_counts(text, n_features)))
+        n_docs += 1
+        if n_docs % 500 == 0:
+            log(f"📚 IDF: 기사 {n_docs}개 처리 ({time.perf_counter() - t0:.0f}s)")
+    table = IdfTable(n_docs, dict(df), n_features)
+    table.save(output_path, sources=[os.path.abspath(r) for r in roots])
+    log(f"✅ IDF 표 저장: 기사 {n_docs}개, 특징 {len(df)}개 → {output_path} ({time.perf_counter() - t0:.1f}s)")
+    return table
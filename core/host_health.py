@@ -0,0 +1,151 @@
+# core/host_health.py
+#
+# 언론사 호스트별 상태 추적 (실행 전체, 모든 워커 공유).
+#   - 서킷 브레이커: 연속 FAIL_THRESHOLD 번 실패(타임아웃/연결 오류/5xx)하면 COOLDOWN 동안
+#     그 호스트 요청을 보내지 않고 바로 건너뛴다. 쿨다운이 끝나면 요청 하나만 시험 삼아 보내고
+#     (half-open) 성공하면 닫고, 실패하면 쿨다운을 두 배로 늘려 다시 연다.
+#   - AIMD 동시 요청 상한: 빠른 성공마다 +1/limit, 실패나 느린 응답이면 절반(또는 0.7배).
+#     상한만큼 요청이 나가 있으면 자리가 날 때까지 잠깐 기다린다.
+# 메인 프로세스에서는 cancellation.get_manager().HostHealth() 로 만든 프록시를 워커에 넘기고,
+# 서비스 모드(스레드)에서는 HostHealth() 를 그대로 쓴다. 호스트별 통계는 실행 프로파일에 들어간다.
+
+import time
+import uuid
+import threading
+
+from core.cancellation import wait_or_cancel
+
+FAIL_THRESHOLD = 3
+COOLDOWN_SEC = 60.0
+MAX_COOLDOWN_SEC = 600.0
+SLOW_SEC = 5.0
+INITIAL_LIMIT = 4.0
+MIN_LIMIT = 1.0
+MAX_LIMIT = 16.0
+LEASE_SEC = 60.0       # 워커가 죽어서 release 못 한 자리는 이 시간 뒤 회수
+MAX_SLOT_WAIT = 10.0   # 자리를 이만큼 기다려도 안 나면 그냥 보낸다
+
+
+class _Host:
+    __slots__ = ("state", "failures", "open_until", "cooldown", "limit", "inflight", "latency",
+                 "ok", "errors", "timeouts", "short_circuited", "waited", "opened")
+
+    def __init__(self):
+        self.state = "closed"      # closed | open | half_open
+        self.failures = 0
+        self.open_until = 0.0
+        self.cooldown = COOLDOWN_SEC
+        self.limit = INITIAL_LIMIT
+        self.inflight = {}         # ticket → 시작 시각
+        self.latency = None        # EWMA (초)
+        self.ok = self.errors = self.timeouts = self.short_circuited = self.waited = self.opened = 0
+
+
+class HostHealth:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, host):
+        h = self._hosts.get(host)
+        if h is None:
+            h = self._hosts[host] = _Host()
+        return h
+
+    def try_acquire(self, host):
+        """("ok", ticket) | ("open", 남은 쿨다운 초) | ("busy", None)"""
+        now = time.monotonic()
+        with self._lock:
+            h = self._host(host)
+            for ticket, started in list(h.inflight.items()):
+                if now - started > LEASE_SEC:
+                    del h.inflight[ticket]
+            if h.state == "open":
+                if now < h.open_until:
+                    h.short_circuited += 1
+                    return "open", h.open_until - now
+                h.state = "half_open"
+            if h.state == "half_open" and h.inflight:
+                # 시험 요청이 끝날 때까지 나머지는 건너뛴다
+                h.short_circuited += 1
+                return "open", 0.0
+            if len(h.inflight) >= int(h.limit):
+                return "busy", None
+            ticket = uuid.uuid4().hex
+            h.inflight[ticket] = now
+            return "ok", ticket
+
+    def note_wait(self, host):
+        with self._lock:
+            self._host(host).waited += 1
+
+    def release(self, host, ticket, ok, latency=None, timeout=False):
+        """ok=None 이면 (취소 등) 결과를 반영하지 않고 자리만 돌려준다"""
+        now = time.monotonic()
+        with self._lock:
+            h = self._host(host)
+            h.inflight.pop(ticket, None)
+            if ok is None:
+                if h.state == "half_open":
+                    h.state = "open"  # 시험 요청이 취소됐으면 다음 요청이 다시 시험
+                    h.open_until = now
+                return h.state
+            if latency is not None:
+                h.latency = latency if h.latency is None else 0.8 * h.latency + 0.2 * latency
+            if ok:
+                h.ok += 1
+                h.failures = 0
+                if h.state == "half_open":
+                    h.state = "closed"
+                    h.cooldown = COOLDOWN_SEC
+                if latency is not None and latency > SLOW_SEC:
+                    h.limit = max(MIN_LIMIT, h.limit * 0.7)
+                else:
+                    h.limit = min(MAX_LIMIT, h.limit + 1.0 / h.limit)
+            else:
+                h.errors += 1
+                h.timeouts += 1 if timeout else 0
+                h.failures += 1
+                h.limit = max(MIN_LIMIT, h.limit * 0.5)
+                if h.state == "half_open":
+                    h.cooldown = min(MAX_COOLDOWN_SEC, h.cooldown * 2)
+                if h.state == "half_open" or h.failures >= FAIL_THRESHOLD:
+                    h.state = "open"
+                    h.open_until = now + h.cooldown
+                    h.opened += 1
+            return h.state
+
+    def stats(self):
+        with self._lock:
+            return {
+                host: {
+                    "state": h.state,
+                    "ok": h.ok,
+                    "errors": h.errors,
+                    "timeouts": h.timeouts,
+                    "short_circuited": h.short_circuited,
+                    "waited_for_slot": h.waited,
+                    "opened": h.opened,
+                    "limit": round(h.limit, 2),
+                    "latency_ewma_sec": round(h.latency, 3) if h.latency is not None else None,
+                }
+                for host, h in sorted(self._hosts.items())
+            }
+
+
+def acquire(health, host, cancel_token=None):
+    """자리를 얻으면 ticket, 서킷이 열려 있으면 None. (자리가 없으면 MAX_SLOT_WAIT 까지 대기)"""
+    deadline = time.monotonic() + MAX_SLOT_WAIT
+    waited = False
+    while True:
+        verdict, value = health.try_acquire(host)
+        if verdict == "ok":
+            return value
+        if verdict == "open":
+            return None
+        if not waited:
+            health.note_wait(host)
+            waited = True
+        if time.monotonic() >= deadline:
+            return ""  # 자리 정보가 어긋났을 수 있으니 그냥 보낸다 (release 시 무시됨)
+        wait_or_cancel(0.05, cancel_token)
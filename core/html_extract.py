@@ -0,0 +1,268 @@
+# core/html_extract.py
+#
+# 기사 HTML → 본문 텍스트.
+# selectolax(lexbor) → lxml → BeautifulSoup(html.parser) 순으로 설치된 빠른 파서를 쓰고,
+# 빠른 파서가 예외를 내면 그 페이지만 BeautifulSoup 으로 다시 처리한다.
+# 결과는 기존 fallback_with_requests 와 같은 규칙:
+#   - 도메인 selector 가 있고 매칭되면 그 요소의 텍스트 (get_text(strip=True) 와 동일하게 이어 붙임)
+#   - 아니면 모든 <p> 텍스트를 줄바꿈으로 결합
+# container_html: selector 요소의 HTML 만 잘라 준다 (학습한 selector 경로 — 정리는 boilerplate 가 그 조각에만)
+#
+# AINP_HTML_PARSER=auto|selectolax|lxml|bs4 로 백엔드를 고정할 수 있다 (벤치마크/문제 확인용).
+#
+# ContainerWatcher: 다운로드 중인 청크를 점진적으로 파싱해서 selector 의 본문 요소가
+# 닫히는 순간을 알려준다 → 그 뒤(댓글/광고/스크립트)는 받지 않는다.
+
+import os
+import re
+import logging
+from html.parser import HTMLParser
+
+HTML_PARSER = os.environ.get("AINP_HTML_PARSER", "auto").lower()
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "fetch"})
+
+
+def selector_for(hostname, selector_map):
+    """호스트명의 가장 긴 접미사로 selector 조회 (www.ytn.co.kr → ytn.co.kr, n.news.naver.com 그대로)"""
+    labels = (hostname or "").lower().split(".")
+    for i in range(len(labels) - 1):
+        selector = selector_map.get(".".join(labels[i:]))
+        if selector:
+            return selector
+    return None
+
+
+# ==== 백엔드 ====
+def _extract_selectolax(html, selector, paragraphs=True):
+    from selectolax.parser import HTMLParser
+    tree = HTMLParser(html)
+    if selector:
+        node = tree.css_first(selector)
+        if node is not None:
+            return node.text(deep=True, separator="", strip=True)
+    if not paragraphs:
+        return None
+    return "\n".join(p.text(deep=True, separator="", strip=True) for p in tree.css("p"))
+
+
+def _lxml_text(el):
+    # 주석/PI 는 빼고 텍스트 노드만 (bs4 get_text 와 같은 범위)
+    return "".join(t.strip() for t in el.xpath(".//text()"))
+
+
+def _extract_lxml(html, selector, paragraphs=True):
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    root = lxml.html.document_fromstring(html)
+    if selector:
+        found = CSSSelector(selector)(root)
+        if found:
+            return _lxml_text(found[0])
+    if not paragraphs:
+        return None
+    return "\n".join(_lxml_text(p) for p in root.iter("p"))
+
+
+def _extract_bs4(html, selector, paragraphs=True):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    if selector:
+        content_div = soup.select_one(selector)
+        if content_div:
+            return content_div.get_text(strip=True)
+    if not paragraphs:
+        return None
+    return "\n".join(p.get_text(strip=True) for p in soup.find_all("p"))
+
+
+BACKENDS = {
+    "selectolax": _extract_selectolax,
+    "lxml": _extract_lxml,
+    "bs4": _extract_bs4,
+}
+
+
+def _container_selectolax(html, selector):
+    from selectolax.parser import HTMLParser
+    node = HTMLParser(html).css_first(selector)
+    return node.html if node is not None else None
+
+
+def _container_lxml(html, selector):
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    found = CSSSelector(selector)(lxml.html.document_fromstring(html))
+    return lxml.html.tostring(found[0], encoding="unicode", with_tail=False) if found else None
+
+
+def _container_bs4(html, selector):
+    from bs4 import BeautifulSoup
+    node = BeautifulSoup(html, "html.parser").select_one(selector)
+    return str(node) if node is not None else None
+
+
+CONTAINER_BACKENDS = {
+    "selectolax": _container_selectolax,
+    "lxml": _container_lxml,
+    "bs4": _container_bs4,
+}
+
+
+def _available(name):
+    try:
+        if name == "selectolax":
+            import selectolax.parser  # noqa: F401
+        elif name == "lxml":
+            import lxml.html  # noqa: F401
+            import lxml.cssselect  # noqa: F401  (cssselect 패키지 필요)
+        else:
+            import bs4  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def pick_backend(preferred=None):
+    preferred = (preferred or HTML_PARSER).lower()
+    if preferred != "auto":
+        return preferred
+    for name in ("selectolax", "lxml"):
+        if _available(name):
+            return name
+    return "bs4"
+
+
+_backend = None
+
+
+def extract_article(html, selector=None, backend=None, paragraphs=True):
+    """paragraphs=False 면 selector 가 매칭되지 않을 때 <p> 결합 대신 None"""
+    global _backend
+    if backend is None:
+        if _backend is None:
+            _backend = pick_backend()
+        backend = _backend
+    if backend != "bs4":
+        try:
+            return BACKENDS[backend](html, selector, paragraphs)
+        except Exception as e:
+            log(f"⚠️ {backend} 파싱 실패, BeautifulSoup 으로 재시도: {e}")
+    return _extract_bs4(html, selector, paragraphs)
+
+
+def container_html(html, selector, backend=None):
+    """selector 에 맞는 첫 요소의 HTML (없으면 None). 파서 선택/재시도는 extract_article 과 같다"""
+    global _backend
+    if backend is None:
+        if _backend is None:
+            _backend = pick_backend()
+        backend = _backend
+    if backend != "bs4":
+        try:
+            return CONTAINER_BACKENDS[backend](html, selector)
+        except Exception as e:
+            log(f"⚠️ {backend} 파싱 실패, BeautifulSoup 으로 재시도: {e}")
+    return _container_bs4(html, selector)
+
+
+# ==== 다운로드 조기 종료 ====
+VOID_TAGS = frozenset("area base br col embed hr img input link meta param source track wbr".split())
+
+_COMPOUND = re.compile(r"""^([a-zA-Z][a-zA-Z0-9-]*)?((?:[#.][\w-]+|\[[\w-]+(?:=['"]?[^'"\]]*['"]?)?\])*)$""")
+_PART = re.compile(r"""#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=['"]?([^'"\]]*)['"]?)?\]""")
+
+
+def parse_selector(selector):
+    """'div#a .b[itemprop=x]' → [(tag, id, {class}, {attr: value|None}), ...] (후손 결합만 지원, 아니면 None)"""
+    compounds = []
+    for token in (selector or "").split():
+        m = _COMPOUND.match(token)
+        if not m:
+            return None
+        tag, rest = m.group(1), m.group(2)
+        ident, classes, attrs = None, set(), {}
+        for pid, pclass, pattr, pvalue in _PART.findall(rest):
+            if pid:
+                ident = pid
+            elif pclass:
+                classes.add(pclass)
+            else:
+                attrs[pattr] = pvalue if pvalue != "" else None
+        compounds.append((tag.lower() if tag else None, ident, classes, attrs))
+    return compounds or None
+
+
+def _matches(compound, tag, attrs):
+    want_tag, ident, classes, want_attrs = compound
+    if want_tag and want_tag != tag:
+        return False
+    if ident and attrs.get("id") != ident:
+        return False
+    if classes and not classes <= set((attrs.get("class") or "").split()):
+        return False
+    for name, value in want_attrs.items():
+        if name not in attrs or (value is not None and attrs[name] != value):
+            return False
+    return True
+
+
+class _StackParser(HTMLParser):
+    """열린 요소 스택만 관리하는 가벼운 파서 (본문 요소가 닫히면 closed=True)"""
+
+    def __init__(self, compounds):
+        super().__init__(convert_charrefs=False)
+        self.compounds = compounds
+        self.stack = []            # [(tag, attrs)]
+        self.container_depth = None
+        self.closed = False
+
+    def _is_container(self, tag, attrs):
+        if not _matches(self.compounds[-1], tag, attrs):
+            return False
+        # 나머지 compound 들은 조상 요소에서 순서대로 찾는다
+        want = len(self.compounds) - 2
+        for anc_tag, anc_attrs in reversed(self.stack):
+            if want < 0:
+                break
+            if _matches(self.compounds[want], anc_tag, anc_attrs):
+                want -= 1
+        return want < 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.closed or tag in VOID_TAGS:
+            return
+        attrs = {k: v or "" for k, v in attrs}
+        if self.container_depth is None and self._is_container(tag, attrs):
+            self.container_depth = len(self.stack)
+        self.stack.append((tag, attrs))
+
+    def handle_endtag(self, tag):
+        if self.closed:
+            return
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+        else:
+            return  # 짝 없는 닫는 태그는 무시
+        if self.container_depth is not None and len(self.stack) <= self.container_depth:
+            self.closed = True
+
+
+class ContainerWatcher:
+    """interruptible_get(stop_when=...) 용: 청크(bytes)를 받아 본문 요소가 닫혔으면 True"""
+
+    def __init__(self, selector):
+        self.parser = _StackParser(parse_selector(selector))
+
+    @classmethod
+    def for_selector(cls, selector):
+        return cls(selector) if parse_selector(selector) else None
+
+    def __call__(self, chunk):
+        # 태그/속성 이름만 보면 되므로 바이트 그대로 latin-1 로 푼다 (청크 경계에서 깨지지 않음)
+        self.parser.feed(chunk.decode("latin-1"))
+        return self.parser.closed
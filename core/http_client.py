@@ -0,0 +1,29 @@
+# core/http_client.py
+#
+# 프로세스당 하나의 requests.Session 을 재사용해서 keep-alive 연결을 유지한다.
+# (워커가 살아 있는 동안 같은 언론사/API 호스트로의 TCP/TLS 연결을 다시 맺지 않음)
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_MAXSIZE = 16
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def get_session():
+    global _session, _session_pid
+    with _lock:
+        # fork 로 넘어온 세션의 소켓은 부모와 공유되므로 프로세스가 바뀌면 새로 만든다
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session, _session_pid = session, os.getpid()
+        return _session
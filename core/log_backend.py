@@ -0,0 +1,127 @@
+# core/log_backend.py
+#
+# 로그 백엔드: 모든 프로세스는 QueueHandler 로 큐에 넣기만 하고,
+# 메인 프로세스의 QueueListener 하나가 로그_YYMMDD.txt 에 JSON-lines 로 기록한다.
+#   {"time": ..., "level": "INFO", "row": 3, "stage": "fetch", "msg": ...}
+# 날짜가 바뀌면 그날 파일로 옮겨 쓴다 (DailyFileHandler). GUI 도 log_path_for() 로 같은 파일을 따라간다.
+
+import os
+import sys
+import json
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+from datetime import datetime
+
+def resource_path(relative_path):
+    """兼容PyInstaller和源码运行的资源路径"""
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+LOG_DIR = resource_path("data/log")
+
+_queue = None
+_listener = None
+
+
+def log_path_for(day=None):
+    day = day or datetime.now().strftime("%y%m%d")
+    return os.path.join(LOG_DIR, f"로그_{day}.txt")
+
+
+def format_line(data):
+    """JSON 로그 레코드를 사람이 읽는 한 줄로 변환 (GUI/콘솔 공용)"""
+    prefix = f"[{data['row']:03d}] " if data.get("row") is not None else ""
+    return f"{data.get('time', '')} - {data.get('level', '')} - {prefix}{data.get('msg', '')}"
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "row": getattr(record, "row", None),
+            "stage": getattr(record, "stage", None),
+            "pid": record.process,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            data["msg"] += "\n" + self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class PlainFormatter(JsonLineFormatter):
+    def format(self, record):
+        return format_line(json.loads(super().format(record)))
+
+
+class DailyFileHandler(logging.FileHandler):
+    """기록할 때마다 log_path_for() 를 확인해서 자정이 지나면 새 날짜 파일로 바꾼다"""
+
+    def __init__(self, encoding="utf-8"):
+        super().__init__(log_path_for(), encoding=encoding)
+
+    def emit(self, record):
+        path = os.path.abspath(log_path_for())
+        if path != self.baseFilename:
+            self.acquire()
+            try:
+                self.close()
+                self.baseFilename = path
+                self.stream = None  # 다음 emit 에서 새 파일을 연다
+            finally:
+                self.release()
+        super().emit(record)
+
+
+def _install(handler):
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def setup_logging(stream=False):
+    """메인 프로세스에서 큐 + 단일 writer 를 구성하고 큐를 반환 (중복 호출 무시)"""
+    global _queue, _listener
+    if _listener is not None:
+        return _queue
+    if multiprocessing.parent_process() is not None:
+        # spawn 된 워커가 모듈을 import 하는 경우: configure_worker() 가 따로 붙인다
+        return None
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    file_handler = DailyFileHandler()
+    file_handler.setFormatter(JsonLineFormatter())
+    handlers = [file_handler]
+    if stream and sys.stderr is not None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(PlainFormatter())
+        handlers.append(stream_handler)
+
+    _queue = multiprocessing.Queue(-1)
+    _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _install(logging.handlers.QueueHandler(_queue))
+    atexit.register(shutdown_logging)
+    return _queue
+
+
+def configure_worker(queue):
+    """ProcessPoolExecutor initializer: 워커의 로그를 메인 프로세스 큐로 보낸다"""
+    if queue is not None:
+        _install(logging.handlers.QueueHandler(queue))
+
+
+def get_queue():
+    return _queue
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
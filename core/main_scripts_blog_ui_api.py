@@ -1,14 +1,35 @@
 # ✅ 수정된 core/main_scripts_blog_ui_api.py
 
 import os
-import re
+import random
 import pandas as pd
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import wait, FIRST_COMPLETED
 from core.core_utils_ui_api import (
     clean_text, extract_first_sentences, generate_search_queries,
-    search_naver_news_api, calculate_copy_ratio, log
+    search_naver_news_api, calculate_copy_ratio, log, SCORER
 )
+from core import profiling, hashing_scorer
+from core.progress import ProgressTracker
+from core import cancellation, worker_pool
+from core.cancellation import Cancelled, is_cancelled
+from core.credentials import load_credentials
+from core.processed_store import ProcessedStore, content_hash
+from core.body_archive import BODY_STORE, archive_path_for, write_body
+
+# 중지 후 진행 중인 행의 결과를 기다려 주는 최대 시간(초)
+CANCEL_GRACE_SEC = 0.5
+# 이미 매칭한 게시글은 다시 매칭하지 않는다 (core/processed_store.py, AINP_INCREMENTAL=0 이면 끔)
+INCREMENTAL = os.environ.get("AINP_INCREMENTAL", "1") != "0"
+# AINP_SCORER=hashing 이면 워커는 검색/수집만 하고, 채점은 메인 프로세스에서 여러 행의 쌍을
+# BATCH_PAIRS 개씩 모아 희소 행렬로 한 번에 한다 (core/batch_scoring.py, AINP_BATCH_SCORING=0 이면 끔)
+BATCH_SCORING = os.environ.get("AINP_BATCH_SCORING", "1") != "0"
+BATCH_PAIRS = int(os.environ.get("AINP_BATCH_PAIRS", "256"))
+# 행 처리 결과. 증분 기록(ProcessedStore)에는 MATCHED/MISS 만 남기고, 오류/중단 행은 다음 실행에서 다시 매칭한다
+MATCHED = "matched"      # 원본 기사 찾음
+MISS = "miss"            # 검색이 오류 없이 끝났고 기준을 넘는 후보가 없음
+ERROR = "error"          # API 오류/키 소진/본문 수집 실패/예외
+CANCELLED = "cancelled"
 
 import sys
 def resource_path(relative_path):
@@ -17,87 +38,130 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
-def find_original_article_api(index, row_dict, total_count, output_dir, stop_event_flag, client_id, client_secret):
-    try:
-        # 检查中断
-        if stop_event_flag:
-            log("🛑 사용자 중단 요청 감지, 작업 중단", index)
-            return index, "", 0.0
-        
-        title = clean_text(str(row_dict.get("게시글제목", "")))
-        content = clean_text(str(row_dict.get("게시글내용", "")))
-        press = clean_text(str(row_dict.get("검색어", "")))
+def _search_row(index, row_dict, stop_event_flag, client_id, client_secret, health=None, credentials=None):
+    """검색어 생성 → 검색 → 후보 기사 수집. (게시글 제목, 게시글 텍스트, 후보 목록, 결과)
+    결과: 매칭되는 후보가 없을 때의 결과 — 검색 중 문제가 있었으면 ERROR, 중단이면 CANCELLED, 아니면 MISS"""
+    title = clean_text(str(row_dict.get("게시글제목", "")))
+    content = clean_text(str(row_dict.get("게시글내용", "")))
+    press = clean_text(str(row_dict.get("검색어", "")))
+    post_text = title + " " + content
+    with profiling.span("query", index):
         first, second, last = extract_first_sentences(content)
         queries = generate_search_queries(title, first, second, last, press)
-        log(f"🔍 검색어: {queries}", index)
+    log(f"🔍 검색어: {queries}", index, stage="query")
+
+    # 检查中断
+    if is_cancelled(stop_event_flag):
+        log("🛑 사용자 중단 요청 감지, 작업 중단", index)
+        return title, post_text, [], CANCELLED
+
+    problems = []
+    search_results = search_naver_news_api(queries, index, client_id, client_secret,
+                                           cancel_token=stop_event_flag, health=health,
+                                           post_text=post_text, credentials=credentials, problems=problems)
+    outcome = ERROR if problems else MISS
+    if not search_results:
+        log("❌ 관련 뉴스 없음" if outcome == MISS else f"❌ 관련 뉴스 없음 (검색 중 문제: {', '.join(sorted(set(problems)))})",
+            index)
+        return title, post_text, [], outcome
+
+    # 检查中断
+    if is_cancelled(stop_event_flag):
+        log("🛑 사용자 중단 요청 감지, 작업 중단", index)
+        return title, post_text, [], CANCELLED
+    return title, post_text, search_results, outcome
 
+def save_best(index, title, search_results, scores, output_dir, outcome=MISS, cancel_token=None):
+    # 복사율이 가장 높은 후보(동점이면 앞의 것)의 본문을 저장하고 (index, 하이퍼링크, 복사율, 결과)
+    # outcome: 기준을 넘는 후보가 없을 때 돌려줄 결과 (_search_row 의 결과)
+    # cancel_token: 워커에서 부를 때. 중단됐으면 쓰지 않는다 (main() 이 이미 _본문/아카이브를 닫았을 수 있음)
+    if is_cancelled(cancel_token):
+        log("🛑 사용자 중단 요청 감지, 본문 저장 생략", index)
+        return index, "", 0.0, CANCELLED
+    best_i = max(range(len(scores)), key=scores.__getitem__)
+    best, score = search_results[best_i], scores[best_i]
+    if score >= 0.0:
+        # output_dir: _본문 폴더 경로 또는 본문 아카이브 (core/body_archive.py)
+        with profiling.span("write", index):
+            location = write_body(output_dir, index, title, best["link"], best["body"])
+        log(f"📝 저장 완료 → {location} (복사율: {score})", index, stage="write")
+        hyperlink = f'=HYPERLINK("{best["link"]}")'
+        return index, hyperlink, score, MATCHED
+    else:
+        log(f"⚠️ 복사율 낮음 (복사율: {score})", index)
+        return index, "", 0.0, outcome
+
+def find_original_article_api(index, row_dict, total_count, output_dir, stop_event_flag, client_id, client_secret,
+                              health=None, credentials=None):
+    # stop_event_flag: bool 또는 cancellation 토큰(Manager Event)
+    # health: 워커 공유 호스트 상태 (core.host_health, Manager 프록시)
+    # credentials: 워커 공유 API 키 풀 (core.credentials, Manager 프록시)
+    # 반환: (index, 하이퍼링크, 복사율, 결과 — MATCHED/MISS/ERROR/CANCELLED)
+    try:
         # 检查中断
-        if stop_event_flag:
+        if is_cancelled(stop_event_flag):
             log("🛑 사용자 중단 요청 감지, 작업 중단", index)
-            return index, "", 0.0
+            return index, "", 0.0, CANCELLED
 
-        search_results = search_naver_news_api(queries, index, client_id, client_secret)
+        title, post_text, search_results, outcome = _search_row(index, row_dict, stop_event_flag, client_id,
+                                                                client_secret, health, credentials)
         if not search_results:
-            log("❌ 관련 뉴스 없음", index)
-            return index, "", 0.0
-        
-        # 检查中断
-        if stop_event_flag:
-            log("🛑 사용자 중단 요청 감지, 작업 중단", index)
-            return index, "", 0.0
-
-        best = max(search_results, key=lambda x: calculate_copy_ratio(x["body"], title + " " + content))
-        score = calculate_copy_ratio(best["body"], title + " " + content)
-
-        if score >= 0.0:
-            safe_title = re.sub(r'[\\/*?:"<>|]', '', title)[:50]
-            filename = os.path.join(output_dir, f"{index+1:03d}_{safe_title}.txt")
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(f"[URL] {best['link']}\n\n{best['body']}")
-            log(f"📝 저장 완료 → {filename} (복사율: {score})", index)
-            hyperlink = f'=HYPERLINK("{best["link"]}")'
-            return index, hyperlink, score
-        else:
-            log(f"⚠️ 복사율 낮음 (복사율: {score})", index)
-            return index, "", 0.0
+            return index, "", 0.0, outcome
 
+        with profiling.span("score", index):
+            scores = [calculate_copy_ratio(r["body"], post_text) for r in search_results]
+        return save_best(index, title, search_results, scores, output_dir, outcome, stop_event_flag)
+
+    except Cancelled:
+        log("🛑 사용자 중단 요청 감지, 진행 중인 요청 중단", index)
+        return index, "", 0.0, CANCELLED
     except Exception as e:
         log(f"❌ 에러 발생: {e}", index)
-        return index, "", 0.0
-
-def main(input_path, output_path, client_id, client_secret, stop_event=None):
-    output_dir = os.path.splitext(output_path)[0] + "_본문"
-    os.makedirs(output_dir, exist_ok=True)
-
-    df = pd.read_excel(input_path, dtype={"게시글 등록일자": str})
-    total = len(df)
-    log(f"📄 전체 게시글 수: {total}개")
+        return index, "", 0.0, ERROR
 
-    df["원본기사"] = ""
-    df["복사율"] = 0.0
-
-    def get_stop_flag():
-        return stop_event.is_set() if stop_event else False
+def search_candidates_api(index, row_dict, total_count, output_dir, stop_event_flag, client_id, client_secret,
+                          health=None, credentials=None):
+    # 배치 채점용: 벡터화(정제/문장 분리/토큰화/해싱)까지 워커에서 끝내고, 채점/저장은 메인 프로세스에서
+    # 여러 행을 모아 한다. (index, 제목, 게시글 벡터, 후보 목록 — 후보마다 "vectors" 에 문장 벡터)
+    # 벡터는 hashing_scorer.pack 으로 (길이, 특징, 가중치) 배열로 넘긴다 (pickle 이 작고 메인은 이어 붙이기만)
+    # 반환: (index, 제목, 게시글 벡터, 후보 목록, 매칭 후보가 없을 때의 결과)
+    try:
+        if is_cancelled(stop_event_flag):
+            log("🛑 사용자 중단 요청 감지, 작업 중단", index)
+            return index, "", {}, [], CANCELLED
+        title, post_text, results, outcome = _search_row(index, row_dict, stop_event_flag, client_id,
+                                                         client_secret, health, credentials)
+        if not results:
+            return index, title, {}, [], outcome
+        with profiling.span("vectorize", index):
+            post_vec = hashing_scorer.pack([hashing_scorer.post_vector(post_text)])
+            for r in results:
+                r["vectors"] = hashing_scorer.pack(hashing_scorer.sentence_vectors(r["body"]))
+        return index, title, post_vec, results, outcome
+    except Cancelled:
+        log("🛑 사용자 중단 요청 감지, 진행 중인 요청 중단", index)
+        return index, "", {}, [], CANCELLED
+    except Exception as e:
+        log(f"❌ 에러 발생: {e}", index)
+        return index, "", {}, [], ERROR
 
-    tasks = [(i, row.to_dict(), total, output_dir, get_stop_flag(), client_id, client_secret) for i, row in df.iterrows()]
+def _run_row(args, profile_dir=None, batch=False):
+    # 워커에서 한 행 처리 후 span 기록을 결과와 함께 돌려준다
+    run = search_candidates_api if batch else find_original_article_api
+    with profiling.profile_row(profile_dir, args[0]), profiling.span("row", args[0]):
+        result = run(*args)
+    return result, profiling.drain()
 
-    with ProcessPoolExecutor(max_workers=3) as executor:
-        futures = [executor.submit(find_original_article_api, *args) for args in tasks]
-        try:
-            for future in as_completed(futures):
-                if stop_event and stop_event.is_set():
-                    log("🛑 사용자 중단 요청 감지, 작업 중단")
-                    executor.shutdown(cancel_futures=True)
-                    break
-                try:
-                    index, link, score = future.result()
-                    df.at[index, "원본기사"] = link
-                    df.at[index, "복사율"] = score
-                except Exception as e:
-                    log(f"❌ 결과 처리 오류: {e}")
-        except Exception as e:
-            log(f"❌ 프로세스 풀 에러: {e}")
+def _shutdown_now(executor):
+    # 기다리지 않고 풀을 내리고, 아직 살아 있는 워커는 종료시킨다
+    processes = list(getattr(executor, "_processes", {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for p in processes:
+        if p.is_alive():
+            p.terminate()
 
+def write_result_workbook(df, output_path):
+    # 매칭 결과 + 통계 행을 붙여서 저장 (분산 모드 coordinator 도 사용)
     matched_count = df["복사율"].gt(0).sum()
     above_90_count = df["복사율"].ge(0.9).sum()
     above_50_count = df["복사율"].ge(0.5).sum() - above_90_count
@@ -110,7 +174,8 @@ def main(input_path, output_path, client_id, client_secret, stop_event=None):
         {"순번": "0 이상", "검색": f"{above_0_count}건"},
     ])
     df = pd.concat([df, stats_rows], ignore_index=True)
-    df.to_excel(output_path, index=False)
+    with profiling.span("write_output"):
+        df.to_excel(output_path, index=False)
 
     log("📊 통계 요약")
     log(f" 매칭건수: {matched_count}건")
@@ -119,4 +184,186 @@ def main(input_path, output_path, client_id, client_secret, stop_event=None):
     log(f" 0 이상: {above_0_count}건")
     log(f"🎉 완료! 저장됨 → {output_path}")
 
+def _match_key(row_dict):
+    # (게시글URL, 매칭에 쓰이는 내용의 해시). URL 이 없으면 기록하지 않는다
+    url = str(row_dict.get("게시글URL") or "")
+    if not url or url.lower() == "nan":
+        return None
+    return url, content_hash(row_dict.get("게시글제목"), row_dict.get("게시글내용"), row_dict.get("검색어"))
+
+def main(input_path, output_path, client_id, client_secret, stop_event=None, profile_sample=None,
+         progress_callback=None, max_workers=None, executor=None, incremental=None):
+    # executor 를 넘기면 (CLI/데몬 등) 이미 워밍업된 공유 풀을 쓰고, 끝나도 내리지 않는다
+    # incremental: 이전 실행에서 매칭한 게시글은 기록된 결과를 쓰고 건너뜀 (기본: AINP_INCREMENTAL)
+    # 기사 본문: 행마다 .txt 파일(기본) 또는 아카이브 파일 하나 (AINP_BODY_STORE=sqlite, 단일 writer)
+    archive = None
+    if BODY_STORE == "sqlite":
+        archive = output_dir = cancellation.get_manager().BodyArchive(archive_path_for(output_path))
+    else:
+        output_dir = os.path.splitext(output_path)[0] + "_본문"
+        os.makedirs(output_dir, exist_ok=True)
+
+    collector = profiling.ProfileCollector()
+    if profile_sample is None:
+        profile_sample = profiling.PROFILE_SAMPLE
+    profile_dir = os.path.splitext(output_path)[0] + "_profile" if profile_sample > 0 else None
+    sampler = random.Random(0)
+
+    with profiling.span("read_input"):
+        df = pd.read_excel(input_path, dtype={"게시글 등록일자": str})
+    total = len(df)
+    log(f"📄 전체 게시글 수: {total}개")
+
+    df["원본기사"] = ""
+    df["복사율"] = 0.0
+
+    # 이미 매칭한 게시글(URL + 내용 해시가 같은 것)은 기록된 결과를 그대로 쓴다
+    store = ProcessedStore() if (INCREMENTAL if incremental is None else incremental) else None
+    row_keys, reused = {}, set()
+    if store is not None:
+        row_keys = {i: _match_key(row) for i, row in zip(df.index, df.to_dict("records"))}
+        cached = store.match_results([k for k in row_keys.values() if k])
+        for i, key in row_keys.items():
+            if key in cached:
+                df.at[i, "원본기사"], df.at[i, "복사율"] = cached[key]
+                reused.add(i)
+        if reused:
+            log(f"♻️ 이전에 매칭한 게시글 {len(reused)}개는 기록된 결과 사용, {total - len(reused)}개만 매칭")
+
+    tracker = ProgressTracker(total - len(reused), progress_callback, stage="match")
+    tracker.emit()
+
+    # 워커까지 전달되는 취소 토큰 (stop_event 가 없으면 취소 불가 → None)
+    cancel_token = cancellation.new_token() if stop_event is not None else None
+    bridge_done = cancellation.bridge(stop_event, cancel_token) if cancel_token is not None else None
+
+    # 실행 전체에서 공유하는 호스트 상태 (서킷 브레이커/동시 요청 상한)
+    health = cancellation.get_manager().HostHealth()
+    # 입력한 키 + 키 파일/NAVER_CREDENTIALS 의 키들을 워커 전체가 나눠 쓴다 (동시에 도는 파일끼리도 한 풀)
+    keys = load_credentials(extra=[(client_id, client_secret)])
+    credentials = cancellation.shared_credentials(keys)
+    if len(keys) > 1:
+        log(f"🔑 네이버 API 키 {len(keys)}개 사용")
+
+    tasks = [(i, row.to_dict(), total, output_dir, cancel_token, client_id, client_secret, health, credentials)
+             for i, row in df.iterrows() if i not in reused]
+
+    batch = BATCH_SCORING and SCORER == "hashing"
+    pending_rows, pending_pairs = [], [0]
+
+    def record(index, link, score, outcome):
+        df.at[index, "원본기사"] = link
+        df.at[index, "복사율"] = score
+        # 매칭됐거나, 검색이 오류 없이 끝나고 후보가 기준에 못 미친 행만 기록 (오류/중단 행은 다음에 다시)
+        key = row_keys.get(index)
+        if store is not None and key and outcome in (MATCHED, MISS):
+            store.record_match(*key, link, score)
+
+    def flush():
+        # 모아 둔 행들의 (기사, 게시글) 쌍을 한 번에 채점하고 행마다 최고 후보 저장
+        rows = pending_rows[:]
+        del pending_rows[:]
+        pending_pairs[0] = 0
+        if not rows:
+            return
+        from core.batch_scoring import score_vectors
+        try:
+            # 워커가 만든 희소 벡터 배열을 쌓아서 곱하기만 한다
+            with profiling.span("score_batch"):
+                scores = score_vectors([(post_vec, [r["vectors"] for r in results])
+                                        for _, _, post_vec, results, _ in rows])
+        except Exception as e:
+            log(f"❌ 배치 채점 오류: {e}")
+            scores = None
+        for n, (index, title, _, results, outcome) in enumerate(rows):
+            try:
+                if scores is None:
+                    record(index, "", 0.0, ERROR)
+                else:
+                    record(*save_best(index, title, results, scores[n], output_dir, outcome))
+            except Exception as e:
+                log(f"❌ 결과 처리 오류: {e}", index)
+            tracker.advance()
+
+    def collect(future):
+        try:
+            result, drained = future.result()
+            collector.merge(drained)
+            if not batch:
+                record(*result)
+            elif result[3]:
+                pending_rows.append(result)
+                pending_pairs[0] += len(result[3])
+                if pending_pairs[0] >= BATCH_PAIRS:
+                    flush()
+                return  # 채점 후 flush 에서 진행률 반영
+            else:
+                record(result[0], "", 0.0, result[4])
+        except Exception as e:
+            log(f"❌ 결과 처리 오류: {e}")
+        tracker.advance()
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = worker_pool.create_pool(max_workers, warm_up=False)
+    cancelled = False
+    try:
+        futures = [
+            executor.submit(_run_row, args, profile_dir if profile_dir and sampler.random() < profile_sample else None,
+                            batch)
+            for args in tasks
+        ]
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+            if is_cancelled(cancel_token):
+                cancelled = True
+                break
+    except Exception as e:
+        log(f"❌ 프로세스 풀 에러: {e}")
+    finally:
+        if cancelled:
+            log("🛑 사용자 중단 요청 감지, 작업 중단")
+            for future in futures:
+                future.cancel()
+            # 진행 중인 행은 토큰을 보고 곧 멈춘다. 잠깐만 기다려서 들어온 결과까지 반영
+            in_flight = [f for f in futures if not f.done()]
+            done, _ = wait(in_flight, timeout=CANCEL_GRACE_SEC)
+            for future in done:
+                if not future.cancelled():
+                    collect(future)
+            if owns_executor:
+                _shutdown_now(executor)
+        elif owns_executor:
+            executor.shutdown(wait=True)
+        # 중단됐어도 이미 후보를 모은 행은 채점해서 반영
+        flush()
+        if bridge_done is not None:
+            bridge_done.set()
+        if store is not None:
+            store.close()
+        if archive is not None:
+            try:
+                log(f"🗄 본문 아카이브 {archive.count()}건 → {archive_path_for(output_path)}")
+                archive.close()
+            except Exception as e:
+                log(f"⚠️ 본문 아카이브 닫기 실패: {e}")
+
+    write_result_workbook(df, output_path)
+
+    collector.merge(profiling.drain())
+    try:
+        collector.extra["hosts"] = health.stats()
+        collector.extra["credentials"] = credentials.stats()
+        credentials.save()
+    except Exception as e:
+        log(f"⚠️ 호스트 상태/API 키 통계 수집 실패: {e}")
+    try:
+        profile_path = collector.write(output_path)
+        log(f"⏱ 프로파일 요약 저장 → {profile_path}")
+    except Exception as e:
+        log(f"⚠️ 프로파일 요약 저장 실패: {e}")
+
 # 不要自动运行 main()，由入口文件调用
\ No newline at end of file
@@ -0,0 +1,33 @@
+# core/paths.py
+#
+# 캐시 파일 위치. AINP_CACHE_DIR (CLI --cache-dir) 가 있으면 그곳, 없으면 data/cache.
+# 워커 프로세스도 환경변수를 상속하므로 같은 폴더를 본다.
+# resource_path 는 PyInstaller onefile 빌드에서 실행마다 새로 풀리는 임시 폴더(_MEIPASS)라서
+# 사용자가 고치거나 계속 남아야 하는 파일(캐시, API 키 파일)은 app_path (실행 파일 옆) 에 둔다.
+
+import os
+import sys
+
+
+def resource_path(relative_path):
+    """兼容PyInstaller和源码运行的资源路径"""
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def app_path(relative_path):
+    """실행 파일 옆 (소스 실행이면 현재 폴더) — 쓰기 가능하고 실행이 바뀌어도 남는 위치"""
+    if getattr(sys, "frozen", False):
+        return os.path.join(os.path.dirname(os.path.abspath(sys.executable)), relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def cache_dir():
+    path = os.environ.get("AINP_CACHE_DIR") or app_path("data/cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(name):
+    return os.path.join(cache_dir(), name)
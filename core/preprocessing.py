@@ -6,6 +6,10 @@ import pandas as pd
 from datetime import datetime
 from openpyxl import load_workbook
 import logging
+import functools
+from core import log_backend
+from core.progress import ProgressTracker
+from core.processed_store import ProcessedStore, content_hash
 
 import sys
 def resource_path(relative_path):
@@ -18,22 +22,11 @@ INPUT_PATH = os.environ.get("INPUT_EXCEL_PATH", resource_path("data/input/defaul
 OUTPUT_PATH = os.environ.get("OUTPUT_EXCEL_PATH", resource_path(f"data/output/output_{datetime.now().strftime('%y%m%d')}.xlsx"))
 
 # ==== 로그 설정 ====
-log_dir = resource_path("data/log")
-os.makedirs(log_dir, exist_ok=True)
-today = datetime.now().strftime("%y%m%d")
-log_file_path = os.path.join(log_dir, f"로그_{today}.txt")
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file_path, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# core.log_backend 의 단일 writer(QueueListener)로 기록
+log_backend.setup_logging(stream=True)
 
 def log(msg):
-    logging.info(msg)
+    logging.info(str(msg), extra={"row": None, "stage": "preprocess"})
 
 def preprocess_title(title):
     return title.split('&keyword=')[0] if isinstance(title, str) else title
@@ -58,15 +51,27 @@ def read_excel_with_hyperlinks(file_path, sheet_name=0):
         data.append(row_data)
     return pd.DataFrame(data)
 
-def filter_untrusted_posts(all_data):
+# 리소스 엑셀은 프로세스당 한 번만 읽는다 (데몬/CLI 에서 여러 파일 처리 시 재사용)
+@functools.lru_cache(maxsize=None)
+def load_untrusted_tables():
     untrusted_file = resource_path("resources/비신탁사_저작권문구+도메인주소.xlsx")
     trusted_file = resource_path("resources/매체사_도메인_정보.xlsx")
 
     df_untrusted = pd.read_excel(untrusted_file)
     df_trusted = pd.read_excel(trusted_file)
-    untrusted_copyrights = df_untrusted["저작권 문구"].dropna().tolist()
-    untrusted_domains = df_untrusted["도메인"].dropna().tolist()
-    trusted_domains = df_trusted["도메인"].dropna().tolist()
+    untrusted_copyrights = tuple(df_untrusted["저작권 문구"].dropna().tolist())
+    untrusted_domains = tuple(df_untrusted["도메인"].dropna().tolist())
+    trusted_domains = tuple(df_trusted["도메인"].dropna().tolist())
+    return untrusted_copyrights, untrusted_domains, trusted_domains
+
+@functools.lru_cache(maxsize=None)
+def load_exclude_urls():
+    exclude_file_path = resource_path("resources/(언진) 수집 제외 도메인 주소_공식 블로그-0709.xlsx")
+    exclude_df = pd.read_excel(exclude_file_path)
+    return tuple(exclude_df['제외 도메인 주소(블로그)'].dropna().astype(str).tolist())
+
+def filter_untrusted_posts(all_data):
+    untrusted_copyrights, untrusted_domains, trusted_domains = load_untrusted_tables()
 
     def should_remove(post_content):
         post_content = str(post_content)
@@ -97,20 +102,38 @@ def filter_empty_image_and_no_da(df_filtered):
     log(f"텍스트 필터링 완료: 유지 {len(df_final)}개 / 삭제 {len(df_removed_images)}개")
     return df_final, df_removed_images
 
-def run_preprocessing(input_path=None, output_path=None, stop_event=None):
-    all_data = read_excel_with_hyperlinks(input_path)
-    all_data.columns = [str(col).strip() for col in all_data.columns]
-    all_data['게시글제목'] = all_data['게시글제목'].apply(preprocess_title)
+PREPROCESS_STEPS = 5  # 읽기 / 제외 도메인 / 검색어 / 비신탁사 / 텍스트 필터
 
-    exclude_file_path = resource_path("resources/(언진) 수집 제외 도메인 주소_공식 블로그-0709.xlsx")
-    exclude_df = pd.read_excel(exclude_file_path)
-    exclude_urls = exclude_df['제외 도메인 주소(블로그)'].dropna().astype(str).tolist()
+# 이미 판정한 게시글(게시글URL + 내용 해시)은 다시 필터링하지 않는다 (core/processed_store.py)
+INCREMENTAL = os.environ.get("AINP_INCREMENTAL", "1") != "0"
+
+@functools.lru_cache(maxsize=None)
+def rules_signature():
+    # 필터 규칙 리소스가 바뀌면 예전 판정은 쓰지 않도록 해시에 포함
+    return content_hash(load_untrusted_tables(), load_exclude_urls())
+
+def _row_keys(df):
+    rules = rules_signature()
+    keys = []
+    for row in df.to_dict("records"):
+        url = str(row.get("게시글URL") or "")
+        keys.append((url, content_hash(rules, row.get("검색어"), row.get("게시글제목"),
+                                       row.get("게시글내용"), row.get("계정명"))) if url else None)
+    return keys
+
+def _filter_rows(all_data, tracker, stop_event):
+    """제외 도메인 → 검색어 → 비신탁사 → 텍스트 필터. 중단되면 None"""
+    exclude_urls = load_exclude_urls()
     filtered_data = all_data[~all_data['게시글URL'].astype(str).apply(
         lambda url: any(excluded in url for excluded in exclude_urls)
     )]
 
     log(f"총 행 수: {len(all_data)}")
     log(f"제외된 후 남은 행 수: {len(filtered_data)}")
+    tracker.advance()
+    if filtered_data.empty:
+        tracker.advance(3)
+        return filtered_data
 
     all_df_drop_search = filtered_data[
         (filtered_data.apply(lambda x: x['검색어'].lower() in str(x['게시글제목']).lower() or
@@ -121,36 +144,70 @@ def run_preprocessing(input_path=None, output_path=None, stop_event=None):
     ]
     log(f"삭제 : {len(filtered_data) - len(all_df_drop_search)}개")
     log(all_df_drop_search.count())
+    tracker.advance()
 
     if all_df_drop_search.empty:
-        log("⚠️ 검색어 기반 필터링 결과: 남은 행이 없습니다. 전처리를 중단합니다.")
-        all_df_drop_search.head(0).to_excel(output_path, index=False)
-        log(f"✅ 전처리 완료. 저장됨 → {output_path}")
-        return
+        log("⚠️ 검색어 기반 필터링 결과: 남은 행이 없습니다.")
+        tracker.advance(2)
+        return all_df_drop_search
     if stop_event and stop_event.is_set():
-        log("🛑 사용자 중단 요청 감지, 작업 중단")
-        return
+        return None
 
     df_filtered, _ = filter_untrusted_posts(all_df_drop_search)
+    tracker.advance()
     if df_filtered.empty:
-        log("⚠️ 비신탁사 필터링 결과: 남은 행이 없습니다. 전처리를 중단합니다.")
-        df_filtered.head(0).to_excel(output_path, index=False)
-        log(f"✅ 전처리 완료. 저장됨 → {output_path}")
-        return
+        log("⚠️ 비신탁사 필터링 결과: 남은 행이 없습니다.")
+        tracker.advance()
+        return df_filtered
     if stop_event and stop_event.is_set():
-        log("🛑 사용자 중단 요청 감지, 작업 중단")
-        return
-    
+        return None
+
     df_final, _ = filter_empty_image_and_no_da(df_filtered)
+    tracker.advance()
     if df_final.empty:
-        log("⚠️ 텍스트 필터링 결과: 남은 행이 없습니다. 전처리를 중단합니다.")
-        df_final.head(0).to_excel(output_path, index=False)
-        log(f"✅ 전처리 완료. 저장됨 → {output_path}")
-        return
+        log("⚠️ 텍스트 필터링 결과: 남은 행이 없습니다.")
     if stop_event and stop_event.is_set():
+        return None
+    return df_final
+
+def run_preprocessing(input_path=None, output_path=None, stop_event=None, progress_callback=None,
+                      incremental=None):
+    tracker = ProgressTracker(PREPROCESS_STEPS, progress_callback, stage="preprocess")
+    tracker.emit()
+    all_data = read_excel_with_hyperlinks(input_path)
+    tracker.advance()
+    all_data.columns = [str(col).strip() for col in all_data.columns]
+    all_data['게시글제목'] = all_data['게시글제목'].apply(preprocess_title)
+
+    store, keys, cached_kept = None, None, []
+    work = all_data
+    if INCREMENTAL if incremental is None else incremental:
+        store = ProcessedStore()
+        keys = _row_keys(all_data)
+        verdicts = store.preprocess_verdicts([k for k in keys if k])
+        known = [k is not None and k in verdicts for k in keys]
+        cached_kept = [idx for idx, k, hit in zip(all_data.index, keys, known) if hit and verdicts[k]]
+        work = all_data[[not hit for hit in known]]
+        log(f"♻️ 이전에 판정한 게시글 {sum(known)}개 재사용 (유지 {len(cached_kept)}개), "
+            f"새로 들어왔거나 바뀐 {len(work)}개만 필터링")
+
+    df_final = _filter_rows(work, tracker, stop_event)
+    if df_final is None:
         log("🛑 사용자 중단 요청 감지, 작업 중단")
+        if store is not None:
+            store.close()
         return
 
+    if store is not None:
+        kept = set(df_final.index)
+        key_of = dict(zip(all_data.index, keys))
+        store.record_preprocess([(*key_of[i], i in kept) for i in work.index if key_of[i]])
+        store.close()
+        # 이전 판정으로 유지된 행 + 이번에 통과한 행 (원래 순서)
+        df_final = all_data.loc[sorted(cached_kept + list(df_final.index))]
+
+    if df_final.empty:
+        log("⚠️ 남은 행이 없습니다.")
     df_final.to_excel(output_path, index=False)
     log(f"✅ 전처리 완료. 저장됨 → {output_path}")
 
@@ -0,0 +1,94 @@
+# core/processed_store.py
+#
+# 이미 처리한 게시글 기록 (캐시 폴더 processed_posts.sqlite3).
+# 날짜 범위가 겹치게 매일 다시 내보내는 엑셀에서 같은 게시글URL 을 또 처리하지 않도록
+# (게시글URL, 내용 해시) 로 결과를 남겨 두고, 다음 실행에서는 새 글/바뀐 글만 처리한다.
+#   - preprocess: 전처리 필터 통과 여부 (필터 규칙 리소스가 바뀌면 규칙 서명이 달라져 다시 판정)
+#   - match:      원문 매칭 결과 (링크, 복사율). 매칭 실패는 MISS_TTL_DAYS 뒤 다시 시도
+# 쓰기는 메인 프로세스에서만 한다 (워커는 결과만 돌려줌).
+
+import time
+import sqlite3
+import hashlib
+import threading
+
+from core.paths import cache_path
+
+STORE_FILE = "processed_posts.sqlite3"
+MISS_TTL_DAYS = 3
+
+
+def content_hash(*parts):
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(("" if p is None else str(p)).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class ProcessedStore:
+    def __init__(self, path=None):
+        self.path = path or cache_path(STORE_FILE)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS preprocess (
+                url TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                kept INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (url, hash)
+            );
+            CREATE TABLE IF NOT EXISTS match (
+                url TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                link TEXT NOT NULL,
+                score REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (url, hash)
+            );
+        """)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _lookup(self, sql, keys):
+        found = {}
+        with self.lock:
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(keys), 400):
+                chunk = keys[start:start + 400]
+                where = " OR ".join(["(url = ? AND hash = ?)"] * len(chunk))
+                params = [v for key in chunk for v in key]
+                for row in self.conn.execute(sql + where, params):
+                    found[(row[0], row[1])] = row[2:]
+        return found
+
+    # ---- 전처리 ----
+    def preprocess_verdicts(self, keys):
+        """{(url, hash): kept(bool)}"""
+        rows = self._lookup("SELECT url, hash, kept FROM preprocess WHERE ", keys)
+        return {k: bool(v[0]) for k, v in rows.items()}
+
+    def record_preprocess(self, items):
+        """items: [(url, hash, kept), ...]"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO preprocess (url, hash, kept, updated_at) VALUES (?, ?, ?, ?)",
+                [(url, h, int(kept), now) for url, h, kept in items])
+
+    # ---- 원문 매칭 ----
+    def match_results(self, keys):
+        """{(url, hash): (link, score)} — 오래된 매칭 실패 기록은 빼고 돌려준다"""
+        rows = self._lookup("SELECT url, hash, link, score, updated_at FROM match WHERE ", keys)
+        cutoff = time.time() - MISS_TTL_DAYS * 86400
+        return {k: v[:2] for k, v in rows.items() if v[0] or v[2] >= cutoff}
+
+    def record_match(self, url, h, link, score):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO match (url, hash, link, score, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (url, h, link, float(score), time.time()))
@@ -0,0 +1,157 @@
+# core/profiling.py
+#
+# 단계별 타이밍 span 기록 및 실행 프로파일 리포트.
+# 각 프로세스(워커)는 자기 버퍼에 span 을 쌓고, 행 처리 후 drain() 으로 메인 프로세스에 넘긴다.
+# 메인 프로세스의 ProfileCollector 가 모아서 실행 종료 시 <출력파일>_profile.json 으로 저장한다.
+
+import os
+import json
+import time
+import cProfile
+import contextlib
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+# 행 샘플 프로파일링: AINP_PROFILE_SAMPLE=0.05 (5% 행), AINP_PROFILER=cprofile|pyinstrument
+PROFILE_SAMPLE = float(os.environ.get("AINP_PROFILE_SAMPLE", "0") or 0)
+PROFILER = os.environ.get("AINP_PROFILER", "cprofile")
+
+_lock = threading.Lock()
+_spans = []
+_cache = defaultdict(lambda: [0, 0])  # name -> [hit, miss]
+
+
+def host_of(url):
+    return urlparse(url).hostname or ""
+
+
+@contextlib.contextmanager
+def span(stage, index=None, host=None):
+    w0, c0 = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        rec = (stage, time.perf_counter() - w0, time.process_time() - c0, index, host)
+        with _lock:
+            _spans.append(rec)
+
+
+def count_cache(name, hit):
+    with _lock:
+        _cache[name][0 if hit else 1] += 1
+
+
+def drain():
+    """현재 프로세스에 쌓인 span/캐시 카운터를 꺼내고 비운다 (pickle 가능한 dict)"""
+    global _spans
+    with _lock:
+        spans, _spans = _spans, []
+        cache = {k: tuple(v) for k, v in _cache.items()}
+        _cache.clear()
+    return {"spans": spans, "cache": cache}
+
+
+@contextlib.contextmanager
+def profile_row(profile_dir, index, profiler=None):
+    """profile_dir 가 주어진 행만 cProfile/pyinstrument 로 캡처"""
+    if not profile_dir:
+        yield
+        return
+    os.makedirs(profile_dir, exist_ok=True)
+    profiler = profiler or PROFILER
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            profiler = "cprofile"
+        else:
+            p = Profiler()
+            p.start()
+            try:
+                yield
+            finally:
+                p.stop()
+                with open(os.path.join(profile_dir, f"row_{index+1:03d}.html"), "w", encoding="utf-8") as f:
+                    f.write(p.output_html())
+            return
+    p = cProfile.Profile()
+    p.enable()
+    try:
+        yield
+    finally:
+        p.disable()
+        p.dump_stats(os.path.join(profile_dir, f"row_{index+1:03d}.prof"))
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _describe(values):
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "total_sec": round(sum(ordered), 4),
+        "p50_sec": round(_percentile(ordered, 0.50), 4),
+        "p95_sec": round(_percentile(ordered, 0.95), 4),
+        "max_sec": round(ordered[-1], 4) if ordered else 0.0,
+    }
+
+
+class ProfileCollector:
+    """워커들이 drain() 한 결과를 합쳐서 요약"""
+
+    def __init__(self):
+        self.wall = defaultdict(list)
+        self.cpu = defaultdict(float)
+        self.hosts = defaultdict(list)
+        self.cache = defaultdict(lambda: [0, 0])
+        self.extra = {}
+
+    def merge(self, drained):
+        if not drained:
+            return
+        for stage, wall, cpu, _index, host in drained.get("spans", ()):
+            self.wall[stage].append(wall)
+            self.cpu[stage] += cpu
+            if host and stage in ("api", "fetch"):
+                self.hosts[host].append(wall)
+        for name, (hit, miss) in drained.get("cache", {}).items():
+            self.cache[name][0] += hit
+            self.cache[name][1] += miss
+
+    def summary(self, top_hosts=10):
+        stages = {}
+        for stage, values in self.wall.items():
+            d = _describe(values)
+            d["cpu_sec"] = round(self.cpu[stage], 4)
+            stages[stage] = d
+
+        hosts = []
+        for host, values in self.hosts.items():
+            d = _describe(values)
+            d["host"] = host
+            d["mean_sec"] = round(d["total_sec"] / d["count"], 4) if d["count"] else 0.0
+            hosts.append(d)
+        hosts.sort(key=lambda d: d["mean_sec"], reverse=True)
+
+        cache = {}
+        for name, (hit, miss) in self.cache.items():
+            total = hit + miss
+            cache[name] = {"hit": hit, "miss": miss, "hit_rate": round(hit / total, 4) if total else 0.0}
+
+        result = {"stages": stages, "slowest_hosts": hosts[:top_hosts], "cache": cache}
+        result.update(self.extra)
+        return result
+
+    def write(self, output_path):
+        path = os.path.splitext(output_path)[0] + "_profile.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        return path
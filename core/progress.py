@@ -0,0 +1,59 @@
+# core/progress.py
+#
+# 진행률 보고: 완료 건수로 처리 속도(rows/sec)와 남은 시간(ETA)을 계산해서 콜백으로 넘긴다.
+# 콜백은 dict 하나를 받는다: {"stage", "done", "total", "rate", "eta_sec", "elapsed_sec"}
+
+import time
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
+
+
+def describe(info):
+    """진행 정보를 한 줄 텍스트로 (GUI 프로그레스바/CLI 공용)"""
+    if info["stage"] == "preprocess":
+        return f"전처리 {info['done']}/{info['total']} 단계"
+    return (f"{info['done']}/{info['total']} · {info['rate']:.2f} rows/s · "
+            f"ETA {format_eta(info['eta_sec'])}")
+
+
+class ProgressTracker:
+    def __init__(self, total, callback=None, stage="match"):
+        self.total = total
+        self.callback = callback
+        self.stage = stage
+        self.done = 0
+        self.started = time.perf_counter()
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.done, 0)
+        eta = remaining / rate if rate > 0 else None
+        return {
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "rate": rate,
+            "eta_sec": eta,
+            "elapsed_sec": elapsed,
+        }
+
+    def advance(self, n=1):
+        self.done += n
+        self.emit()
+
+    def emit(self):
+        if self.callback is None:
+            return
+        try:
+            self.callback(self.snapshot())
+        except Exception:
+            # 진행률 표시 실패가 본 작업을 멈추면 안 된다
+            pass
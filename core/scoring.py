@@ -0,0 +1,94 @@
+# core/scoring.py
+#
+# calculate_copy_ratio 와 같은 값을 내는 복사율 계산기. 토큰화 결과를 공유할 수 있도록
+# (문장, 게시글) 2문서 TF-IDF 코사인을 토큰 수준에서 직접 계산한다.
+#   - TfidfVectorizer 기본값과 동일: lowercase, smooth_idf, l2 norm, n_docs=2
+#   - 같은 텍스트는 배치 안에서 한 번만 토큰화 (TokenCache)
+#   - 문장 분리는 검색어 생성과 같은 분리기 (core/sentences.py)
+# 검색 결과 요약(snippet)과 게시글의 값싼 유사도(문자 bigram 포함률)도 여기 둔다.
+
+import re
+import html
+import math
+from collections import Counter
+
+from core.sentences import sentences as _sentences
+
+
+def clean_for_scoring(t):
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', t)).strip()
+
+
+def split_sentences(article):
+    return _sentences(article)
+
+
+class TokenCache:
+    """텍스트 → 토큰 리스트 메모 (TfidfVectorizer 처럼 소문자화 후 토큰화)"""
+
+    def __init__(self, tokenize=None):
+        if tokenize is None:
+            from core.core_utils_ui_api import tokenize_without_stopwords as tokenize
+        self.tokenize = tokenize
+        self.memo = {}
+        self.hits = 0
+
+    def __call__(self, text):
+        tokens = self.memo.get(text)
+        if tokens is None:
+            tokens = self.memo[text] = self.tokenize(text.lower())
+        else:
+            self.hits += 1
+        return tokens
+
+
+def pair_cosine(s_counts, p_counts):
+    """2문서 TF-IDF 코사인. 어휘가 비면 None (sklearn 에서 ValueError 로 건너뛰던 경우)"""
+    if not s_counts and not p_counts:
+        return None
+    both = s_counts.keys() & p_counts.keys()
+    idf_shared = 1.0                    # df=2: ln(3/3) + 1
+    idf_single = math.log(3 / 2) + 1.0  # df=1: ln(3/2) + 1
+
+    def norm(counts):
+        return math.sqrt(sum((c * (idf_shared if t in both else idf_single)) ** 2 for t, c in counts.items()))
+
+    ns, np_ = norm(s_counts), norm(p_counts)
+    if ns == 0.0 or np_ == 0.0:
+        return 0.0
+    dot = sum(s_counts[t] * p_counts[t] for t in both) * idf_shared * idf_shared
+    return dot / (ns * np_)
+
+
+def copy_ratio_from_counts(sentence_counts, post_counts):
+    scores = [c for c in (pair_cosine(s, post_counts) for s in sentence_counts) if c is not None]
+    return round(sum(scores) / len(scores), 3) if scores else 0.0
+
+
+def copy_ratio(article, post, tokens=None):
+    tokens = tokens or TokenCache()
+    sentences = split_sentences(clean_for_scoring(article))
+    if not sentences:
+        return 0.0
+    post_counts = Counter(tokens(clean_for_scoring(post)))
+    return copy_ratio_from_counts([Counter(tokens(s)) for s in sentences], post_counts)
+
+
+def score_batch(pairs, tokens=None):
+    """[(article, post), ...] → [copy_ratio, ...], 배치 전체에서 토큰화 결과 공유"""
+    tokens = tokens or TokenCache()
+    return [copy_ratio(article, post, tokens) for article, post in pairs]
+
+
+def char_bigrams(text):
+    """공백을 뺀 문자 bigram 집합 (형태소 분석 없이 쓰는 값싼 비교용)"""
+    t = re.sub(r"\s+", "", text)
+    return {t[i:i + 2] for i in range(len(t) - 1)}
+
+
+def snippet_similarity(snippet, post_bigrams):
+    """검색 API 의 title/description(<b> 태그, HTML 엔티티 포함) 중 게시글에 있는 bigram 비율"""
+    grams = char_bigrams(html.unescape(re.sub(r"<[^>]+>", "", snippet or "")))
+    if not grams:
+        return 0.0
+    return len(grams & post_bigrams) / len(grams)
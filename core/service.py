@@ -0,0 +1,269 @@
+# core/service.py
+#
+# 원문 기사 매칭 로컬 HTTP/JSON 서비스.
+#
+#   python -m core serve --port 8765
+#   POST /match  {"title": "...", "content": "...", "press": "이데일리"}
+#   → {"link": ..., "title": ..., "score": 0.43, "candidates": 3, "queries": [...]}
+#   GET  /health
+#
+# 처리 흐름
+#   1) 요청 수락: 동시 처리 상한(max_inflight)을 넘으면 503 + Retry-After (backpressure)
+#   2) 배치 스레드: 새 요청들의 검색어를 한꺼번에 생성 (Okt 는 이 스레드에서만 사용)
+#   3) I/O 스레드 풀: 요청별 네이버 검색 + 기사 본문 수집
+#   4) 배치 스레드: 모인 (기사, 게시글) 쌍을 토큰 캐시를 공유하며 한 번에 채점
+# 응답 헤더에 X-Latency-Ms, X-Latency-P50-Ms, X-Batch-Size 를 싣는다.
+
+import json
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.host_health import HostHealth
+from core.credentials import CredentialPool, load_credentials
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "service"})
+
+
+class Overloaded(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("title", "content", "press", "queries", "candidates", "future", "started", "batch_size")
+
+    def __init__(self, title, content, press):
+        self.title = title
+        self.content = content
+        self.press = press
+        self.queries = []
+        self.candidates = []
+        self.future = Future()
+        self.started = time.perf_counter()
+        self.batch_size = 0
+
+
+class LatencyWindow:
+    def __init__(self, size=1000):
+        self.values = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def add(self, ms):
+        with self.lock:
+            self.values.append(ms)
+
+    def p50(self):
+        with self.lock:
+            ordered = sorted(self.values)
+        return ordered[len(ordered) // 2] if ordered else 0.0
+
+
+class MatchService:
+    def __init__(self, client_id, client_secret, max_batch=16, max_wait_ms=20,
+                 max_inflight=64, io_threads=16):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.slots = threading.BoundedSemaphore(max_inflight)
+        self.work = queue.Queue()  # ("new" | "score", job) — 입장 제한은 slots 가 담당
+        self.io_pool = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix="match-io")
+        self.latency = LatencyWindow()
+        self.health = HostHealth()  # 서비스가 떠 있는 동안 계속 유지
+        self.credentials = CredentialPool(load_credentials(extra=[(client_id, client_secret)]))
+        self.stopped = threading.Event()
+        self.batcher = threading.Thread(target=self._batch_loop, name="match-batcher", daemon=True)
+
+    def start(self):
+        self.batcher.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.credentials.save()
+        self.work.put(None)
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, title, content, press):
+        if not self.slots.acquire(blocking=False):
+            raise Overloaded()
+        job = _Job(title, content, press)
+        job.future.add_done_callback(lambda _: self.slots.release())
+        self.work.put(("new", job))
+        return job
+
+    # ---- 배치 스레드 ----
+    def _take_batch(self):
+        first = self.work.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.work.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.work.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _batch_loop(self):
+        from core.core_utils_ui_api import clean_text, extract_first_sentences, generate_search_queries, SCORER
+        from core.scoring import TokenCache, score_batch
+        from core import profiling
+
+        while not self.stopped.is_set():
+            batch = self._take_batch()
+            if batch is None:
+                return
+            # 서비스는 실행 프로파일을 쓰지 않는다. 토큰화/API/수집 span 이 계속 쌓이지 않게 배치마다 비운다
+            profiling.drain()
+            new = [job for kind, job in batch if kind == "new"]
+            ready = [job for kind, job in batch if kind == "score"]
+
+            for job in new:
+                try:
+                    job.title = clean_text(job.title)
+                    job.content = clean_text(job.content)
+                    first, second, last = extract_first_sentences(job.content)
+                    job.queries = generate_search_queries(job.title, first, second, last, clean_text(job.press))
+                    self.io_pool.submit(self._search, job)
+                except Exception as e:
+                    job.future.set_exception(e)
+
+            if not ready:
+                continue
+            # 배치 전체 (기사, 게시글) 쌍을 토큰 캐시 하나로 (hashing 이면 희소 행렬로 한 번에) 채점
+            pairs, owners = [], []
+            for job in ready:
+                post = job.title + " " + job.content
+                for cand in job.candidates:
+                    pairs.append((cand["body"], post))
+                    owners.append((job, cand))
+            try:
+                if SCORER == "hashing":
+                    from core.batch_scoring import score_pairs
+                    scores = score_pairs(pairs)
+                else:
+                    scores = score_batch(pairs, TokenCache())
+            except Exception as e:
+                for job in ready:
+                    job.future.set_exception(e)
+                continue
+            best = {}
+            for (job, cand), score in zip(owners, scores):
+                if id(job) not in best or score > best[id(job)][1]:
+                    best[id(job)] = (cand, score)
+            for job in ready:
+                job.batch_size = len(ready)
+                cand, score = best.get(id(job), (None, 0.0))
+                job.future.set_result({
+                    "link": cand["link"] if cand else "",
+                    "title": cand["title"] if cand else "",
+                    "score": score,
+                    "candidates": len(job.candidates),
+                    "queries": job.queries,
+                })
+
+    # ---- I/O 스레드 ----
+    def _search(self, job):
+        from core.core_utils_ui_api import search_naver_news_api
+        try:
+            job.candidates = search_naver_news_api(job.queries, None, self.client_id, self.client_secret,
+                                                   health=self.health, post_text=job.title + " " + job.content,
+                                                   credentials=self.credentials)
+        except Exception as e:
+            job.future.set_exception(e)
+            return
+        if not job.candidates:
+            job.future.set_result({"link": "", "title": "", "score": 0.0, "candidates": 0, "queries": job.queries})
+            return
+        self.work.put(("score", job))
+
+
+def make_handler(service, request_timeout=120.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, data, headers=None):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Latency-P50-Ms", f"{service.latency.p50():.1f}")
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok", "p50_ms": service.latency.p50(),
+                                      "hosts": service.health.stats(),
+                                      "credentials": service.credentials.stats()})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/match":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict):
+                    self._send_json(400, {"error": "payload must be a JSON object"})
+                    return
+                job = service.submit(str(payload.get("title", "")), str(payload.get("content", "")),
+                                     str(payload.get("press", "")))
+            except Overloaded:
+                self._send_json(503, {"error": "overloaded"}, {"Retry-After": "1"})
+                return
+            except ValueError as e:
+                self._send_json(400, {"error": f"invalid json: {e}"})
+                return
+
+            try:
+                result = job.future.result(timeout=request_timeout)
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            elapsed_ms = (time.perf_counter() - job.started) * 1000
+            service.latency.add(elapsed_ms)
+            self._send_json(200, result, {"X-Latency-Ms": f"{elapsed_ms:.1f}",
+                                          "X-Batch-Size": str(job.batch_size)})
+
+    return Handler
+
+
+def serve(client_id, client_secret, host="127.0.0.1", port=8765, stop_event=None, **service_kwargs):
+    from core import core_utils_ui_api  # JVM/리소스를 첫 요청 전에 올려 둔다
+    core_utils_ui_api.tokenize_without_stopwords("워밍업")
+
+    service = MatchService(client_id, client_secret, **service_kwargs).start()
+    httpd = ThreadingHTTPServer((host, port), make_handler(service))
+    httpd.daemon_threads = True
+    log(f"🌐 매칭 서비스 시작: http://{host}:{httpd.server_address[1]}")
+    if stop_event is not None:
+        threading.Thread(target=lambda: (stop_event.wait(), httpd.shutdown()), daemon=True).start()
+    try:
+        httpd.serve_forever()
+    finally:
+        service.stop()
+        httpd.server_close()
+        log("👋 매칭 서비스 종료")
@@ -0,0 +1,372 @@
+# core/sharding.py
+#
+# 원문 매칭 분산 실행 (coordinator / worker).
+#   coordinator: 입력을 shard 로 나눠 큐에 넣고, 모든 shard 결과를 원래 행 순서대로 합쳐 저장
+#   worker:      큐에서 shard 를 가져와(lease) 처리하고 결과를 돌려놓음. lease 가 만료된 shard
+#                (죽은 워커의 것)는 다른 워커가 다시 가져간다.
+#
+#   python -m core shard-coordinate big.xlsx --queue sqlite:////mnt/share/ainp/shards.db --output big_matched.xlsx
+#   python -m core shard-work --queue sqlite:////mnt/share/ainp/shards.db --output-dir out/
+#
+# 큐 백엔드: sqlite:///경로 (로컬/파일 기반) 또는 redis://host:port/db (redis 패키지 필요)
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+
+LEASE_SECONDS = 300
+# 워커: shard 처리가 연달아 실패하면 FAILURE_BACKOFF 초부터 두 배씩(최대 MAX_BACKOFF) 쉬고,
+# MAX_FAILURES 번 연속 실패하면 워커를 끝낸다 (같은 shard 를 반납/재점유하며 헛도는 것 방지)
+FAILURE_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+MAX_FAILURES = 5
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "shard"})
+
+
+class SQLiteShardQueue:
+    """SQLite 파일 하나로 구현한 shard 큐 (여러 프로세스/머신이 같은 파일을 공유)"""
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    job_id TEXT NOT NULL,
+                    shard_id INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    PRIMARY KEY (job_id, shard_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_shards_status ON shards(status, lease_until);
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def create_job(self, job_id, payloads):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO shards (job_id, shard_id, payload) VALUES (?, ?, ?)",
+                [(job_id, i, json.dumps(p, ensure_ascii=False, default=str)) for i, p in enumerate(payloads)],
+            )
+            conn.execute("COMMIT")
+
+    def claim(self, worker_id):
+        """대기 중이거나 lease 가 만료된 shard 하나를 가져온다"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT job_id, shard_id, payload, status FROM shards "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY job_id, shard_id LIMIT 1", (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job_id, shard_id, payload, status = row
+            conn.execute(
+                "UPDATE shards SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE job_id = ? AND shard_id = ?",
+                (worker_id, now + self.lease_seconds, job_id, shard_id),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        if status == "leased":
+            log(f"♻️ 만료된 shard 재할당: {job_id}#{shard_id} → {worker_id}")
+        return job_id, shard_id, json.loads(payload)
+
+    def heartbeat(self, job_id, shard_id, worker_id):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET lease_until = ? WHERE job_id = ? AND shard_id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, job_id, shard_id, worker_id),
+            )
+
+    def complete(self, job_id, shard_id, worker_id, result):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'done', result = ?, lease_until = NULL "
+                "WHERE job_id = ? AND shard_id = ? AND status != 'done'",
+                (json.dumps(result, ensure_ascii=False), job_id, shard_id),
+            )
+
+    def release(self, job_id, shard_id, worker_id):
+        """처리 포기 (중단 등) → 즉시 다시 대기열로"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'pending', worker = NULL, lease_until = NULL "
+                "WHERE job_id = ? AND shard_id = ? AND worker = ? AND status = 'leased'",
+                (job_id, shard_id, worker_id),
+            )
+
+    def cancel_job(self, job_id):
+        """coordinator 중단: 끝나지 않은 shard 를 지워서 다른 워커가 더 가져가지 않게 한다. 지운 개수 반환"""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM shards WHERE job_id = ? AND status != 'done'", (job_id,)).rowcount
+
+    def progress(self, job_id):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM shards WHERE job_id = ? GROUP BY status", (job_id,))
+            return dict(rows.fetchall())
+
+    def results(self, job_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT shard_id, result FROM shards WHERE job_id = ? AND status = 'done' ORDER BY shard_id", (job_id,))
+            return [(shard_id, json.loads(result)) for shard_id, result in rows.fetchall()]
+
+
+# 점유/반납은 Lua 스크립트 하나로 원자적으로 한다. pending 에서 꺼낸 뒤 lease 를 적기 전에 워커가 죽으면
+# shard 가 어디에도 없게 되어 coordinator 가 영원히 기다린다.
+# KEYS: pending, leases, worker / ARGV: 지금, lease 만료 시각, worker_id → {재할당한 만료 shard 수, shard_id | -1}
+_CLAIM_LUA = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], 0, ARGV[1])
+for _, s in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], s)
+    redis.call('RPUSH', KEYS[1], s)
+end
+local s = redis.call('LPOP', KEYS[1])
+if not s then
+    return {#expired, -1}
+end
+redis.call('ZADD', KEYS[2], ARGV[2], s)
+redis.call('HSET', KEYS[3], s, ARGV[3])
+return {#expired, tonumber(s)}
+"""
+# KEYS: pending, leases / ARGV: shard_id → lease 가 있었으면 pending 으로 돌려놓고 1
+_RELEASE_LUA = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 1 then
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+class RedisShardQueue:
+    """같은 인터페이스의 Redis 구현 (pending 리스트 + lease zset + 결과 hash)"""
+
+    def __init__(self, url, lease_seconds=LEASE_SECONDS):
+        import redis  # 선택 의존성
+        self.r = redis.Redis.from_url(url)
+        self.lease_seconds = lease_seconds
+        self._claim = self.r.register_script(_CLAIM_LUA)
+        self._release = self.r.register_script(_RELEASE_LUA)
+
+    def _k(self, job_id, name):
+        return f"ainp:shard:{job_id}:{name}"
+
+    def create_job(self, job_id, payloads):
+        pipe = self.r.pipeline()
+        for i, p in enumerate(payloads):
+            pipe.hset(self._k(job_id, "payload"), i, json.dumps(p, ensure_ascii=False, default=str))
+            pipe.rpush(self._k(job_id, "pending"), i)
+        pipe.set(self._k(job_id, "total"), len(payloads))
+        pipe.rpush("ainp:shard:jobs", job_id)
+        pipe.execute()
+
+    def claim(self, worker_id):
+        for job_id in [j.decode() for j in self.r.lrange("ainp:shard:jobs", 0, -1)]:
+            now = time.time()
+            requeued, shard_id = self._claim(
+                keys=[self._k(job_id, "pending"), self._k(job_id, "leases"), self._k(job_id, "worker")],
+                args=[now, now + self.lease_seconds, worker_id])
+            if requeued:
+                log(f"♻️ 만료된 shard {requeued}개 재할당 대기: {job_id}")
+            if shard_id < 0:
+                continue
+            return job_id, shard_id, json.loads(self.r.hget(self._k(job_id, "payload"), shard_id))
+        return None
+
+    def heartbeat(self, job_id, shard_id, worker_id):
+        self.r.zadd(self._k(job_id, "leases"), {shard_id: time.time() + self.lease_seconds}, xx=True)
+
+    def complete(self, job_id, shard_id, worker_id, result):
+        self.r.hsetnx(self._k(job_id, "results"), shard_id, json.dumps(result, ensure_ascii=False))
+        self.r.zrem(self._k(job_id, "leases"), shard_id)
+
+    def release(self, job_id, shard_id, worker_id):
+        self._release(keys=[self._k(job_id, "pending"), self._k(job_id, "leases")], args=[shard_id])
+
+    def cancel_job(self, job_id):
+        """coordinator 중단: 대기/점유 중인 shard 를 지우고 작업 목록에서 뺀다. 지운 개수 반환"""
+        pipe = self.r.pipeline()  # MULTI/EXEC
+        pipe.llen(self._k(job_id, "pending"))
+        pipe.zcard(self._k(job_id, "leases"))
+        pipe.delete(self._k(job_id, "pending"), self._k(job_id, "leases"))
+        pipe.lrem("ainp:shard:jobs", 0, job_id)
+        pending, leased, _, _ = pipe.execute()
+        return pending + leased
+
+    def progress(self, job_id):
+        total = int(self.r.get(self._k(job_id, "total")) or 0)
+        done = self.r.hlen(self._k(job_id, "results"))
+        leased = self.r.zcard(self._k(job_id, "leases"))
+        return {"done": done, "leased": leased, "pending": total - done - leased}
+
+    def results(self, job_id):
+        items = self.r.hgetall(self._k(job_id, "results"))
+        return sorted((int(k), json.loads(v)) for k, v in items.items())
+
+
+def open_queue(url, lease_seconds=LEASE_SECONDS):
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisShardQueue(url, lease_seconds)
+    path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url
+    return SQLiteShardQueue(path, lease_seconds)
+
+
+# ==== coordinator ====
+def coordinate(input_path, output_path, queue_url, shard_size=500, poll_interval=5.0,
+               stop_event=None, progress_callback=None):
+    import pandas as pd
+    from core.progress import ProgressTracker
+    from core.main_scripts_blog_ui_api import write_result_workbook
+
+    df = pd.read_excel(input_path, dtype={"게시글 등록일자": str})
+    total = len(df)
+    records = df.to_dict(orient="records")
+    payloads = [
+        {"total": total, "rows": [[i, records[i]] for i in range(start, min(start + shard_size, total))]}
+        for start in range(0, total, shard_size)
+    ]
+    job_id = f"{os.path.splitext(os.path.basename(input_path))[0]}-{uuid.uuid4().hex[:8]}"
+    queue = open_queue(queue_url)
+    queue.create_job(job_id, payloads)
+    log(f"📦 분산 작업 등록: {job_id} ({total}행 → shard {len(payloads)}개)")
+
+    tracker = ProgressTracker(len(payloads), progress_callback, stage="shard")
+    while True:
+        done = queue.progress(job_id).get("done", 0)
+        if done != tracker.done:
+            tracker.advance(done - tracker.done)
+        if done >= len(payloads):
+            break
+        if stop_event is not None and stop_event.is_set():
+            dropped = queue.cancel_job(job_id)
+            log(f"🛑 중단: 남은 shard {dropped}개 취소, 완료된 shard {done}/{len(payloads)} 결과만 저장합니다.")
+            break
+        if stop_event is not None:
+            stop_event.wait(poll_interval)
+        else:
+            time.sleep(poll_interval)
+
+    df["원본기사"] = ""
+    df["복사율"] = 0.0
+    for _, result in queue.results(job_id):
+        for index, link, score in result:
+            df.at[index, "원본기사"] = link
+            df.at[index, "복사율"] = score
+    write_result_workbook(df, output_path)
+    return job_id
+
+
+# ==== worker ====
+def _process_shard(payload, output_dir, client_id, client_secret, executor, cancel_token, health, credentials):
+    from concurrent.futures import as_completed
+    from core.main_scripts_blog_ui_api import _run_row
+
+    futures = [
+        executor.submit(_run_row, (index, row, payload["total"], output_dir, cancel_token, client_id, client_secret,
+                                   health, credentials))
+        for index, row in payload["rows"]
+    ]
+    results = []
+    for future in as_completed(futures):
+        (index, link, score, _), _ = future.result()
+        results.append([index, link, score])
+    return results
+
+
+def work(queue_url, output_dir, client_id, client_secret, workers=None, worker_id=None,
+         idle_exit=False, poll_interval=5.0, stop_event=None):
+    from core import cancellation
+    from core.warm_pool import WarmPool
+    from core.credentials import load_credentials
+
+    os.makedirs(output_dir, exist_ok=True)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    queue = open_queue(queue_url)
+    pool = WarmPool(workers)  # 워커가 죽어 풀이 깨지면 get() 이 새로 만든다
+    cancel_token = cancellation.new_token() if stop_event is not None else None
+    # 이 머신의 워커들이 shard 사이에도 공유 (API 키는 머신마다 다른 키 파일을 두면 나눠 쓸 수 있다)
+    health = cancellation.get_manager().HostHealth()
+    credentials = cancellation.shared_credentials(load_credentials(extra=[(client_id, client_secret)]))
+    bridge_done = cancellation.bridge(stop_event, cancel_token) if cancel_token is not None else None
+    log(f"🛠 분산 워커 시작: {worker_id}")
+    failures = 0
+
+    def pause(seconds):
+        if stop_event is not None:
+            stop_event.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            claimed = queue.claim(worker_id)
+            if claimed is None:
+                if idle_exit:
+                    break
+                pause(poll_interval)
+                continue
+            job_id, shard_id, payload = claimed
+            log(f"▶ shard 처리 시작: {job_id}#{shard_id} ({len(payload['rows'])}행)")
+
+            # 처리하는 동안 lease 연장
+            beating = threading.Event()
+
+            def beat(job_id=job_id, shard_id=shard_id, beating=beating):
+                while not beating.wait(queue.lease_seconds / 3):
+                    queue.heartbeat(job_id, shard_id, worker_id)
+
+            threading.Thread(target=beat, daemon=True).start()
+            try:
+                shard_dir = os.path.join(output_dir, f"{job_id}_본문")
+                os.makedirs(shard_dir, exist_ok=True)
+                results = _process_shard(payload, shard_dir, client_id, client_secret, pool.get(), cancel_token,
+                                         health, credentials)
+            except Exception as e:
+                failures += 1
+                log(f"❌ shard 처리 실패 ({failures}/{MAX_FAILURES}): {job_id}#{shard_id}: {e}")
+                queue.release(job_id, shard_id, worker_id)
+                if failures >= MAX_FAILURES:
+                    log(f"🛑 shard 처리가 {failures}번 연속 실패해서 워커를 종료합니다: {worker_id}")
+                    break
+                pause(min(FAILURE_BACKOFF * 2 ** (failures - 1), MAX_BACKOFF))
+                continue
+            finally:
+                beating.set()
+            failures = 0
+
+            if cancellation.is_cancelled(cancel_token):
+                # 중단된 shard 는 결과가 불완전하므로 다른 워커가 처음부터 다시 하도록 반납
+                queue.release(job_id, shard_id, worker_id)
+                break
+            queue.complete(job_id, shard_id, worker_id, results)
+            log(f"✅ shard 완료: {job_id}#{shard_id}")
+    finally:
+        if bridge_done is not None:
+            bridge_done.set()
+        credentials.save()
+        pool.shutdown()
+        log(f"👋 분산 워커 종료: {worker_id}")
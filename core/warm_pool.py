@@ -0,0 +1,119 @@
+# core/warm_pool.py
+#
+# GUI 가 들고 있는 상주 워커 풀.
+# 로그인 직후 백그라운드에서 한 번 띄워 워밍업(JVM/리소스)해 두고, 매 실행(원문 매칭/전처리)마다
+# 그대로 재사용한다. 워커가 죽어서 풀이 깨졌을 때만 새로 만든다.
+# 단계별 워밍업 시간은 각 워커가 로그에 남긴다 (worker_pool.warm_up_worker).
+#   - 원문 매칭: main(..., executor=pool.get())
+#   - 전처리:    pool.run_preprocessing(...) → 워커 하나에서 실행 (리소스 테이블이 워커에 남아 있음)
+#                진행률은 Manager Queue 로, 중지는 취소 토큰으로 주고받는다.
+
+import time
+import queue
+import importlib
+import logging
+import threading
+
+from core import worker_pool, cancellation
+
+
+def log(msg):
+    logging.info(msg, extra={"row": None, "stage": "pool"})
+
+
+def _preprocess_job(input_path, output_path, token, progress_queue, incremental):
+    from core.preprocessing import run_preprocessing
+    run_preprocessing(input_path, output_path, stop_event=token,
+                      progress_callback=progress_queue.put if progress_queue is not None else None,
+                      incremental=incremental)
+
+
+class WarmPool:
+    def __init__(self, max_workers=None, preload_modules=()):
+        self.max_workers = max_workers or worker_pool.DEFAULT_WORKERS
+        # 메인 프로세스에서도 import 해 둘 모듈 (Okt/리소스는 지연 로딩이라 import 비용은 pandas/requests 정도)
+        self.preload_modules = tuple(preload_modules)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closed = False
+
+    def start(self):
+        """백그라운드에서 풀을 띄우고 워커를 모두 워밍업 (바로 반환)"""
+        threading.Thread(target=self._start, name="warm-pool", daemon=True).start()
+        return self
+
+    def _start(self):
+        try:
+            self.get()
+        except Exception as e:
+            log(f"⚠️ 워커 풀 준비 실패: {e}")
+        for name in self.preload_modules:
+            t0 = time.perf_counter()
+            try:
+                importlib.import_module(name)
+                log(f"🔥 {name} 미리 로딩 ({time.perf_counter() - t0:.1f}s)")
+            except Exception as e:
+                log(f"⚠️ {name} 미리 로딩 실패: {e}")
+
+    def _create(self):
+        t0 = time.perf_counter()
+        pool = worker_pool.create_pool(self.max_workers)
+        # 워커 수만큼 작업을 던져 프로세스를 전부 띄운다 (initializer 에서 워밍업)
+        for f in [pool.submit(worker_pool.warm_up_worker) for _ in range(self.max_workers)]:
+            f.result()
+        log(f"🔥 워커 풀 준비 완료 ({self.max_workers}개, {time.perf_counter() - t0:.1f}s)")
+        return pool
+
+    def get(self):
+        """준비된 풀. 처음이면 만들 때까지 기다리고, 워커가 죽어 깨졌으면 새로 만든다"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("워커 풀이 이미 종료되었습니다.")
+            if self._pool is not None and getattr(self._pool, "_broken", False):
+                log("⚠️ 워커 프로세스가 비정상 종료되어 풀을 다시 만듭니다.")
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._pool is None:
+                self._ready.clear()
+                self._pool = self._create()
+                self._ready.set()
+            return self._pool
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def run_preprocessing(self, input_path, output_path, stop_event=None, progress_callback=None,
+                          incremental=None):
+        pool = self.get()
+        token = cancellation.new_token() if stop_event is not None else None
+        bridge_done = cancellation.bridge(stop_event, token) if token is not None else None
+        progress_queue = cancellation.get_manager().Queue() if progress_callback is not None else None
+
+        def relay(timeout):
+            if progress_queue is None:
+                time.sleep(timeout)
+                return
+            try:
+                progress_callback(progress_queue.get(timeout=timeout))
+                while True:
+                    progress_callback(progress_queue.get_nowait())
+            except queue.Empty:
+                pass
+
+        try:
+            future = pool.submit(_preprocess_job, input_path, output_path, token, progress_queue, incremental)
+            while not future.done():
+                relay(0.1)
+            relay(0)
+            return future.result()
+        finally:
+            if bridge_done is not None:
+                bridge_done.set()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,72 @@
+# core/worker_pool.py
+#
+# 원문 매칭용 프로세스 풀 생성.
+# 워커는 시작할 때 로그 큐를 연결하고, core_utils 를 import 해서 Okt(JVM)/리소스 엑셀을
+# 미리 올려 둔다. 여러 파일/여러 번의 실행이 같은 풀을 공유하면 이 비용을 한 번만 낸다.
+# 워밍업은 단계별 소요 시간을 로그에 남긴다 (stage=warmup).
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from core import log_backend
+
+DEFAULT_WORKERS = int(os.environ.get("AINP_WORKERS", "3") or 3)
+
+# 첫 호출 JIT 을 끝내도록 길이/품사가 다른 문장 몇 개를 여러 번 돌린다
+WARM_UP_TEXTS = (
+    "정부는 3일 부동산 대출 규제를 발표했다. 시장에서는 관망세가 이어질 것으로 보인다.",
+    "손흥민이 시즌 10호 골을 터뜨리며 팀의 2대1 역전승을 이끌었다.",
+    "새 드라마가 첫 방송부터 시청률 8%를 기록하며 화제를 모으고 있다고 관계자가 밝혔다.",
+)
+WARM_UP_TEXT = WARM_UP_TEXTS[0]
+WARM_UP_ROUNDS = 3
+
+_warmed = False
+
+
+def warm_up_worker(preprocessing=True):
+    """JVM 기동 + 토크나이저 핫패스 JIT + 리소스 로딩을 미리 끝낸다 (프로세스당 한 번)"""
+    global _warmed
+    if _warmed:
+        return os.getpid()
+    t0 = time.perf_counter()
+    from core import core_utils_ui_api as cu
+    cu.get_okt()  # JVM 기동
+    cu.load_excluded_domains()
+    cu.load_trusted_oids()
+    t1 = time.perf_counter()
+    for _ in range(WARM_UP_ROUNDS):
+        for text in WARM_UP_TEXTS:
+            cu.tokenize_without_stopwords(text)
+            cu.extract_keywords(text)
+    t2 = time.perf_counter()
+    if preprocessing:
+        from core import preprocessing as pp
+        pp.load_untrusted_tables()
+        pp.load_exclude_urls()
+        pp.rules_signature()
+    t3 = time.perf_counter()
+    _warmed = True
+    logging.info(f"🔥 워밍업 완료 {t3 - t0:.1f}s (JVM/리소스 {t1 - t0:.1f}s, 토큰화 {t2 - t1:.1f}s, "
+                 f"전처리 테이블 {t3 - t2:.1f}s)", extra={"row": None, "stage": "warmup"})
+    return os.getpid()
+
+
+def _init_worker(log_queue, warm_up):
+    log_backend.configure_worker(log_queue)
+    if warm_up:
+        try:
+            warm_up_worker()
+        except Exception as e:
+            logging.getLogger().warning(f"⚠️ 워커 워밍업 실패: {e}")
+
+
+def create_pool(max_workers=None, warm_up=True):
+    log_queue = log_backend.setup_logging()
+    return ProcessPoolExecutor(
+        max_workers=max_workers or DEFAULT_WORKERS,
+        initializer=_init_worker,
+        initargs=(log_queue, warm_up),
+    )
@@ -2,18 +2,23 @@
 
 import sys
 import os
+import json
 
 import threading
-import time
 import importlib
+import logging
 import traceback
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
-    QVBoxLayout, QFileDialog, QMessageBox, QTextEdit,
+    QVBoxLayout, QFileDialog, QMessageBox, QPlainTextEdit,
     QProgressBar, QHBoxLayout, QComboBox, QGroupBox, QFormLayout
 )
 from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtCore import Qt, QTimer,pyqtSignal
+from core.log_backend import format_line, log_path_for
+from core.progress import describe as describe_progress
+from core.credentials import load_credentials
+from core.warm_pool import WarmPool
 
 def resource_path(relative_path):
     """兼容PyInstaller和源码运行的资源路径"""
@@ -21,16 +26,23 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
-# ==== 경로 설정 ====
-LOG_DIR = resource_path("data/log")
-
 VALID_USERS = {"gm": "pyk202020", "test": "test"}
 
 def run_gui():
     app = QApplication(sys.argv)
     login = LoginWindow()
     login.show()
+    # 로그인/파일 선택하는 동안 워커(JVM, 토크나이저 JIT, 리소스/전처리 테이블)를 미리 데운다.
+    # GUI 프로세스의 매칭 모듈 preload 는 pandas/requests import 만 앞당겨 시작 버튼 지연을 줄인다
+    # (Okt/리소스/sklearn 은 지연 로딩이라 GUI 프로세스에는 올라오지 않는다)
+    pool = WarmPool(preload_modules=("core.main_scripts_blog_ui_api",)).start()
+    login.pool = pool
     app.exec_()
+    pool.shutdown()
+    # 취소 토큰용 Manager 프로세스가 떠 있으면 정리 (os._exit 은 atexit 을 건너뜀)
+    cancellation = sys.modules.get("core.cancellation")
+    if cancellation is not None:
+        cancellation.shutdown_manager()
     # 强制退出，防止残留线程阻塞
     os._exit(0)
 
@@ -91,17 +103,93 @@ class LoginWindow(QWidget):
         user = self.user_input.text()
         pwd = self.pass_input.text()
         if VALID_USERS.get(user) == pwd:
-            self.main_window = MainApp()
+            self.main_window = MainApp(pool=getattr(self, "pool", None))
             self.main_window.show()
             self.close()
         else:
             QMessageBox.warning(self, "오류", "아이디 또는 비밀번호가 잘못되었습니다.")
 
+class LogTailView(QPlainTextEdit):
+    """로그 파일에서 새로 추가된 바이트만 읽어 붙이는 뷰 (줄 수 상한 있음).
+    경로 대신 함수(log_path_for)를 주면 날짜가 바뀌어 로그 파일이 바뀔 때 새 파일을 처음부터 따라간다"""
+    MAX_BLOCKS = 3000
+    MAX_READ = 512 * 1024  # 한 번에 읽는 최대 바이트, 더 밀려 있으면 앞부분은 건너뜀
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(self.MAX_BLOCKS)
+        self.path = None
+        self.path_for = None
+        self.offset = 0
+        self.partial = b""
+
+    def follow(self, path, from_end=True):
+        self.clear()
+        self.path_for = path if callable(path) else None
+        self.path = path() if callable(path) else path
+        self.partial = b""
+        self.offset = os.path.getsize(self.path) if from_end and os.path.exists(self.path) else 0
+
+    def poll(self):
+        if self.path_for is not None:
+            current = self.path_for()
+            if current != self.path:
+                self.poll_file()  # 이전 파일에 남은 줄까지 읽고 넘어간다
+                self.path, self.offset, self.partial = current, 0, b""
+        self.poll_file()
+
+    def poll_file(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            # 파일이 잘렸거나 새로 만들어짐 → 처음부터
+            self.offset, self.partial = 0, b""
+        if size == self.offset:
+            return
+
+        skipped = 0
+        if size - self.offset > self.MAX_READ:
+            skipped = size - self.MAX_READ - self.offset
+            self.offset, self.partial = size - self.MAX_READ, b""
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        self.offset += len(chunk)
+
+        lines = (self.partial + chunk).split(b"\n")
+        self.partial = lines.pop()  # 아직 다 쓰이지 않은 마지막 줄
+        if skipped:
+            lines = lines[1:]  # 잘린 첫 줄 버림
+        text = "\n".join(self.format_line(raw.decode("utf-8", errors="replace")) for raw in lines)
+        if skipped:
+            text = f"… ({skipped // 1024} KB 생략)\n" + text
+        if not text:
+            return
+
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 4
+        self.appendPlainText(text)
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+    @staticmethod
+    def format_line(line):
+        line = line.rstrip("\r")
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return line
+        return format_line(data) if isinstance(data, dict) else line
+
 class MainApp(QWidget):
     success_signal = pyqtSignal(str)
     fail_signal = pyqtSignal(int)
+    progress_signal = pyqtSignal(object)
 
-    def __init__(self):
+    def __init__(self, pool=None):
         super().__init__()
         self.setWindowTitle("AI News Pick")
         self.setGeometry(100, 100, 640, 520)
@@ -111,9 +199,12 @@ class MainApp(QWidget):
         
         self.stop_event = threading.Event()
         self.worker_thread = None
+        # 앱 시작 때 백그라운드에서 데워 둔 워커를 실행마다 재사용 (워커가 죽었을 때만 재시작)
+        self.pool = pool or WarmPool().start()
 
         self.success_signal.connect(self.show_success_popup)
         self.fail_signal.connect(self.show_failure_popup)
+        self.progress_signal.connect(self.update_progress)
         
         self.user_stopped = False  # 是否用户主动中止
 
@@ -188,13 +279,13 @@ class MainApp(QWidget):
         self.progress.setRange(0, 0)
         self.progress.setVisible(False)
         self.progress.setTextVisible(False)
+        self.progress.setMinimumWidth(260)
         btn_row.addWidget(self.progress)
 
         layout.addLayout(btn_row)
 
         layout.addWidget(QLabel("📜 Log"))
-        self.log_view = QTextEdit()
-        self.log_view.setReadOnly(True)
+        self.log_view = LogTailView()
         self.log_view.setStyleSheet("background-color: #fff; border: 1px solid #ccc; border-radius: 5px;")
         layout.addWidget(self.log_view)
 
@@ -226,6 +317,7 @@ class MainApp(QWidget):
             self.output_label.setText(f"선택된 폴더: {folder}")
 
     def show_success_popup(self, output_file):
+        self.update_log()
         self.timer.stop()
         self.progress.setVisible(False)
         self.stop_btn.setEnabled(False)
@@ -233,7 +325,16 @@ class MainApp(QWidget):
         QMessageBox.information(self, "완료", f"작업 완료! 파일: {output_file}")
         self.input_label.setText("✅ 완료되었습니다!")
 
+    def update_progress(self, info):
+        total = max(info["total"], 1)
+        if self.progress.maximum() != total:
+            self.progress.setRange(0, total)
+        self.progress.setValue(min(info["done"], total))
+        self.progress.setFormat(describe_progress(info))
+        self.progress.setTextVisible(True)
+
     def show_failure_popup(self, code):
+        self.update_log()
         self.timer.stop()
         self.progress.setVisible(False)
         self.stop_btn.setEnabled(False)
@@ -254,7 +355,8 @@ class MainApp(QWidget):
         secret = self.secret_input.text().strip()
         output_name = self.name_input.text().strip()
 
-        if mode == "네이버 원문 매칭" and (not cid or not secret):
+        # 키 파일/NAVER_CREDENTIALS 에 키가 있으면 입력 칸은 비워도 된다
+        if mode == "네이버 원문 매칭" and not load_credentials(extra=[(cid, secret)]):
             QMessageBox.warning(self, "API 필수", "NAVER_CLIENT_ID와 SECRET을 입력하세요.")
             return
 
@@ -263,11 +365,13 @@ class MainApp(QWidget):
             return
 
         output_file = os.path.join(self.output_folder, output_name + ".xlsx")
-        self.log_file = os.path.join(LOG_DIR, f"로그_{time.strftime('%y%m%d')}.txt")
         self.output_file_path = output_file
 
         self.stop_event.clear()
-        self.log_view.clear()
+        # 이번 실행에서 추가되는 부분만 tail (자정이 지나면 log_backend 와 함께 다음 날 파일로)
+        self.log_view.follow(log_path_for)
+        self.progress.setRange(0, 0)  # 첫 진행 보고 전까지는 indeterminate
+        self.progress.setTextVisible(False)
         self.progress.setVisible(True)
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
@@ -276,10 +380,11 @@ class MainApp(QWidget):
             try:
                 if mode == "네이버 원문 매칭":
                     mod = importlib.import_module("core.main_scripts_blog_ui_api")
-                    mod.main(self.input_path, output_file, cid, secret,stop_event=self.stop_event)
+                    mod.main(self.input_path, output_file, cid, secret,stop_event=self.stop_event,
+                             progress_callback=self.progress_signal.emit, executor=self.pool.get())
                 else:
-                    mod = importlib.import_module("core.preprocessing")
-                    mod.run_preprocessing(self.input_path, output_file, stop_event=self.stop_event)
+                    self.pool.run_preprocessing(self.input_path, output_file, stop_event=self.stop_event,
+                                                progress_callback=self.progress_signal.emit)
 
                 if self.user_stopped or self.stop_event.is_set():
                     self.user_stopped = False  # ✅ 重置标志，不弹窗
@@ -287,12 +392,17 @@ class MainApp(QWidget):
                     return
                 self.success_signal.emit(output_file)
             except Exception as e:
-                # 写入详细异常到log文件
-                with open(self.log_file, "a", encoding="utf-8", errors="replace") as f:
-                    f.write(traceback.format_exc())
+                # 写入详细异常到log文件 (단일 writer 경유)
+                try:
+                    from core import log_backend
+                    log_backend.setup_logging()
+                    logging.getLogger().error(f"❌ 실행 실패: {e}", exc_info=True)
+                except Exception:
+                    with open(log_path_for(), "a", encoding="utf-8", errors="replace") as f:
+                        f.write(traceback.format_exc())
                 self.fail_signal.emit(-1)
                 
-        self.timer.start(1000)
+        self.timer.start(500)
         self.worker_thread = threading.Thread(target=run, daemon=True)  # 保存线程对象
         self.worker_thread.start()
 
@@ -309,18 +419,13 @@ class MainApp(QWidget):
             if hasattr(self, "worker_thread") and self.worker_thread and self.worker_thread.is_alive():
                 # 最多等3秒
                 self.worker_thread.join(timeout=3)
+            self.pool.shutdown()
         except Exception as e:
             pass
         event.accept()
 
     def update_log(self):
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, "r", encoding="utf-8", errors="replace") as f:
-                    lines = f.readlines()[-100:]
-                    self.log_view.setPlainText("".join(lines))
-                    self.log_view.verticalScrollBar().setValue(
-                        self.log_view.verticalScrollBar().maximum()
-                    )
+            self.log_view.poll()
         except Exception as e:
-            self.log_view.append(f"[로그 읽기 오류]: {e}")
\ No newline at end of file
+            self.log_view.appendPlainText(f"[로그 읽기 오류]: {e}")
@@ -13,8 +13,8 @@ def patch_konlpy_java_path():
 
 patch_konlpy_java_path()
 
-from gui.app_gui import run_gui
-
+# gui.app_gui 는 여기서만 import (spawn 워커는 이 파일을 다시 import 하므로 모듈 최상단에 두면
+# 워커마다 PyQt 까지 올라온다)
 if __name__ == "__main__":
     multiprocessing.freeze_support()
     from gui.app_gui import run_gui